@@ -83,6 +83,10 @@ def parse_args():
             '-j', '--job', type=int, action='store', default=1,
             help='set the job number for this particular run. Must be in [1,njobs]. ' +
             'Used in conjunction with -n (--njobs)')
+        parser.add_argument(
+            '--coordinator', type=str, action='store', default=None,
+            help='a directory shared by all the jobs for this run, which is used to hand out ' +
+            'the files to build to each job as it becomes free.  Use instead of -n and -j.')
         parser.add_argument(
             '-x', '--except_abort', action='store_const', default=False, const=True,
             help='abort the whole job whenever any file raises an exception rather than ' +
@@ -136,6 +140,10 @@ def parse_args():
             '-j', '--job', type=int, action='store', default=1,
             help='set the job number for this particular run. Must be in [1,njobs]. ' +
             'Used in conjunction with -n (--njobs)')
+        parser.add_option(
+            '--coordinator', type=str, action='store', default=None,
+            help='a directory shared by all the jobs for this run, which is used to hand out ' +
+            'the files to build to each job as it becomes free.  Use instead of -n and -j.')
         parser.add_option(
             '-x', '--except_abort', action='store_const', default=False, const=True,
             help='abort the whole job whenever any file raises an exception rather than ' +
@@ -205,6 +213,8 @@ def main():
         raise ValueError("Invalid job number %d.  Must be >= 1"%args.job)
     if args.job > args.njobs:
         raise ValueError("Invalid job number %d.  Must be <= njobs (%d)"%(args.job,args.njobs))
+    if args.coordinator is not None and args.njobs > 1:
+        raise ValueError("Cannot use --coordinator along with njobs > 1")
 
     # Parse the integer verbosity level from the command line args into a logging_level string
     logging_levels = { 0: logging.CRITICAL, 
@@ -251,8 +261,12 @@ def main():
         logger.debug("Process config dict: \n%s", pprint.pformat(config))
 
         # Process the configuration
+        if args.coordinator is not None:
+            coordinator = galsim.config.FileLockCoordinator(args.coordinator)
+        else:
+            coordinator = None
         galsim.config.Process(config, logger, njobs=args.njobs, job=args.job, new_params=new_params,
-                              except_abort=args.except_abort)
+                              except_abort=args.except_abort, coordinator=coordinator)
 
     if args.profile:
         # cf. example code here: https://docs.python.org/2/library/profile.html
@@ -113,7 +113,8 @@ from .noise import DeviateNoise, VariableGaussianNoise
 from .correlatednoise import CorrelatedNoise, getCOSMOSNoise, UncorrelatedNoise, CovarianceSpectrum
 
 # GSObject
-from .gsobject import GSObject
+from .gsobject import GSObject, drawImages, PreparedDrawer
+from .draw_cost import DrawCostModel
 from .gsparams import GSParams
 from .base import Gaussian, Moffat, Airy, Kolmogorov, Pixel, Box, TopHat
 from .base import Exponential, Sersic, DeVaucouleurs, Spergel, DeltaFunction
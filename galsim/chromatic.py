@@ -27,6 +27,7 @@ different filters, or implementing wavelength-dependent point spread functions.
 """
 
 import numpy as np
+from collections import OrderedDict
 
 import galsim
 
@@ -2020,6 +2021,24 @@ class ChromaticConvolution(ChromaticObject):
         """
         ChromaticConvolution._effective_prof_cache.resize(maxsize)
 
+    @staticmethod
+    def _evaluate_component(obj, wave):
+        # Return obj.evaluateAtWavelength(wave), reusing the result from a previous call with the
+        # same obj (by identity, since hashing a ChromaticObject can be slow) if possible.
+        if isinstance(obj, galsim.GSObject):
+            return obj
+        cache = ChromaticConvolution._monochromatic_cache
+        key = (id(obj), wave)
+        if key in cache and cache[key][0] is obj:
+            entry = cache.pop(key)
+            cache[key] = entry  # Move it to the most recently used position.
+            return entry[1]
+        mono = obj.evaluateAtWavelength(wave)
+        cache[key] = (obj, mono)
+        while len(cache) > ChromaticConvolution._monochromatic_cache_size:
+            cache.popitem(last=False)
+        return mono
+
     def __eq__(self, other):
         return (isinstance(other, galsim.ChromaticConvolution) and
                 self.obj_list == other.obj_list and
@@ -2042,7 +2061,10 @@ class ChromaticConvolution(ChromaticObject):
 
         @returns the monochromatic object at the given wavelength.
         """
-        return galsim.Convolve([obj.evaluateAtWavelength(wave) for obj in self.obj_list],
+        # Use the same monochromatic object for each component each time, so a common PSF
+        # can reuse its k-space image in the Convolution.
+        return galsim.Convolve([ChromaticConvolution._evaluate_component(obj, wave)
+                                for obj in self.obj_list],
                                gsparams=self.gsparams)
 
     def drawImage(self, bandpass, image=None, integrator='trapezoidal', iimult=None, **kwargs):
@@ -2218,6 +2240,8 @@ class ChromaticConvolution(ChromaticObject):
 
 ChromaticConvolution._effective_prof_cache = galsim.utilities.LRU_Cache(
     ChromaticConvolution._get_effective_prof, maxsize=10)
+ChromaticConvolution._monochromatic_cache = OrderedDict()
+ChromaticConvolution._monochromatic_cache_size = 10
 
 
 class ChromaticDeconvolution(ChromaticObject):
@@ -343,6 +343,16 @@ class Convolution(galsim.GSObject):
     NOT when creating the Sum (at which point the accuracy and threshold parameters will simply be
     ignored).
 
+    Reusing the PSF k-space image
+    -----------------------------
+
+    When many objects are convolved by the same PSF (the same PSF object, not just an equal one)
+    and drawn with an FFT on the same k-space grid, the k-space image of the PSF is only computed
+    once.  Once a component has been seen in more than one convolution, its k-space images are
+    kept in a cache, which is shared by all Convolutions.  The cache is keyed on the identity of
+    the component, the size of the k-space image, and the k-space grid (i.e. dk).  Its size may
+    be changed (or set to 0 to turn it off) with `Convolution.resize_kimage_cache()`.
+
     Methods
     -------
 
@@ -490,6 +500,23 @@ class Convolution(galsim.GSObject):
         SBList = [obj._sbp for obj in self._obj_list]
         self._sbp = galsim._galsim.SBConvolve(SBList, self._real_space, self._gsparams)
 
+    def _tiled_components(self):
+        # The extended component is the one with the smallest stepk that can be drawn in
+        # real space.  The rest are convolved together to make the kernel.
+        candidates = [ obj for obj in self._obj_list if obj.is_analytic_x ]
+        if len(candidates) == 0:
+            raise ValueError("method='fft_tiled' requires a component that is analytic in "
+                             "real space")
+        ext = min(candidates, key=lambda obj: obj.stepk)
+        others = [ obj for obj in self._obj_list if obj is not ext ]
+        if len(others) == 0:
+            raise ValueError("method='fft_tiled' requires a Convolution of at least two profiles")
+        elif len(others) == 1:
+            kernel = others[0]
+        else:
+            kernel = galsim.Convolve(others, gsparams=self._gsparams)
+        return ext, kernel
+
     def shoot(self, n_photons, rng=None):
         """Shoot photons into a PhotonArray.
 
@@ -520,6 +547,16 @@ class Convolution(galsim.GSObject):
         self.__dict__ = d
         self.__init__(self._obj_list, real_space=self._real_space, gsparams=self._gsparams)
 
+    @staticmethod
+    def resize_kimage_cache(maxsize):
+        """Resize the cache containing the k-space images of components that are shared by
+        several convolutions (e.g. a common PSF).
+
+        @param maxsize  The new number of k-space images to cache.  0 turns off the cache.
+                        [The initial size is 8.]
+        """
+        _galsim.SetConvolveKImageCacheSize(maxsize)
+
 
 _galsim.SBConvolve.__getinitargs__ = lambda self: (
         self.getObjs(), self.isRealSpace(), self.getGSParams())
@@ -21,6 +21,9 @@
 from .process import *
 from .input import *
 from .output import *
+from .checkpoint import *
+from .coordinator import *
+from .timing import *
 from .extra import *
 from .image import *
 from .stamp import *
@@ -0,0 +1,275 @@
+# Copyright (c) 2012-2017 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+import os
+import galsim
+
+# This file handles checkpointing of config runs.  If config['output']['checkpoint'] is set to
+# the name of a manifest file, then every completed output file (and every completed image
+# within a file) is recorded in that manifest.  If the run dies partway through, running it
+# again with the same manifest skips the files that were already finished, and for a file that
+# was only partly done, it reuses the images that were already built.
+
+
+class Checkpoint(object):
+    """A record of the files and images that have been completed in a config run.
+
+    The manifest is a text file with one JSON record per line.  Each record is a dict with
+    the following keys:
+
+        type        Either 'file' or 'image'.
+        file_num    The file_num of the file (or of the file containing the image).
+        image_num   The image_num of the image (or of the first image in the file).
+        obj_num     The obj_num of the first object in the image (or file).
+        seed        The random number seed used for the file (or image).
+        file_name   The name of the output file (or of the file holding the saved image).
+        checksum    The md5 checksum of the file named by file_name.
+
+    Records are only ever appended to the manifest, so it is safe for several processes to
+    record their completed files and images at the same time.  When reading the manifest,
+    later records supersede earlier ones, and a truncated final line (from a run that died
+    while writing it) is ignored.
+
+    The images are saved (pickled) in the directory file_name + '_images'.  They are removed
+    again once the file that contains them is complete.
+
+    @param file_name        The name of the manifest file.
+    @param logger           If given, a logger object to log progress. [default: None]
+    """
+    def __init__(self, file_name, logger=None):
+        self.file_name = file_name
+        self.image_dir = file_name + '_images'
+        self.files = {}
+        self.images = {}
+        self.read(logger)
+
+    def read(self, logger=None):
+        """Read the records that are currently in the manifest file.
+        """
+        import json
+        logger = galsim.config.LoggerWrapper(logger)
+        if not os.path.isfile(self.file_name):
+            logger.info('Checkpoint manifest %s not found.  Starting from scratch.',
+                        self.file_name)
+            return
+        with open(self.file_name) as fin:
+            for line in fin:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning('Ignoring invalid line in checkpoint manifest %s: %r',
+                                   self.file_name, line)
+                    continue
+                if record.get('type') == 'file':
+                    self.files[record['file_num']] = record
+                elif record.get('type') == 'image':
+                    self.images[record['image_num']] = record
+        logger.warning('Read checkpoint manifest %s: %d files, %d images completed',
+                       self.file_name, len(self.files), len(self.images))
+
+    def _append(self, record):
+        # Write the record with a single write call in append mode, so records from different
+        # processes don't get interleaved.
+        import json
+        galsim.config.EnsureDir(self.file_name)
+        with open(self.file_name, 'a') as fout:
+            fout.write(json.dumps(record, sort_keys=True) + '\n')
+            fout.flush()
+            os.fsync(fout.fileno())
+
+    def isFileDone(self, file_num, file_name, seed, logger=None):
+        """Check whether the given file was completed in a previous run.
+
+        The file counts as completed only if it is in the manifest with the same file_name and
+        seed, and the file on disk still has the recorded checksum.
+
+        @param file_num         The file_num to check.
+        @param file_name        The name of the output file.
+        @param seed             The random number seed for this file.
+        @param logger           If given, a logger object to log progress. [default: None]
+
+        @returns whether the file is complete.
+        """
+        logger = galsim.config.LoggerWrapper(logger)
+        record = self.files.get(file_num, None)
+        if record is None:
+            return False
+        if record['file_name'] != file_name or record['seed'] != seed:
+            logger.warning('file %d: checkpoint record does not match current config. '+
+                           'Rebuilding %s.', file_num, file_name)
+            return False
+        if not os.path.isfile(file_name) or FileChecksum(file_name) != record['checksum']:
+            logger.warning('file %d: %s is missing or has been changed since it was recorded '+
+                           'in the checkpoint manifest.  Rebuilding it.', file_num, file_name)
+            return False
+        return True
+
+    def fileDone(self, file_num, image_num, obj_num, nimages, seed, file_name, logger=None):
+        """Record that the given file has been completed.
+
+        This also removes the saved images for this file, since they are no longer needed.
+
+        @param file_num         The file_num of the completed file.
+        @param image_num        The image_num of the first image in the file.
+        @param obj_num          The obj_num of the first object in the file.
+        @param nimages          The number of images in the file.
+        @param seed             The random number seed for this file.
+        @param file_name        The name of the output file.
+        @param logger           If given, a logger object to log progress. [default: None]
+        """
+        logger = galsim.config.LoggerWrapper(logger)
+        record = {
+            'type' : 'file',
+            'file_num' : file_num,
+            'image_num' : image_num,
+            'obj_num' : obj_num,
+            'seed' : seed,
+            'file_name' : file_name,
+            'checksum' : FileChecksum(file_name),
+        }
+        self._append(record)
+        self.files[file_num] = record
+        logger.debug('file %d: Recorded %s in checkpoint manifest',file_num,file_name)
+
+        for k in range(image_num, image_num + nimages):
+            image_file = self._imageFileName(k)
+            if os.path.isfile(image_file):
+                os.remove(image_file)
+            self.images.pop(k, None)
+
+    def _imageFileName(self, image_num):
+        return os.path.join(self.image_dir, 'image%d.pkl'%image_num)
+
+    def useImages(self, config):
+        """Check whether images may be saved and reused for the current config.
+
+        If there are extra outputs, they need to process each image as it is built, so we
+        can't skip building any of the images.  In that case, only whole files are skipped.
+
+        @param config           The configuration dict.
+
+        @returns whether to save and reuse the completed images.
+        """
+        output = config.get('output', {})
+        return not any(key in output for key in galsim.config.valid_extra_outputs)
+
+    def getImage(self, config, image_num, obj_num, seed, logger=None):
+        """Get the image for the given image_num if it was completed in a previous run.
+
+        The image is only returned if it is in the manifest with the same obj_num and seed
+        as in the current config, and the saved image file still has the recorded checksum.
+
+        @param config           The configuration dict.
+        @param image_num        The image_num to get.
+        @param obj_num          The obj_num of the first object in the image.
+        @param seed             The random number seed for this image.
+        @param logger           If given, a logger object to log progress. [default: None]
+
+        @returns the image, or None if it needs to be built.
+        """
+        logger = galsim.config.LoggerWrapper(logger)
+        record = self.images.get(image_num, None)
+        if record is None or not self.useImages(config):
+            return None
+        if not os.path.isfile(record['file_name']):
+            # This is normal if the file containing this image was finished, since then the
+            # saved images are removed.
+            return None
+        if (record['obj_num'] != obj_num or record['seed'] != seed or
+            FileChecksum(record['file_name']) != record['checksum']):
+            logger.warning('image %d: saved image does not match the current config. '+
+                           'Rebuilding it.', image_num)
+            return None
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        with open(record['file_name'], 'rb') as fin:
+            image = pickle.load(fin)
+        logger.warning('image %d: Using image completed in a previous run', image_num)
+        return image
+
+    def imageDone(self, config, image, image_num, obj_num, seed, logger=None):
+        """Save the given image and record that it has been completed.
+
+        @param config           The configuration dict.
+        @param image            The completed image.
+        @param image_num        The image_num of the image.
+        @param obj_num          The obj_num of the first object in the image.
+        @param seed             The random number seed for this image.
+        @param logger           If given, a logger object to log progress. [default: None]
+        """
+        logger = galsim.config.LoggerWrapper(logger)
+        if image is None or not self.useImages(config):
+            return
+        try:
+            import cPickle as pickle
+        except ImportError:
+            import pickle
+        image_file = self._imageFileName(image_num)
+        galsim.config.EnsureDir(image_file)
+        # Write to a temporary file first, so we never have a partially written image file
+        # with the final name.
+        tmp_file = image_file + '.tmp%d'%os.getpid()
+        with open(tmp_file, 'wb') as fout:
+            pickle.dump(image, fout, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_file, image_file)
+        record = {
+            'type' : 'image',
+            'file_num' : config.get('file_num',0),
+            'image_num' : image_num,
+            'obj_num' : obj_num,
+            'seed' : seed,
+            'file_name' : image_file,
+            'checksum' : FileChecksum(image_file),
+        }
+        self._append(record)
+        self.images[image_num] = record
+        logger.debug('image %d: Saved image to %s',image_num,image_file)
+
+
+def FileChecksum(file_name):
+    """Calculate the md5 checksum of the given file.
+
+    @param file_name        The name of the file.
+
+    @returns the checksum as a hex string.
+    """
+    import hashlib
+    md5 = hashlib.md5()
+    with open(file_name, 'rb') as fin:
+        for block in iter(lambda: fin.read(1 << 20), b''):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def SetupCheckpoint(config, logger=None):
+    """Set up the checkpoint manifest if config['output']['checkpoint'] is given.
+
+    The Checkpoint object is stored in config['_checkpoint'], where it is used by BuildFile
+    and BuildImage.
+
+    @param config           The configuration dict.
+    @param logger           If given, a logger object to log progress. [default: None]
+    """
+    output = config.get('output', {})
+    if 'checkpoint' in output:
+        file_name = galsim.config.ParseValue(output, 'checkpoint', config, str)[0]
+        config['_checkpoint'] = Checkpoint(file_name, logger)
+    else:
+        config.pop('_checkpoint', None)
@@ -0,0 +1,237 @@
+# Copyright (c) 2012-2017 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+import os
+import galsim
+
+# This file handles the dynamic distribution of files among several galsim jobs.
+# Rather than giving each job a fixed range of file_nums (cf. the njobs and job parameters of
+# Process), each job goes through all the files and asks a coordinator whether it should build
+# each one.  The first job to claim a file builds it, and the others skip it.  So jobs that run
+# faster than others just end up building more of the files.
+
+
+class TaskCoordinator(object):
+    """A coordinator that hands out the output files to build among several jobs.
+
+    The base class just keeps track of the claimed files in memory, so it is only useful for
+    coordinating work within a single process.  (e.g. as a local stand-in for testing.)
+    Note in particular that it does not coordinate among the processes used for output.nproc,
+    since each process gets its own copy of the coordinator.
+
+    Derived classes need to override the claim method to coordinate the work among separate
+    processes or nodes.  For instance, FileLockCoordinator uses lock files in a shared
+    directory.  A coordinator that gets its tasks from a server would also work, as long as
+    it can be pickled to send it to the worker processes.
+    """
+    def __init__(self):
+        self.claimed = set()
+
+    def claim(self, file_num, file_name, logger=None):
+        """Try to claim the given output file for the current job.
+
+        Each file may only be claimed once, so the first job to claim a file should build it,
+        and any others should skip it.
+
+        @param file_num         The file_num of the file.
+        @param file_name        The name of the output file.
+        @param logger           If given, a logger object to log progress. [default: None]
+
+        @returns whether the claim succeeded, so this job should build the file.
+        """
+        if file_name in self.claimed:
+            return False
+        self.claimed.add(file_name)
+        return True
+
+    def release(self, file_num, file_name, logger=None):
+        """Release a claim on the given output file, so another job may build it.
+
+        This is called if building a claimed file fails, so the file is not left claimed by
+        a job that will never finish it.
+
+        @param file_num         The file_num of the file.
+        @param file_name        The name of the output file.
+        @param logger           If given, a logger object to log progress. [default: None]
+        """
+        self.claimed.discard(file_name)
+
+    def done(self, file_num, file_name, logger=None):
+        """Record that the given output file was built successfully.
+
+        This is called once a claimed file has been written, so the claim is never considered
+        stale after that.
+
+        @param file_num         The file_num of the file.
+        @param file_name        The name of the output file.
+        @param logger           If given, a logger object to log progress. [default: None]
+        """
+        pass
+
+    def __repr__(self):
+        return 'galsim.config.TaskCoordinator()'
+
+
+class FileLockCoordinator(TaskCoordinator):
+    """A coordinator that uses lock files in a shared directory to hand out the output files.
+
+    A file is claimed by atomically creating a lock file in the given directory, so any number
+    of jobs (and their worker processes) may share the same directory, even on different nodes,
+    as long as the file system supports exclusive file creation.  Each lock file records which
+    host and process claimed it.
+
+    The lock files are not removed when the run finishes, so running the same config again with
+    the same directory will not build anything.  Remove the directory to start over.  (Or see
+    the output.checkpoint option for a way to resume a run that failed partway through.)
+
+    Once a file has been written, its lock file is marked as done.  If building a file raises
+    an exception, its lock file is removed again.  A job that is killed outright cannot clean up
+    after itself though, so a lock file that is not marked as done is also considered to be
+    stale (and the file is claimed anew) if the process that made it was on the current host
+    and no longer exists, or if it is older than the given timeout.  If you use the timeout,
+    make sure it is longer than it takes to build any single file.
+
+    @param dir_name         The directory to use for the lock files.  It is created if it does
+                            not exist yet.
+    @param timeout          If given, the age in seconds after which a lock file is considered
+                            stale, regardless of whether the process that made it still exists.
+                            [default: None]
+    """
+    def __init__(self, dir_name, timeout=None):
+        self.dir_name = dir_name
+        self.timeout = timeout
+        # EnsureDir makes the directory for a given file name, and is safe if several jobs
+        # try to do this at the same time.
+        galsim.config.EnsureDir(os.path.join(dir_name, 'lock'))
+
+    def _lockFileName(self, file_name):
+        # Use a hash of the file_name, since it may include directories.
+        import hashlib
+        key = hashlib.md5(file_name.encode('utf-8')).hexdigest()
+        return os.path.join(self.dir_name, key + '.lock')
+
+    def _isStale(self, lock_file, info):
+        # info is the contents of the lock file: file_name, host, pid, or file_name, done once
+        # the file has been built.  Completed files are never stale.
+        import errno
+        import socket
+        import time
+        if info.split()[-1:] == ['done']:
+            return False
+        try:
+            host, pid = info.split()[-2:]
+            pid = int(pid)
+        except ValueError:
+            # Probably the lock file is still being written.
+            return False
+        if host == socket.gethostname():
+            try:
+                os.kill(pid, 0)
+            except OSError as e:
+                if e.errno == errno.ESRCH:
+                    return True
+        if self.timeout is not None:
+            try:
+                return time.time() - os.path.getmtime(lock_file) > self.timeout
+            except OSError:
+                return False
+        return False
+
+    def _readLock(self, lock_file):
+        try:
+            with open(lock_file, 'rb') as fin:
+                return fin.read().decode('utf-8')
+        except (IOError, OSError):
+            return None
+
+    def _removeStale(self, file_num, lock_file, info, logger):
+        # Move the stale lock file out of the way.  Only one job can succeed in doing so, since
+        # rename is atomic.  But another job may have already replaced the stale lock file with
+        # its own since we read it, in which case we need to put that one back.
+        stale_file = '%s.stale.%s'%(lock_file, os.getpid())
+        import errno
+        try:
+            os.rename(lock_file, stale_file)
+        except OSError as e:
+            # ENOENT means another job already removed it.
+            if e.errno != errno.ENOENT:
+                raise
+            return
+        if self._readLock(stale_file) != info:
+            try:
+                os.link(stale_file, lock_file)
+            except OSError:
+                pass
+        else:
+            logger.warning('file %d: Removed stale lock file %s (%s)',
+                           file_num, lock_file, info.strip())
+        os.remove(stale_file)
+
+    def claim(self, file_num, file_name, logger=None):
+        import errno
+        import socket
+        logger = galsim.config.LoggerWrapper(logger)
+        lock_file = self._lockFileName(file_name)
+        while True:
+            try:
+                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+            info = self._readLock(lock_file)
+            if info is None:
+                # Removed since we tried to create it, so just try again.
+                continue
+            if not self._isStale(lock_file, info):
+                logger.debug('file %d: %s was already claimed',file_num,file_name)
+                return False
+            self._removeStale(file_num, lock_file, info, logger)
+        try:
+            info = '%s %s %d\n'%(file_name, socket.gethostname(), os.getpid())
+            os.write(fd, info.encode('utf-8'))
+        finally:
+            os.close(fd)
+        logger.debug('file %d: claimed %s',file_num,file_name)
+        return True
+
+    def release(self, file_num, file_name, logger=None):
+        logger = galsim.config.LoggerWrapper(logger)
+        try:
+            os.remove(self._lockFileName(file_name))
+        except OSError:
+            pass
+        logger.debug('file %d: released %s',file_num,file_name)
+
+    def done(self, file_num, file_name, logger=None):
+        logger = galsim.config.LoggerWrapper(logger)
+        lock_file = self._lockFileName(file_name)
+        # Write the new contents to a temporary file and rename it, so other jobs never see
+        # a partially written lock file.
+        tmp_file = '%s.done.%s'%(lock_file, os.getpid())
+        with open(tmp_file, 'w') as fout:
+            fout.write('%s done\n'%file_name)
+        os.rename(tmp_file, lock_file)
+        logger.debug('file %d: marked %s as done',file_num,file_name)
+
+    def __repr__(self):
+        if self.timeout is None:
+            return 'galsim.config.FileLockCoordinator(%r)'%self.dir_name
+        else:
+            return 'galsim.config.FileLockCoordinator(%r, timeout=%r)'%(self.dir_name,
+                                                                        self.timeout)
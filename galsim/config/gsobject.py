@@ -18,6 +18,10 @@
 import galsim
 import logging
 import inspect
+import threading
+import numpy as np
+from collections import OrderedDict
+from past.builtins import basestring
 
 # This file handles the building of GSObjects in the config['psf'] and config['gal'] fields.
 # This file includes many of the simple object types.  Additional types are defined in
@@ -46,6 +50,78 @@ class SkipThisObject(Exception):
         self.msg = message
 
 
+# Objects built from the same parameters are identical, so rather than build them again, we keep
+# the most recently built objects in an LRU cache keyed by the type and the parameters used to
+# build them (including the gsparams).  This means that e.g. an OpticalPSF whose parameters are
+# the same for every object only gets built once, even if it isn't marked as safe, and the
+# objects that use it get to reuse its internal images and the tables built in the C++ layer.
+# These objects can be large, so only a modest number of them are kept.
+# The objects build some of their internal state lazily when they are first drawn, so they are
+# not shared among the threads used for image.nthreads.  Rather, each thread gets its own
+# entries, since the key includes the thread's ident.
+_gsobject_cache = OrderedDict()
+_gsobject_cache_lock = threading.Lock()
+_gsobject_cache_size = 20
+
+def SetGSObjectCacheSize(maxsize):
+    """Set the maximum number of objects to keep in the cache of built objects.
+
+    BuildGSObject keeps the most recently built objects, keyed by their type and the parameters
+    used to build them, and reuses them if another object needs the same parameters.
+    Setting maxsize = 0 turns off this caching.
+
+    @param maxsize      The maximum number of objects to keep. [default: 20]
+    """
+    global _gsobject_cache_size
+    with _gsobject_cache_lock:
+        _gsobject_cache_size = maxsize
+        while len(_gsobject_cache) > maxsize:
+            _gsobject_cache.popitem(last=False)
+
+def _CacheKeyValue(value):
+    # Convert a parameter value into a hashable value that compares equal only if the
+    # values are the same.  Raises TypeError if this isn't possible.
+    if value is None or isinstance(value, (bool, int, float, basestring)):
+        return value
+    elif isinstance(value, (list, tuple)):
+        return tuple(_CacheKeyValue(v) for v in value)
+    elif isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    elif isinstance(value, (galsim.Angle, galsim.Shear, galsim.PositionD, galsim.PositionI,
+                            galsim.CelestialCoord, galsim.GSParams)):
+        return (type(value).__name__, repr(value))
+    else:
+        raise TypeError("Cannot use %r in a cache key"%value)
+
+def _BuildCached(build_func, kwargs):
+    """Return build_func(**kwargs), reusing a cached object built with the same kwargs if
+    possible.
+    """
+    if _gsobject_cache_size <= 0:
+        return build_func(**kwargs)
+    try:
+        key = ((build_func, threading.current_thread().ident) +
+               tuple(sorted((k, _CacheKeyValue(v)) for k, v in kwargs.items())))
+        hash(key)
+    except TypeError:
+        # Some parameter can't be part of the key (e.g. an input object), so don't cache it.
+        return build_func(**kwargs)
+
+    with _gsobject_cache_lock:
+        if key in _gsobject_cache:
+            obj = _gsobject_cache.pop(key)
+            _gsobject_cache[key] = obj  # Move it to the most recently used position.
+            return obj
+
+    obj = build_func(**kwargs)
+
+    with _gsobject_cache_lock:
+        _gsobject_cache[key] = obj
+        while len(_gsobject_cache) > _gsobject_cache_size:
+            _gsobject_cache.popitem(last=False)
+    return obj
+
+
 def BuildGSObject(config, key, base=None, gsparams={}, logger=None):
     """Build a GSObject from the parameters in config[key].
 
@@ -232,7 +308,10 @@ def _BuildSimple(build_func, config, base, ignore, gsparams, logger):
     logger.debug('obj %d: kwargs = %s',base.get('obj_num',0),kwargs)
 
     # Finally, after pulling together all the params, try making the GSObject.
-    return build_func(**kwargs), safe
+    if build_func._takes_rng:
+        return build_func(**kwargs), safe
+    else:
+        return _BuildCached(build_func, kwargs), safe
 
 
 def _BuildNone(config, base, ignore, gsparams, logger):
@@ -380,7 +459,7 @@ def _BuildOpticalPSF(config, base, ignore, gsparams, logger):
             safe = safe and safe1
         kwargs['aberrations'] = aber_list
 
-    return galsim.OpticalPSF(**kwargs), safe
+    return _BuildCached(galsim.OpticalPSF, kwargs), safe
 
 
 #
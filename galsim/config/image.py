@@ -58,6 +58,14 @@ def BuildImages(nimages, config, image_num=0, obj_num=0, logger=None):
         nproc = galsim.config.UpdateNProc(nproc, nimages, config, logger)
     else:
         nproc = 1
+    if 'persistent_pool' in image:
+        persistent = galsim.config.ParseValue(image, 'persistent_pool', config, bool)[0]
+    else:
+        persistent = False
+    if nproc > 1 and 'shared_memory' in image:
+        shared = galsim.config.ParseValue(image, 'shared_memory', config, bool)[0]
+    else:
+        shared = False
 
     jobs = []
     for k in range(nimages):
@@ -68,8 +76,9 @@ def BuildImages(nimages, config, image_num=0, obj_num=0, logger=None):
 
     def done_func(logger, proc, k, image, t):
         if image is not None:
-            # Note: numpy shape is y,x
-            ys, xs = image.array.shape
+            # Note: image may be a SharedImage, so use the bounds rather than the array shape.
+            xs = image.bounds.xmax - image.bounds.xmin + 1
+            ys = image.bounds.ymax - image.bounds.ymin + 1
             if proc is None: s0 = ''
             else: s0 = '%s: '%proc
             image_num = jobs[k]['image_num']
@@ -86,9 +95,27 @@ def BuildImages(nimages, config, image_num=0, obj_num=0, logger=None):
     # Convert to the tasks structure we need for MultiProcess
     tasks = MakeImageTasks(config, jobs, logger)
 
-    images = galsim.config.MultiProcess(nproc, config, BuildImage, tasks, 'image', logger,
-                                        done_func = done_func,
-                                        except_func = except_func)
+    # If requested, have the workers return the images via shared memory, rather than pickling
+    # the arrays to send them back through the results queue.
+    if shared:
+        shared_dir = galsim.config.MakeSharedDir()
+        for job in jobs:
+            job['shared_dir'] = shared_dir
+        job_func = _BuildImageShared
+    else:
+        job_func = BuildImage
+
+    try:
+        images = galsim.config.MultiProcess(nproc, config, job_func, tasks, 'image', logger,
+                                            done_func = done_func,
+                                            except_func = except_func,
+                                            persistent = persistent)
+        if shared:
+            images = [ galsim.config.ReadSharedImage(im) for im in images ]
+    finally:
+        if shared:
+            import shutil
+            shutil.rmtree(shared_dir, ignore_errors=True)
 
     logger.debug('file %d: Done making images',config.get('file_num',0))
     if len(images) == 0:
@@ -192,7 +219,9 @@ def SetupConfigImageSize(config, xsize, ysize, logger=None):
 # Ignore these when parsing the parameters for specific Image types:
 from .stamp import stamp_image_keys
 image_ignore = [ 'random_seed', 'noise', 'pixel_scale', 'wcs', 'sky_level', 'sky_level_pixel',
-                 'index_convention', 'nproc'] + stamp_image_keys
+                 'index_convention', 'nproc', 'nthreads', 'persistent_pool', 'shared_memory',
+                 'batch_params'
+               ] + stamp_image_keys
 
 def BuildImage(config, image_num=0, obj_num=0, logger=None):
     """
@@ -211,6 +240,19 @@ def BuildImage(config, image_num=0, obj_num=0, logger=None):
     # Setup basic things in the top-level config dict that we will need.
     SetupConfigImageNum(config, image_num, obj_num, logger)
 
+    # Building the stamps replaces config['seed'] with the seeds of the individual objects,
+    # so keep the image-level seed for the checkpoint records.
+    seed = config.get('seed',0)
+
+    # If we are resuming a checkpointed run, this image may have been built already.
+    checkpoint = config.get('_checkpoint', None)
+    if checkpoint is not None:
+        image = checkpoint.getImage(config, image_num, obj_num, seed, logger)
+        if image is not None:
+            config['current_image'] = image
+            config['index_key'] = 'image_num'
+            return image
+
     cfg_image = config['image']  # Use cfg_image to avoid name confusion with the actual image
                                  # we will build later.
     image_type = cfg_image['type']
@@ -260,9 +302,18 @@ def BuildImage(config, image_num=0, obj_num=0, logger=None):
 
     builder.addNoise(image, cfg_image, config, image_num, obj_num, current_var, logger)
 
+    if checkpoint is not None:
+        checkpoint.imageDone(config, image, image_num, obj_num, seed, logger)
+
     return image
 
 
+def _BuildImageShared(shared_dir, **kwargs):
+    """Build an image with BuildImage, but return it via shared memory (cf. WriteSharedImage).
+    """
+    image = BuildImage(**kwargs)
+    return galsim.config.WriteSharedImage(image, shared_dir, 'image%d'%kwargs['image_num'])
+
 def GetNObjForImage(config, image_num):
     """
     Get the number of objects that will be made for the image number image_num based on
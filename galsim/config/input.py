@@ -447,6 +447,37 @@ def _GenerateFromCatalog(config, base, value_type):
     #print(base['file_num'],'Catalog: col = %s, index = %s, val = %s'%(col, index, val))
     return val, safe
 
+def _BatchFromCatalog(config, base, value_type, obj_nums):
+    """@brief Return the values read from an input catalog for a batch of objects
+    """
+    if not galsim.config.value._AllConstant(config, ['col', 'num']):
+        return None
+    input_cat = GetInputObj('catalog', config, base, 'Catalog')
+    galsim.config.SetDefaultIndex(config, input_cat.getNObjects())
+
+    req = { 'col' : input_cat.isFits() and str or int , 'index' : int }
+    opt = { 'num' : int }
+    galsim.config.CheckAllParams(config, req=req, opt=opt)
+    col = galsim.config.ParseValue(config, 'col', base, req['col'])[0]
+    index = galsim.config.BatchParseValue(config, 'index', base, int, obj_nums)
+    if index is None:
+        return None
+
+    if value_type is str:
+        get = input_cat.get
+    elif value_type is float:
+        get = input_cat.getFloat
+    elif value_type is int:
+        get = input_cat.getInt
+    else:  # value_type is bool
+        get = lambda index, col: galsim.config.value._GetBoolValue(input_cat.get(index, col))
+
+    try:
+        return [ get(i, col) for i in index ]
+    except (IndexError, KeyError, ValueError):
+        # Let the normal processing raise the error for the right object.
+        return None
+
 def _GenerateFromDict(config, base, value_type):
     """@brief Return a value read from an input dict.
     """
@@ -464,7 +495,8 @@ def _GenerateFromDict(config, base, value_type):
 
 # Register these as valid value types
 from .value import RegisterValueType
-RegisterValueType('Catalog', _GenerateFromCatalog, [ float, int, bool, str ], input_type='catalog')
+RegisterValueType('Catalog', _GenerateFromCatalog, [ float, int, bool, str ], input_type='catalog',
+                  batch_func=_BatchFromCatalog)
 RegisterInputType('catalog', InputLoader(galsim.Catalog, has_nobj=True))
 RegisterInputType('dict', InputLoader(galsim.Dict, file_scope=True))
 RegisterValueType('Dict', _GenerateFromDict, [ float, int, bool, str ], input_type='dict')
@@ -57,6 +57,9 @@ def BuildFiles(nfiles, config, file_num=0, logger=None, except_abort=False):
     # in the config for all file_nums.  This is more important if nproc != 1.
     galsim.config.ProcessInput(config, logger=logger, safe_only=True)
 
+    # If requested, read the checkpoint manifest to find which files are already done.
+    galsim.config.SetupCheckpoint(config, logger=logger)
+
     jobs = []  # Will be a list of the kwargs to use for each job
     info = []  # Will be a list of (file_num, file_name) correspongind to each jobs.
 
@@ -79,6 +82,10 @@ def BuildFiles(nfiles, config, file_num=0, logger=None, except_abort=False):
     else:
         nproc = 1
         orig_config = config
+    if 'persistent_pool' in output:
+        persistent = galsim.config.ParseValue(output, 'persistent_pool', config, bool)[0]
+    else:
+        persistent = False
 
     for k in range(nfiles + first_file_num):
         SetupConfigFileNum(config, file_num, image_num, obj_num, logger)
@@ -141,7 +148,8 @@ def BuildFiles(nfiles, config, file_num=0, logger=None, except_abort=False):
     results = galsim.config.MultiProcess(nproc, orig_config, BuildFile, tasks, 'file',
                                          logger, done_func = done_func,
                                          except_func = except_func,
-                                         except_abort = except_abort)
+                                         except_abort = except_abort,
+                                         persistent = persistent)
     t2 = time.time()
 
     if not results:  # pragma: no cover
@@ -159,7 +167,8 @@ def BuildFiles(nfiles, config, file_num=0, logger=None, except_abort=False):
         logger.warning('Done building files')
 
 
-output_ignore = [ 'nproc', 'skip', 'noclobber', 'retry_io' ]
+output_ignore = [ 'nproc', 'persistent_pool', 'skip', 'noclobber', 'retry_io', 'checkpoint',
+                  'timing' ]
 
 def BuildFile(config, file_num=0, image_num=0, obj_num=0, logger=None):
     """
@@ -179,6 +188,7 @@ def BuildFile(config, file_num=0, image_num=0, obj_num=0, logger=None):
     t1 = time.time()
 
     SetupConfigFileNum(config, file_num, image_num, obj_num, logger)
+    seed = config.get('seed',0)
 
     # Put these values in the config dict so we won't have to run them again later if
     # we need them.  e.g. ExtraOuput processing uses these.
@@ -212,42 +222,72 @@ def BuildFile(config, file_num=0, image_num=0, obj_num=0, logger=None):
         logger.warning('Skipping file %d = %s because output.noclobber = True' +
                        ' and file exists',file_num,file_name)
         return file_name, 0
+    checkpoint = config.get('_checkpoint', None)
+    if checkpoint is not None and checkpoint.isFileDone(file_num, file_name, seed, logger):
+        logger.warning('Skipping file %d = %s because it was completed in a previous run',
+                       file_num,file_name)
+        return file_name, 0
+    coordinator = config.get('_coordinator', None)
+    if coordinator is not None and not coordinator.claim(file_num, file_name, logger):
+        logger.info('Skipping file %d = %s because another job is building it',
+                    file_num,file_name)
+        return file_name, 0
 
-    if logger.isEnabledFor(logging.DEBUG):
-        logger.debug('file %d: file_name = %s',file_num,file_name)
-    else:
-        logger.warning('Start file %d = %s', file_num, file_name)
-
-    ignore = output_ignore + list(galsim.config.valid_extra_outputs)
-    data = builder.buildImages(output, config, file_num, image_num, obj_num, ignore, logger)
+    try:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('file %d: file_name = %s',file_num,file_name)
+        else:
+            logger.warning('Start file %d = %s', file_num, file_name)
 
-    # If any images came back as None, then remove them, since they cannot be written.
-    data = [ im for im in data if im is not None ]
+        # If requested, start accumulating the time spent in each stage for this file.
+        galsim.config.SetupTimings(config, logger)
 
-    if len(data) == 0:
-        logger.warning('Skipping file %d = %s because all images were None',file_num,file_name)
-        return file_name, 0
+        ignore = output_ignore + list(galsim.config.valid_extra_outputs)
+        data = builder.buildImages(output, config, file_num, image_num, obj_num, ignore, logger)
 
-    # Go back to file_num as the default index_key.
-    config['index_key'] = 'file_num'
+        # If any images came back as None, then remove them, since they cannot be written.
+        data = [ im for im in data if im is not None ]
 
-    data = builder.addExtraOutputHDUs(config, data, logger)
+        if len(data) == 0:
+            logger.warning('Skipping file %d = %s because all images were None',file_num,file_name)
+            return file_name, 0
 
-    if 'retry_io' in output:
-        ntries = galsim.config.ParseValue(output,'retry_io',config,int)[0]
-        # This is how many _re_-tries.  Do at least 1, so ntries is 1 more than this.
-        ntries = ntries + 1
-    else:
-        ntries = 1
+        # Go back to file_num as the default index_key.
+        config['index_key'] = 'file_num'
 
-    args = (data, file_name, output, config, logger)
-    RetryIO(builder.writeFile, args, ntries, file_name, logger)
-    logger.debug('file %d: Wrote %s to file %r',file_num,output_type,file_name)
+        data = builder.addExtraOutputHDUs(config, data, logger)
 
-    builder.writeExtraOutputs(config, data, logger)
+        if 'retry_io' in output:
+            ntries = galsim.config.ParseValue(output,'retry_io',config,int)[0]
+            # This is how many _re_-tries.  Do at least 1, so ntries is 1 more than this.
+            ntries = ntries + 1
+        else:
+            ntries = 1
+
+        args = (data, file_name, output, config, logger)
+        with galsim.config.StageTimer(config, 'writeFile'):
+            RetryIO(builder.writeFile, args, ntries, file_name, logger)
+        logger.debug('file %d: Wrote %s to file %r',file_num,output_type,file_name)
+
+        with galsim.config.StageTimer(config, 'writeExtraOutputs'):
+            builder.writeExtraOutputs(config, data, logger)
+
+        if checkpoint is not None:
+            checkpoint.fileDone(file_num, image_num, obj_num, nimages, seed, file_name, logger)
+        if coordinator is not None:
+            coordinator.done(file_num, file_name, logger)
+    except:
+        # Let another job build this file if this one failed.
+        if coordinator is not None:
+            coordinator.release(file_num, file_name, logger)
+        raise
 
     t2 = time.time()
 
+    if '_timings' in config:
+        config['_timings'].add('file', t2-t1)
+        galsim.config.WriteTimings(config, file_num, file_name, logger)
+
     return file_name, t2-t1
 
 def GetNFiles(config):
@@ -705,7 +705,8 @@ def ProcessAllTemplates(config, logger=None, base=None):
                     ProcessAllTemplates(item, logger, base)
 
 # This is the main script to process everything in the configuration dict.
-def Process(config, logger=None, njobs=1, job=1, new_params=None, except_abort=False):
+def Process(config, logger=None, njobs=1, job=1, new_params=None, except_abort=False,
+            coordinator=None):
     """
     Do all processing of the provided configuration dict.  In particular, this
     function handles processing the output field, calling other functions to
@@ -718,6 +719,12 @@ def Process(config, logger=None, njobs=1, job=1, new_params=None, except_abort=F
     the total amount of work into njobs and only do one of those jobs here.  To do this,
     set njobs to be the number of jobs total and job to be which job should be done here.
 
+    Splitting the work this way gives each job a fixed range of files to build, so jobs that
+    happen to finish early just stop.  Alternatively, you can give each job a coordinator
+    (cf. TaskCoordinator and FileLockCoordinator), which hands out the files on demand to
+    whichever job asks for the next one.  In this case, every job should be run with the
+    same (shared) coordinator and njobs = 1.
+
     @param config           The configuration dict.
     @param logger           If given, a logger object to log progress. [default: None]
     @param njobs            The total number of jobs to split the work into. [default: 1]
@@ -726,11 +733,15 @@ def Process(config, logger=None, njobs=1, job=1, new_params=None, except_abort=F
                             dict after any template loading (if any). [default: None]
     @param except_abort     Whether to abort processing when a file raises an exception (True)
                             or just report errors and continue on (False). [default: False]
+    @param coordinator      If given, a TaskCoordinator to use to decide which files to build
+                            in this job. [default: None]
     """
     logger = LoggerWrapper(logger)
     import pprint
     if njobs < 1:
         raise ValueError("Invalid number of jobs %d"%njobs)
+    if njobs > 1 and coordinator is not None:
+        raise ValueError("njobs > 1 is invalid when using a coordinator")
     if job < 1:
         raise ValueError("Invalid job number %d.  Must be >= 1."%job)
     if job > njobs:
@@ -774,14 +785,418 @@ def Process(config, logger=None, njobs=1, job=1, new_params=None, except_abort=F
     else:
         start = 0
 
+    if coordinator is not None:
+        logger.warning('Using %s to get the files to build out of %d total files',
+                       coordinator,nfiles)
+        config['_coordinator'] = coordinator
+
     if nfiles == 1:
         except_abort = True  # Mostly just so the message reads better.
     galsim.config.BuildFiles(nfiles, config, file_num=start, logger=logger,
                              except_abort=except_abort)
 
 
+def ScheduleTasks(tasks, nproc, costs=None):
+    """Group a list of tasks into chunks to be handed out to the worker processes.
+
+    Each worker process takes the next chunk off of a single shared queue as soon as it finishes
+    the previous one, so any worker that is idle effectively steals the remaining work from the
+    others.  The chunking balances two competing considerations.  Large chunks mean less
+    communication overhead, but small chunks mean that all the processes finish at nearly the
+    same time.  So we use what is sometimes called guided self-scheduling: the size of each chunk
+    is chosen so that its total cost is 1/(2 nproc) of the work that still remains to be
+    scheduled.  This means the early chunks are large, and the last ones are single tasks.
+
+    If costs are given, the tasks are also sorted so the most expensive ones are started first.
+    Otherwise, the tasks are all taken to have a cost equal to their number of jobs, and the
+    original order is preserved.
+
+    @param tasks            A list of tasks to run.  Each task is a list of jobs, each of which is
+                            a tuple (kwargs, k).
+    @param nproc            How many processes will be working on the tasks.
+    @param costs            An optional list of estimates of the relative cost of each task.
+                            [default: None]
+
+    @returns a list of chunks, each of which is a list of tasks.
+    """
+    if costs is None:
+        costs = [ float(len(task)) for task in tasks ]
+    if len(costs) != len(tasks):
+        raise ValueError("costs must be the same length as tasks")
+
+    # Sort by decreasing cost.  Python's sort is stable, so equal costs keep their original order.
+    order = sorted(range(len(tasks)), key=lambda i: -costs[i])
+
+    remaining = float(sum(costs))
+    target = remaining / (2*nproc)
+    chunks = []
+    chunk = []
+    chunk_cost = 0.
+    for i in order:
+        chunk.append(tasks[i])
+        chunk_cost += costs[i]
+        if chunk_cost >= target:
+            chunks.append(chunk)
+            remaining -= chunk_cost
+            target = remaining / (2*nproc)
+            chunk = []
+            chunk_cost = 0.
+    if len(chunk) > 0:
+        chunks.append(chunk)
+    return chunks
+
+
+def _RunTask(task, job_func, config, logger, proc, item, results_queue):
+    """Run all the jobs in a single task and put the results onto the results_queue.
+
+    This is the part of the work that is common to the worker processes started by MultiProcess
+    and the persistent ones in a WorkerPool.
+    """
+    import time
+    k = task[0][1]
+    # If we are accumulating stage timings, send the timings for each job back along with the
+    # result, so they can be added to the ones in the main process.
+    timings = config.get('_timings', None)
+    try :
+        logger.debug('%s: Received job to do %d %ss, starting with %s',
+                     proc,len(task),item,task[0][1])
+        for kwargs, k in task:
+            if timings is not None:
+                timings.reset()
+            t1 = time.time()
+            kwargs['config'] = config
+            kwargs['logger'] = logger
+            result = job_func(**kwargs)
+            t2 = time.time()
+            stages = timings.stages if timings is not None else None
+            results_queue.put( (result, k, t2-t1, proc, stages) )
+    except KeyboardInterrupt:
+        raise
+    except Exception as e:
+        import traceback
+        tr = traceback.format_exc()
+        logger.debug('%s: Caught exception: %s\n%s',proc,str(e),tr)
+        results_queue.put( (e, k, tr, proc, None) )
+
+
+def _ReportProfile(pr, proc, logger):
+    """Write the profiling information for a worker process to the logger.
+    """
+    pr.disable()
+    import pstats
+    try:
+        from StringIO import StringIO
+    except ImportError:
+        from io import StringIO
+    s = StringIO()
+    sortby = 'time'  # Note: This is now called tottime, but time seems to be a valid
+                     # alias for this that is backwards compatible to older versions
+                     # of pstats.
+    ps = pstats.Stats(pr, stream=s).sort_stats(sortby).reverse_order()
+    ps.print_stats()
+    logger.error("*** Start profile for %s ***\n%s\n*** End profile for %s ***",
+                 proc,s.getvalue(),proc)
+
+
+def _PoolWorker(task_queue, results_queue, config_queue, logger):
+    """The function run by each process in a WorkerPool.
+
+    Unlike the worker processes started by MultiProcess, these processes outlive a single call
+    to MultiProcess.  Each call is given a sequential call number.  At the start of each call,
+    the pool puts (call_num, config, job_func, item) onto the config_queue of every worker.
+    The items on the task_queue are tuples (call_num, chunk), where chunk is a list of tasks
+    (cf. ScheduleTasks).  When a worker receives a chunk for a newer call than the config it
+    currently has, it reads from its config_queue until it has the config for that call.  (Any
+    configs for calls in which this worker did not receive any tasks are not used, other than
+    to keep track of the input objects.)
+
+    The input objects are only sent to the workers when they change (cf. WorkerPool.startCall).
+    The workers keep the ones they already have, along with anything in the C++ layer caches,
+    for the next call.
+    """
+    from multiprocessing import current_process
+    proc = current_process().name
+    logger = LoggerWrapper(logger)
+
+    call_num = 0
+    config = None
+    job_func = None
+    item = None
+    pr = None
+    input_objs = {}
+
+    for task_call_num, chunk in iter(task_queue.get, 'STOP'):
+        while call_num < task_call_num:
+            call_num, new_config, job_func, item = config_queue.get()
+            input_objs = _RestoreInputs(new_config, input_objs)
+            if call_num == task_call_num:
+                config = new_config
+                ImportModules(config)
+                if pr is None and 'profile' in config and config['profile']:
+                    import cProfile
+                    pr = cProfile.Profile()
+                    pr.enable()
+        for task in chunk:
+            _RunTask(task, job_func, config, logger, proc, item, results_queue)
+
+    logger.debug('%s: Received STOP', proc)
+    if pr is not None:
+        _ReportProfile(pr, proc, logger)
+
+
+class _SentInput(object):
+    """A placeholder for an input object that the pool workers already have.
+    """
+    pass
+
+def _RestoreInputs(config, prev_input_objs):
+    """Replace any _SentInput placeholders in config['input_objs'] with the objects that a pool
+    worker received in an earlier call.
+
+    @param config           The configuration dict that was sent to the worker.
+    @param prev_input_objs  The input_objs dict from the previous config sent to the worker.
+
+    @returns the input_objs dict of the current config
+    """
+    if 'input_objs' not in config:
+        return {}
+    input_objs = config['input_objs']
+    for key, objs in input_objs.items():
+        for i, obj in enumerate(objs):
+            if isinstance(obj, _SentInput):
+                objs[i] = prev_input_objs[key][i]
+    return input_objs
+
+
+class WorkerPool(object):
+    """A set of worker processes that persist across multiple calls to MultiProcess.
+
+    Normally, MultiProcess starts up new processes each time it is called and shuts them down
+    again when all of the tasks are done.  For runs that make many small files (or many images
+    using image.nproc), the cost of starting the processes and rebuilding everything they need
+    (input objects, cached C++ profile data, etc.) can be more than the cost of the actual
+    drawing.  A WorkerPool keeps the same processes running so they can be reused by subsequent
+    calls.
+
+    You would not normally construct one of these directly.  Setting `persistent_pool = True`
+    in either the output or image field (along with nproc) will make MultiProcess use the
+    pool returned by GetWorkerPool.
+
+    @param nproc        How many processes to start.
+    @param logger       If given, a logger object to log progress. [default: None]
+    """
+    def __init__(self, nproc, logger=None):
+        from multiprocessing import Process, Queue
+        self.nproc = nproc
+        self.logger = LoggerWrapper(logger).logger
+
+        # The logger is not picklable, so we need to make a proxy for it so all the
+        # processes can emit logging information safely.
+        self.logger_proxy = GetLoggerProxy(self.logger)
+
+        self.call_num = 0
+        self.sent_inputs = {}
+        self.task_queue = Queue()
+        self.results_queue = Queue()
+        self.config_queues = [ Queue() for j in range(nproc) ]
+        self.p_list = []
+        for j in range(nproc):
+            p = Process(target=_PoolWorker,
+                        args=(self.task_queue, self.results_queue, self.config_queues[j],
+                              self.logger_proxy),
+                        name='PoolProcess-%d'%(j+1))
+            # Make sure these don't prevent the main process from exiting.
+            p.daemon = True
+            p.start()
+            self.p_list.append(p)
+
+    def isCompatible(self, nproc, logger):
+        """Check whether this pool can be used for a call with the given nproc and logger.
+        """
+        return self.nproc == nproc and LoggerWrapper(logger).logger is self.logger
+
+    def startCall(self, config, job_func, item, chunks):
+        """Send a new config and set of tasks to the worker processes.
+
+        @param config       The configuration dict to use for these tasks.  This should be a copy
+                            (e.g. from CopyConfig), since it will be pickled asynchronously.
+        @param job_func     The function to run for each job.
+        @param item         A string indicating what is being worked on.
+        @param chunks       A list of chunks of tasks to run, as returned by ScheduleTasks.
+
+        The input objects in config['input_objs'] can be large (e.g. catalogs or real galaxy
+        images), so each one is only sent the first time it is used.  If the same object is used
+        again in a later call, the workers use the copy they already have.  (New input objects,
+        e.g. ones that are remade for each file, are sent again.)
+        """
+        self.call_num += 1
+        if 'input_objs' in config:
+            input_objs = {}
+            for key, objs in config['input_objs'].items():
+                sent = self.sent_inputs.get(key, [])
+                input_objs[key] = [ _SentInput() if i < len(sent) and obj is sent[i] else obj
+                                    for i, obj in enumerate(objs) ]
+            # Keep references to the objects that were sent, so their ids can't be reused.
+            self.sent_inputs = dict( (key, list(objs))
+                                     for key, objs in config['input_objs'].items() )
+            config['input_objs'] = input_objs
+        else:
+            self.sent_inputs = {}
+        for q in self.config_queues:
+            q.put( (self.call_num, config, job_func, item) )
+        for chunk in chunks:
+            self.task_queue.put( (self.call_num, chunk) )
+
+    def close(self, terminate=False):
+        """Shut down the worker processes.
+
+        @param terminate    Whether to terminate the processes immediately rather than letting
+                            them finish their current tasks. [default: False]
+        """
+        if terminate:
+            for p in self.p_list:
+                p.terminate()
+        else:
+            for p in self.p_list:
+                self.task_queue.put('STOP')
+            for p in self.p_list:
+                p.join()
+        # Workers that never got a task for the last few calls won't have read their config
+        # queues, so don't wait for those to be flushed.
+        for q in self.config_queues:
+            q.cancel_join_thread()
+        self.task_queue.close()
+        self.p_list = []
+
+_worker_pool = None
+
+def GetWorkerPool(nproc, logger=None):
+    """Get a persistent WorkerPool with nproc processes.
+
+    If there is already a pool running that is suitable, it is returned.  Otherwise a new one
+    is started (after shutting down the old one if necessary).
+
+    @param nproc        How many processes are needed.
+    @param logger       If given, a logger object to log progress. [default: None]
+
+    @returns a WorkerPool instance
+    """
+    global _worker_pool
+    if _worker_pool is not None and not _worker_pool.isCompatible(nproc, logger):
+        CloseWorkerPool()
+    if _worker_pool is None:
+        import atexit
+        _worker_pool = WorkerPool(nproc, logger)
+        atexit.register(CloseWorkerPool)
+    return _worker_pool
+
+def CloseWorkerPool(terminate=False):
+    """Shut down the persistent WorkerPool, if one is running.
+
+    This is called automatically when the python session ends, but you may call it explicitly
+    if you want to release the processes (and any memory they are holding) sooner.
+
+    @param terminate    Whether to terminate the processes immediately rather than letting
+                        them finish their current tasks. [default: False]
+    """
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.close(terminate)
+        _worker_pool = None
+
+
+class SharedImage(object):
+    """The information needed to reconstruct an Image whose pixel data were written to shared
+    memory by a worker process.
+
+    When multiprocessing, the results built by each process are normally pickled and sent back
+    to the main process through a pipe.  For large images, this can be a significant bottleneck.
+    When image.shared_memory = True, the workers instead write the pixel values to a
+    memory-mapped file (in /dev/shm if available, so it never actually touches the disk) and
+    only send back one of these objects.  The main process then maps the same memory and
+    uses it directly as the array of the Image, so the pixel data are not copied again.
+
+    See WriteSharedImage and ReadSharedImage.
+
+    @param file_name    The name of the memory-mapped file with the pixel data.
+    @param shape        The numpy shape of the array.
+    @param dtype        The numpy dtype of the array.
+    @param bounds       The bounds of the image.
+    @param wcs          The wcs of the image.
+    """
+    def __init__(self, file_name, shape, dtype, bounds, wcs):
+        self.file_name = file_name
+        self.shape = shape
+        self.dtype = dtype
+        self.bounds = bounds
+        self.wcs = wcs
+
+def MakeSharedDir():
+    """Make a temporary directory to hold the memory-mapped files for SharedImages.
+
+    The directory is made in /dev/shm if that is available, so the files are held in memory.
+    Otherwise, it is made in the normal temporary directory.  The caller is responsible for
+    removing the directory (e.g. with shutil.rmtree) when it is finished.
+
+    @returns the name of the directory
+    """
+    import tempfile
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        dir = '/dev/shm'
+    else:  # pragma: no cover
+        dir = None
+    return tempfile.mkdtemp(prefix='galsim_shared_', dir=dir)
+
+def WriteSharedImage(image, shared_dir, name):
+    """Write the pixel data of an image to a memory-mapped file for reading by another process.
+
+    If the image is None or has no pixels, it is returned as is.
+
+    @param image        The image to write.
+    @param shared_dir   The directory in which to write the file (cf. MakeSharedDir).
+    @param name         A name for the file, which must be unique within shared_dir.
+
+    @returns a SharedImage instance (or the original image)
+    """
+    import numpy as np
+    if image is None or image.array.size == 0:
+        return image
+    file_name = os.path.join(shared_dir, name)
+    ar = np.memmap(file_name, dtype=image.array.dtype, mode='w+', shape=image.array.shape)
+    ar[:,:] = image.array
+    ar.flush()
+    del ar
+    return SharedImage(file_name, image.array.shape, image.array.dtype, image.bounds, image.wcs)
+
+def ReadSharedImage(shared_image):
+    """Make an Image using the memory-mapped pixel data described by a SharedImage.
+
+    The returned image uses the shared memory directly as its array, so there is no copy.
+    The file itself is removed right away.  The memory stays valid for as long as the image
+    (or any view of it) is still around.
+
+    If the argument is not a SharedImage (e.g. if it is already an Image or None), it is
+    returned as is.
+
+    @param shared_image The SharedImage returned by WriteSharedImage
+
+    @returns the Image
+    """
+    import numpy as np
+    if not isinstance(shared_image, SharedImage):
+        return shared_image
+    ar = np.memmap(shared_image.file_name, dtype=shared_image.dtype, mode='r+',
+                   shape=shared_image.shape)
+    # The mapping stays valid after the file is removed.
+    os.remove(shared_image.file_name)
+    # Use a regular ndarray view of the memmap.  Its base is the memmap, so the memory will
+    # stay mapped as long as this array is alive.
+    return galsim._Image(ar.view(np.ndarray), shared_image.bounds, shared_image.wcs)
+
+
 def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
-                 done_func=None, except_func=None, except_abort=True):
+                 done_func=None, except_func=None, except_abort=True, persistent=False,
+                 costs=None, threads=False):
     """A helper function for performing a task using multiprocessing.
 
     A note about the nomenclature here.  We use the term "job" to mean the job of building a single
@@ -815,6 +1230,16 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
     @param except_abort     Whether an exception should abort the rest of the processing.
                             If False, then the returned results list will not include anything
                             for the jobs that failed.  [default: True]
+    @param persistent       Whether to use a persistent WorkerPool (see GetWorkerPool) rather than
+                            starting new processes for this call.  The processes are then kept
+                            running for use by later calls. [default: False]
+    @param costs            An optional list of estimates of the relative cost of each task, which
+                            is used to start the most expensive tasks first.  See ScheduleTasks
+                            for details about how the tasks are divided among the processes.
+                            [default: None]
+    @param threads          Whether to run the jobs in nproc threads within the current process
+                            rather than in separate processes.  See MultiThread for details.
+                            [default: False]
 
     @returns a list of the outputs from job_func for each job
     """
@@ -839,59 +1264,31 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
         logger = LoggerWrapper(logger)
 
         if 'profile' in config and config['profile']:
-            import cProfile, pstats, io
+            import cProfile
             pr = cProfile.Profile()
             pr.enable()
         else:
             pr = None
 
-        for task in iter(task_queue.get, 'STOP'):
-            try :
-                logger.debug('%s: Received job to do %d %ss, starting with %s',
-                             proc,len(task),item,task[0][1])
-                for kwargs, k in task:
-                    t1 = time.time()
-                    kwargs['config'] = config
-                    kwargs['logger'] = logger
-                    result = job_func(**kwargs)
-                    t2 = time.time()
-                    results_queue.put( (result, k, t2-t1, proc) )
-            except KeyboardInterrupt:
-                raise
-            except Exception as e:
-                import traceback
-                tr = traceback.format_exc()
-                logger.debug('%s: Caught exception: %s\n%s',proc,str(e),tr)
-                results_queue.put( (e, k, tr, proc) )
+        for chunk in iter(task_queue.get, 'STOP'):
+            for task in chunk:
+                _RunTask(task, job_func, config, logger, proc, item, results_queue)
         logger.debug('%s: Received STOP', proc)
         if pr is not None:
-            pr.disable()
-            try:
-                from StringIO import StringIO
-            except ImportError:
-                from io import StringIO
-            s = StringIO()
-            sortby = 'time'  # Note: This is now called tottime, but time seems to be a valid
-                             # alias for this that is backwards compatible to older versions
-                             # of pstats.
-            ps = pstats.Stats(pr, stream=s).sort_stats(sortby).reverse_order()
-            ps.print_stats()
-            logger.error("*** Start profile for %s ***\n%s\n*** End profile for %s ***",
-                         proc,s.getvalue(),proc)
+            _ReportProfile(pr, proc, logger)
 
     njobs = sum([len(task) for task in tasks])
 
-    if nproc > 1:
+    if nproc > 1 and threads:
+        results = MultiThread(nproc, config, job_func, tasks, item, logger,
+                              done_func, except_func, except_abort, costs)
+
+    elif nproc > 1:
         logger.warning("Using %d processes for %s processing",nproc,item)
 
         from multiprocessing import Process, Queue, current_process
         from multiprocessing.managers import BaseManager
 
-        # Send the tasks to the task_queue.
-        task_queue = Queue()
-        for task in tasks:
-            task_queue.put(task)
-
         # Temporarily mark that we are multiprocessing, so we know not to start another
         # round of multiprocessing later.
         config['current_nproc'] = nproc
@@ -899,33 +1296,56 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
         if 'profile' in config and config['profile']:
             logger.info("Starting separate profiling for each of the %d processes.",nproc)
 
-        # The logger is not picklable, so we need to make a proxy for it so all the
-        # processes can emit logging information safely.
-        logger_proxy = GetLoggerProxy(logger)
-
-        # Run the tasks.
-        # Each Process command starts up a parallel process that will keep checking the queue
-        # for a new task. If there is one there, it grabs it and does it. If not, it waits
-        # until there is one to grab. When it finds a 'STOP', it shuts down.
-        results_queue = Queue()
-        p_list = []
-        for j in range(nproc):
-            # The process name is actually the default name that Process would generate on its
-            # own for the first time we do this. But after that, if we start another round of
-            # multiprocessing, then it just keeps incrementing the numbers, rather than starting
-            # over at Process-1.  As far as I can tell, it's not actually spawning more
-            # processes, so for the sake of the logging output, we name the processes explicitly.
-            p = Process(target=worker, args=(task_queue, results_queue, config, logger_proxy),
-                        name='Process-%d'%(j+1))
-            p.start()
-            p_list.append(p)
+        # Group the tasks into chunks, with the most expensive tasks first if we know the costs.
+        chunks = ScheduleTasks(tasks, nproc, costs)
+        logger.debug('Split %d tasks into %d chunks',len(tasks),len(chunks))
+
+        if persistent:
+            # Use (and possibly start) the persistent pool.  The config is pickled to send it
+            # to the workers, so give it a copy to make sure we don't change it before that
+            # happens.
+            pool = GetWorkerPool(nproc, logger)
+            logger.debug('Using persistent worker pool with %d processes',pool.nproc)
+            pool_config = CopyConfig(config)
+            # The output_manager itself can't be pickled.  The workers only need the proxies
+            # that it made, which are in the extra_builder objects.
+            pool_config.pop('output_manager', None)
+            pool.startCall(pool_config, job_func, item, chunks)
+            results_queue = pool.results_queue
+        else:
+            # Send the tasks to the task_queue.
+            task_queue = Queue()
+            for chunk in chunks:
+                task_queue.put(chunk)
+
+            # The logger is not picklable, so we need to make a proxy for it so all the
+            # processes can emit logging information safely.
+            logger_proxy = GetLoggerProxy(logger)
+
+            # Run the tasks.
+            # Each Process command starts up a parallel process that will keep checking the queue
+            # for a new task. If there is one there, it grabs it and does it. If not, it waits
+            # until there is one to grab. When it finds a 'STOP', it shuts down.
+            results_queue = Queue()
+            p_list = []
+            for j in range(nproc):
+                # The process name is actually the default name that Process would generate on
+                # its own for the first time we do this. But after that, if we start another round
+                # of multiprocessing, then it just keeps incrementing the numbers, rather than
+                # starting over at Process-1.  As far as I can tell, it's not actually spawning
+                # more processes, so for the sake of the logging output, we name the processes
+                # explicitly.
+                p = Process(target=worker, args=(task_queue, results_queue, config, logger_proxy),
+                            name='Process-%d'%(j+1))
+                p.start()
+                p_list.append(p)
 
         # In the meanwhile, the main process keeps going.  We pull each set of images off of the
         # results_queue and put them in the appropriate place in the lists.
         # This loop is happening while the other processes are still working on their tasks.
         results = [ None for k in range(njobs) ]
         for kk in range(njobs):
-            res, k, t, proc = results_queue.get()
+            res, k, t, proc, stages = results_queue.get()
             if isinstance(res,Exception):
                 # res is really the exception, e
                 # t is really the traceback
@@ -933,8 +1353,13 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
                 if except_func is not None:  # pragma: no branch
                     except_func(logger, proc, k, res, t)
                 if except_abort or isinstance(res,KeyboardInterrupt):
-                    for j in range(nproc):
-                        p_list[j].terminate()
+                    if persistent:
+                        # The remaining tasks for this call are still in the queue, so we can't
+                        # reuse this pool.  Shut it down; the next call will start a new one.
+                        CloseWorkerPool(terminate=True)
+                    else:
+                        for j in range(nproc):
+                            p_list[j].terminate()
                     del config['current_nproc']
                     raise res
             else:
@@ -942,20 +1367,23 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
                 if done_func is not None:  # pragma: no branch
                     done_func(logger, proc, k, res, t)
                 results[k] = res
-
-        # Stop the processes
-        # The 'STOP's could have been put on the task list before starting the processes, or you
-        # can wait.  In some cases it can be useful to clear out the results_queue (as we just did)
-        # and then add on some more tasks.  We don't need that here, but it's perfectly fine to do.
-        # Once you are done with the processes, putting nproc 'STOP's will stop them all.
-        # This is important, because the program will keep running as long as there are running
-        # processes, even if the main process gets to the end.  So you do want to make sure to
-        # add those 'STOP's at some point!
-        for j in range(nproc):
-            task_queue.put('STOP')
-        for j in range(nproc):
-            p_list[j].join()
-        task_queue.close()
+                if stages is not None and '_timings' in config:
+                    config['_timings'].merge(stages)
+
+        if not persistent:
+            # Stop the processes
+            # The 'STOP's could have been put on the task list before starting the processes, or
+            # you can wait.  In some cases it can be useful to clear out the results_queue (as we
+            # just did) and then add on some more tasks.  We don't need that here, but it's
+            # perfectly fine to do.  Once you are done with the processes, putting nproc 'STOP's
+            # will stop them all.  This is important, because the program will keep running as
+            # long as there are running processes, even if the main process gets to the end.  So
+            # you do want to make sure to add those 'STOP's at some point!
+            for j in range(nproc):
+                task_queue.put('STOP')
+            for j in range(nproc):
+                p_list[j].join()
+            task_queue.close()
 
         # And clear this out, so we know that we're not multiprocessing anymore.
         del config['current_nproc']
@@ -989,6 +1417,107 @@ def MultiProcess(nproc, config, job_func, tasks, item, logger=None,
 
     return results
 
+def MultiThread(nthreads, config, job_func, tasks, item, logger=None,
+                done_func=None, except_func=None, except_abort=True, costs=None):
+    """A helper function for performing a task using multiple threads in the current process.
+
+    This is normally called via MultiProcess(..., threads=True), which returns the results in
+    the same form as for multiple processes.  Unlike processes, the threads all share a single
+    copy of the input objects (e.g. catalogs, real galaxy images) and the C++ caches (e.g. the
+    SersicInfo tables), which saves a lot of memory.  The C++ drawing functions release the GIL,
+    so the drawing itself does run concurrently, although anything done in Python code does not.
+
+    Each thread gets its own copy of the config dict (see CopyConfig), so the current values
+    stored there by the different threads don't clobber each other.  Note that the input
+    objects, extra output builders, etc. are shared though.
+
+    @param nthreads         How many threads to use.
+    @param config           The configuration dict.
+    @param job_func         The function to run for each job.
+    @param tasks            A list of tasks to run.  Each task is a list of jobs, each of which is
+                            a tuple (kwargs, k).
+    @param item             A string indicating what is being worked on.
+    @param logger           If given, a logger object to log progress. [default: None]
+    @param done_func        A function to run upon completion of each job. [default: None]
+    @param except_func      A function to run if an exception is encountered. [default: None]
+    @param except_abort     Whether an exception should abort the rest of the processing.
+                            [default: True]
+    @param costs            An optional list of estimates of the relative cost of each task.
+                            [default: None]
+
+    (See MultiProcess for more details about these parameters.)
+
+    @returns a list of the outputs from job_func for each job, with None for any that failed.
+    """
+    import threading
+    try:
+        from Queue import Queue
+    except ImportError:
+        from queue import Queue
+    logger = LoggerWrapper(logger)
+    logger.warning("Using %d threads for %s processing",nthreads,item)
+
+    # Mark that we are already running in parallel, so we don't try to start another level
+    # of threads or processes inside the jobs.
+    config['current_nproc'] = nthreads
+
+    chunks = ScheduleTasks(tasks, nthreads, costs)
+    logger.debug('Split %d tasks into %d chunks',len(tasks),len(chunks))
+
+    task_queue = Queue()
+    for chunk in chunks:
+        task_queue.put(chunk)
+    for j in range(nthreads):
+        task_queue.put('STOP')
+    results_queue = Queue()
+
+    # Threads can't be terminated, so if we need to abort, this tells the threads to skip any
+    # remaining tasks.
+    abort = threading.Event()
+
+    def worker(config):
+        proc = threading.current_thread().name
+        for chunk in iter(task_queue.get, 'STOP'):
+            for task in chunk:
+                if abort.is_set(): break
+                _RunTask(task, job_func, config, logger, proc, item, results_queue)
+        logger.debug('%s: Received STOP', proc)
+
+    t_list = []
+    for j in range(nthreads):
+        thread_config = CopyConfig(config)
+        if '_timings' in config:
+            # Each thread needs its own timings, which are sent back along with the results.
+            thread_config['_timings'] = galsim.config.StageTimings()
+        t = threading.Thread(target=worker, args=(thread_config,), name='Thread-%d'%(j+1))
+        t.daemon = True
+        t.start()
+        t_list.append(t)
+
+    njobs = sum([len(task) for task in tasks])
+    results = [ None for k in range(njobs) ]
+    try:
+        for kk in range(njobs):
+            res, k, t, proc, stages = results_queue.get()
+            if isinstance(res,Exception):
+                if except_func is not None:  # pragma: no branch
+                    except_func(logger, proc, k, res, t)
+                if except_abort or isinstance(res,KeyboardInterrupt):
+                    abort.set()
+                    raise res
+            else:
+                if done_func is not None:  # pragma: no branch
+                    done_func(logger, proc, k, res, t)
+                results[k] = res
+                if stages is not None:
+                    config['_timings'].merge(stages)
+    finally:
+        for t in t_list:
+            t.join()
+        del config['current_nproc']
+
+    return results
+
 
 valid_index_keys = [ 'obj_num_in_file', 'obj_num', 'image_num', 'file_num' ]
 
@@ -1019,6 +1548,29 @@ def GetIndex(config, base, is_sequence=False):
     return index, index_key
 
 
+def GetBatchIndices(config, base, obj_nums, is_sequence=False):
+    """Return the indices to use for a parameter for each of a number of objects.
+
+    This is the equivalent of GetIndex for a batch of objects that are all in the current
+    image.  If the index_key is obj_num (or obj_num_in_file), the indices are offset from the
+    current index the same way the obj_nums are.  Otherwise, the index is the same for all of
+    the objects.
+
+    @param config           The configuration dict for the parameter.
+    @param base             The base configuration dict.
+    @param obj_nums         A numpy array of the obj_num values of the objects.
+    @param is_sequence      Whether the parameter is a Sequence. [default: False]
+
+    @returns a numpy array of the indices
+    """
+    import numpy as np
+    index, index_key = GetIndex(config, base, is_sequence)
+    if index_key == 'obj_num':
+        return np.asarray(obj_nums) + (index - base.get('obj_num',0))
+    else:
+        return np.zeros(len(obj_nums), dtype=int) + index
+
+
 def GetRNG(config, base, logger=None, tag=None):
     """Get the appropriate current rng according to whatever the current index_key is.
 
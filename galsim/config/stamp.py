@@ -68,6 +68,28 @@ def BuildStamps(nobjects, config, obj_num=0,
         nproc = galsim.config.UpdateNProc(nproc, nobjects, config, logger)
     else:
         nproc = 1
+    # Alternatively, the stamps may be drawn by several threads in this process.  This shares the
+    # input objects and the C++ caches among the threads, rather than having a copy in each
+    # process.
+    if nproc == 1 and nobjects > 1 and 'image' in config and 'nthreads' in config['image']:
+        nthreads = galsim.config.ParseValue(config['image'], 'nthreads', config, int)[0]
+        nthreads = galsim.config.UpdateNProc(nthreads, nobjects, config, logger)
+    else:
+        nthreads = 1
+    if 'image' in config and 'persistent_pool' in config['image']:
+        persistent = galsim.config.ParseValue(config['image'], 'persistent_pool', config, bool)[0]
+    else:
+        persistent = False
+    if nproc > 1 and 'shared_memory' in config['image']:
+        shared = galsim.config.ParseValue(config['image'], 'shared_memory', config, bool)[0]
+    else:
+        shared = False
+    # If requested, the values that can be generated for all of the stamps at once are
+    # calculated the first time they are needed, rather than separately for each stamp.
+    if nobjects > 1 and 'image' in config and 'batch_params' in config['image']:
+        batch = galsim.config.ParseValue(config['image'], 'batch_params', config, bool)[0]
+    else:
+        batch = False
 
     jobs = []
     for k in range(nobjects):
@@ -81,9 +103,10 @@ def BuildStamps(nobjects, config, obj_num=0,
 
     def done_func(logger, proc, k, result, t):
         if result[0] is not None:
-            # Note: numpy shape is y,x
-            image = result[0]
-            ys, xs = image.array.shape
+            # Note: result[0] may be a SharedImage, so use the bounds rather than the array shape.
+            b = result[0].bounds
+            xs = b.xmax - b.xmin + 1
+            ys = b.ymax - b.ymin + 1
             if proc is None: s0 = ''
             else: s0 = '%s: '%proc
             obj_num = jobs[k]['obj_num']
@@ -101,11 +124,41 @@ def BuildStamps(nobjects, config, obj_num=0,
     # Each task is a list of (job, k) tuples.
     tasks = MakeStampTasks(config, jobs, logger)
 
-    results = galsim.config.MultiProcess(nproc, config, BuildStamp, tasks, 'stamp', logger,
-                                         done_func = done_func,
-                                         except_func = except_func)
+    # If we are multiprocessing, get the estimated cost of each task so the scheduler can
+    # start the most expensive ones first.
+    if nproc > 1 or nthreads > 1:
+        costs = GetStampTaskCosts(config, tasks, logger)
+    else:
+        costs = None
+
+    # If requested, have the workers return the stamps via shared memory, rather than pickling
+    # the arrays to send them back through the results queue.
+    if shared:
+        shared_dir = galsim.config.MakeSharedDir()
+        for job in jobs:
+            job['shared_dir'] = shared_dir
+        job_func = _BuildStampShared
+    else:
+        job_func = BuildStamp
 
-    images, current_vars = zip(*results)
+    if batch:
+        galsim.config.SetupBatch(config, obj_num, nobjects)
+    try:
+        results = galsim.config.MultiProcess(max(nproc,nthreads), config, job_func, tasks,
+                                             'stamp', logger,
+                                             done_func = done_func,
+                                             except_func = except_func,
+                                             persistent = persistent,
+                                             costs = costs,
+                                             threads = nthreads > 1)
+        images, current_vars = zip(*results)
+        if shared:
+            images = [ galsim.config.ReadSharedImage(im) for im in images ]
+    finally:
+        if shared:
+            import shutil
+            shutil.rmtree(shared_dir, ignore_errors=True)
+        config.pop('_batch_obj_nums', None)
 
     logger.debug('image %d: Done making stamps',config.get('image_num',0))
     if all(im is None for im in images):
@@ -350,9 +403,10 @@ def BuildStamp(config, obj_num=0, xsize=0, ysize=0, do_noise=True, logger=None):
 
             if not skip:
                 try :
-                    psf = galsim.config.BuildGSObject(config, 'psf', gsparams=gsparams,
-                                                    logger=logger)[0]
-                    prof = builder.buildProfile(stamp, config, psf, gsparams, logger)
+                    with galsim.config.StageTimer(config, 'buildProfile'):
+                        psf = galsim.config.BuildGSObject(config, 'psf', gsparams=gsparams,
+                                                          logger=logger)[0]
+                        prof = builder.buildProfile(stamp, config, psf, gsparams, logger)
                 except galsim.config.gsobject.SkipThisObject as e:
                     logger.debug('obj %d: Caught SkipThisObject: e = %s',obj_num,e.msg)
                     logger.info('Skipping object %d',obj_num)
@@ -374,10 +428,11 @@ def BuildStamp(config, obj_num=0, xsize=0, ysize=0, do_noise=True, logger=None):
                 skip = builder.updateSkip(prof, im, method, offset, stamp, config, logger)
 
             if not skip:
-                im = builder.draw(prof, im, method, offset, stamp, config, logger)
+                with galsim.config.StageTimer(config, 'draw'):
+                    im = builder.draw(prof, im, method, offset, stamp, config, logger)
 
-                scale_factor = builder.getSNRScale(im, stamp, config, logger)
-                im, prof = builder.applySNRScale(im, prof, scale_factor, method, logger)
+                    scale_factor = builder.getSNRScale(im, stamp, config, logger)
+                    im, prof = builder.applySNRScale(im, prof, scale_factor, method, logger)
 
             # Set the origin appropriately
             if im is None:
@@ -395,7 +450,8 @@ def BuildStamp(config, obj_num=0, xsize=0, ysize=0, do_noise=True, logger=None):
 
             # Check if this object should be rejected.
             if not skip:
-                reject = builder.reject(stamp, config, prof, psf, im, logger)
+                with galsim.config.StageTimer(config, 'reject'):
+                    reject = builder.reject(stamp, config, prof, psf, im, logger)
                 if reject:
                     if itry < ntries:
                         logger.warning('Object %d: Rejecting this object and rebuilding', obj_num)
@@ -406,11 +462,13 @@ def BuildStamp(config, obj_num=0, xsize=0, ysize=0, do_noise=True, logger=None):
                                 "Rejected an object %d times. If this is expected, "%ntries+
                                 "you should specify a larger stamp.retry_failures.")
 
-            galsim.config.ProcessExtraOutputsForStamp(config, skip, logger)
+            with galsim.config.StageTimer(config, 'processExtraOutputs'):
+                galsim.config.ProcessExtraOutputsForStamp(config, skip, logger)
 
             # We always need to do the whiten step here in the stamp processing
             if not skip:
-                current_var = builder.whiten(prof, im, stamp, config, logger)
+                with galsim.config.StageTimer(config, 'whiten'):
+                    current_var = builder.whiten(prof, im, stamp, config, logger)
                 if current_var != 0.:
                     logger.debug('obj %d: whitening noise brought current var to %f',
                                  config['obj_num'],current_var)
@@ -419,7 +477,8 @@ def BuildStamp(config, obj_num=0, xsize=0, ysize=0, do_noise=True, logger=None):
 
             # Sometimes, depending on the image type, we go on to do the rest of the noise as well.
             if do_noise and not skip:
-                im, current_var = builder.addNoise(stamp,config,im,skip,current_var,logger)
+                with galsim.config.StageTimer(config, 'addNoise'):
+                    im, current_var = builder.addNoise(stamp,config,im,skip,current_var,logger)
 
             return im, current_var
 
@@ -445,6 +504,13 @@ def BuildStamp(config, obj_num=0, xsize=0, ysize=0, do_noise=True, logger=None):
                 builder.reset(config, logger)
                 continue
 
+def _BuildStampShared(shared_dir, **kwargs):
+    """Build a stamp with BuildStamp, but return it via shared memory (cf. WriteSharedImage).
+    """
+    im, current_var = BuildStamp(**kwargs)
+    im = galsim.config.WriteSharedImage(im, shared_dir, 'stamp%d'%kwargs['obj_num'])
+    return im, current_var
+
 def MakeStampTasks(config, jobs, logger):
     """Turn a list of jobs into a list of tasks.
 
@@ -469,6 +535,43 @@ def MakeStampTasks(config, jobs, logger):
     return valid_stamp_types[stamp_type].makeTasks(stamp, config, jobs, logger)
 
 
+def GetStampTaskCosts(config, tasks, logger):
+    """Estimate the relative cost of each task in a list of tasks.
+
+    The cost of each task is the sum of the costs of its jobs, as estimated by the getJobCost
+    method of the stamp builder.
+
+    @param config           The configuration dict
+    @param tasks            A list of tasks, as returned by MakeStampTasks.
+    @param logger           If given, a logger object to log progress.
+
+    @returns a list of costs
+    """
+    stamp = config.get('stamp', {})
+    stamp_type = stamp.get('type', 'Basic')
+    builder = valid_stamp_types[stamp_type]
+    return [ sum([ builder.getJobCost(stamp, config, job, logger) for job, k in task ])
+             for task in tasks ]
+
+
+# Rough relative costs of drawing some of the more expensive profile types compared to simple
+# analytic ones like Gaussian or Exponential.  These are only used as scheduling hints when
+# multiprocessing, so they don't need to be very accurate.
+profile_cost_factors = {
+    'Sersic' : 3.,
+    'DeVaucouleurs' : 3.,
+    'InclinedSersic' : 5.,
+    'InclinedExponential' : 2.,
+    'Spergel' : 2.,
+    'Kolmogorov' : 2.,
+    'Airy' : 2.,
+    'OpticalPSF' : 5.,
+    'InterpolatedImage' : 3.,
+    'RealGalaxy' : 5.,
+    'RealGalaxyOriginal' : 5.,
+    'COSMOSGalaxy' : 5.,
+}
+
 def DrawBasic(prof, image, method, offset, config, base, logger, **kwargs):
     """The basic implementation of the draw command
 
@@ -977,6 +1080,51 @@ class StampBuilder(object):
         current_var = galsim.config.AddNoise(base,image,current_var,logger)
         return image, current_var
 
+    def getJobCost(self, config, base, job, logger):
+        """Estimate the relative cost of building the stamp for a given job.
+
+        This is only used as a hint for scheduling the stamps when multiprocessing, so the most
+        expensive stamps get started first.  It is called in the main process before any of the
+        stamps are built, so it should be fast, and it should not rely on anything that requires
+        the config dict to be set up for the particular object.
+
+        The base class uses the area of the stamp if it is known ahead of time (either from the
+        job or from a constant size in the config dict) times a rough factor for the types of
+        the gal and psf fields (cf. galsim.config.stamp.profile_cost_factors).  Custom stamp
+        types that have better information about the objects, such as their sizes from an input
+        catalog, may override this.
+
+        @param config       The configuration dict for the stamp field.
+        @param base         The base configuration dict.
+        @param job          The dict of kwargs for this job.  It includes 'obj_num', 'xsize', and
+                            'ysize'.
+        @param logger       If given, a logger object to log progress.
+
+        @returns the estimated cost (in arbitrary units)
+        """
+        def const_size(d, keys):
+            # Return the first of the given keys in d that is a plain integer.
+            for key in keys:
+                if key in d and isinstance(d[key], int):
+                    return d[key]
+            return 0
+
+        image = base.get('image', {})
+        xsize = job.get('xsize', 0)
+        ysize = job.get('ysize', 0)
+        if not xsize:
+            xsize = const_size(config, ['xsize', 'size']) or \
+                    const_size(image, ['stamp_xsize', 'stamp_size'])
+        if not ysize:
+            ysize = const_size(config, ['ysize', 'size']) or \
+                    const_size(image, ['stamp_ysize', 'stamp_size'])
+        cost = float(xsize * ysize) if xsize and ysize else 1.
+
+        for key in ['gal', 'psf']:
+            if key in base and isinstance(base[key], dict):
+                cost *= profile_cost_factors.get(str(base[key].get('type', '')), 1.)
+        return cost
+
     def makeTasks(self, config, base, jobs, logger):
         """Turn a list of jobs into a list of tasks.
 
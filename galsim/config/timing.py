@@ -0,0 +1,173 @@
+# Copyright (c) 2012-2017 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+
+import os
+import time
+import galsim
+from .value import _IsConstant
+
+# This file handles the timing of the different stages of building each output file.
+# If config['output']['timing'] is set to the name of a report file, then the time spent in
+# each stage of building the stamps (buildProfile, draw, whiten, etc.) and in writing the
+# output file is accumulated over all of the objects in the file, including the ones built by
+# other processes or threads, and written to the report once the file is done.
+# Unlike the profile option of the galsim executable, this is cheap enough to leave on for
+# production runs.
+
+
+class StageTimings(object):
+    """The accumulated time spent in each stage of processing.
+
+    For each stage, this records the number of times the stage was run and the total time.
+    """
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, stage, t):
+        """Add the time for one run of the given stage.
+
+        @param stage            The name of the stage.
+        @param t                The time taken (in seconds).
+        """
+        if stage in self.stages:
+            n, tot = self.stages[stage]
+            self.stages[stage] = (n+1, tot+t)
+        else:
+            self.stages[stage] = (1, t)
+
+    def merge(self, stages):
+        """Add in the timings from another StageTimings object (e.g. from a worker process).
+
+        @param stages           The stages dict of the other StageTimings object.
+        """
+        for stage, (n, t) in stages.items():
+            n0, t0 = self.stages.get(stage, (0, 0.))
+            self.stages[stage] = (n0+n, t0+t)
+
+    def reset(self):
+        """Clear all the accumulated timings.
+        """
+        self.stages = {}
+
+    def write(self, file_name, file_num=0, output_file_name=None):
+        """Write a report of the timings to a file.
+
+        If the file name ends with .csv, then the report is written as a csv file with columns
+        stage, count, time, mean.  Otherwise, it is written as a JSON dict.
+
+        @param file_name        The name of the report file.
+        @param file_num         The file_num of the output file these timings are for.
+                                [default: 0]
+        @param output_file_name The name of the output file these timings are for.
+                                [default: None]
+        """
+        galsim.config.EnsureDir(file_name)
+        stages = sorted(self.stages.keys())
+        if os.path.splitext(file_name)[1].lower() == '.csv':
+            with open(file_name, 'w') as fout:
+                fout.write('stage,count,time,mean\n')
+                for stage in stages:
+                    n, t = self.stages[stage]
+                    fout.write('%s,%d,%.6f,%.6f\n'%(stage, n, t, t/n))
+        else:
+            import json
+            report = {
+                'file_num' : file_num,
+                'file_name' : output_file_name,
+                'stages' : dict( (stage, { 'count' : self.stages[stage][0],
+                                           'time' : self.stages[stage][1],
+                                           'mean' : self.stages[stage][1]/self.stages[stage][0] })
+                                 for stage in stages ),
+            }
+            with open(file_name, 'w') as fout:
+                json.dump(report, fout, indent=2, sort_keys=True)
+
+    def __repr__(self):
+        return 'galsim.config.StageTimings()'
+
+
+class StageTimer(object):
+    """A context manager to time a stage of the processing.
+
+    The time taken in the with block is added to config['_timings'] if it exists.
+    Otherwise this doesn't do anything.
+
+        with galsim.config.StageTimer(config, 'draw'):
+            im = builder.draw(...)
+
+    @param config           The configuration dict.
+    @param stage            The name of the stage.
+    """
+    def __init__(self, config, stage):
+        self.timings = config.get('_timings', None)
+        self.stage = stage
+
+    def __enter__(self):
+        if self.timings is not None:
+            self.t1 = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        # Only record stages that finished normally.
+        if self.timings is not None and exc_type is None:
+            self.timings.add(self.stage, time.time() - self.t1)
+        return False
+
+
+def SetupTimings(config, logger=None):
+    """Set up the timings for the current file if config['output']['timing'] is given.
+
+    The StageTimings object is stored in config['_timings'].
+
+    @param config           The configuration dict.
+    @param logger           If given, a logger object to log progress. [default: None]
+    """
+    output = config.get('output', {})
+    if 'timing' in output:
+        config['_timings'] = StageTimings()
+    else:
+        config.pop('_timings', None)
+
+def WriteTimings(config, file_num, file_name, logger=None):
+    """Write the timings report for the current file if config['output']['timing'] is given.
+
+    Normally output.timing would depend on file_num like the output file_name does.  If it is
+    just a fixed name and there is more than one output file, then the file_num is inserted
+    before the extension (e.g. timing.json becomes timing_0.json, timing_1.json, etc.), so the
+    report for each file does not overwrite the previous ones.
+
+    @param config           The configuration dict.
+    @param file_num         The current file_num.
+    @param file_name        The name of the output file.
+    @param logger           If given, a logger object to log progress. [default: None]
+    """
+    logger = galsim.config.LoggerWrapper(logger)
+    timings = config.get('_timings', None)
+    if timings is None:
+        return
+    output = config['output']
+    fixed_name = _IsConstant(output['timing'])
+    report_name = galsim.config.ParseValue(output, 'timing', config, str)[0]
+    if fixed_name and galsim.config.GetNFiles(config) > 1:
+        root, ext = os.path.splitext(report_name)
+        report_name = '%s_%d%s'%(root, file_num, ext)
+    if 'dir' in output and not os.path.isabs(report_name):
+        report_name = os.path.join(galsim.config.ParseValue(output, 'dir', config, str)[0],
+                                   report_name)
+    timings.write(report_name, file_num, file_name)
+    logger.info('file %d: Wrote timing report to %s',file_num,report_name)
@@ -19,6 +19,8 @@ from __future__ import print_function
 
 from past.builtins import basestring
 import sys
+import itertools
+import numpy as np
 import galsim
 
 # This file handles the parsing of values given in the config dict.  It includes the basic
@@ -33,10 +35,15 @@ import galsim
 # that the value type is able to generate.
 valid_value_types = {}
 
+# This module-level dict stores the functions for the value types that are able to generate
+# the values for a whole batch of objects at once.  See SetupBatch and RegisterValueType.
+valid_batch_types = {}
+_batch_ids = itertools.count()
+
 
 # Standard keys to ignore while parsing values:
 standard_ignore = [
-    'type', 'current', 'index_key', 'repeat', 'rng_num', '_gen_fn', '_get',
+    'type', 'current', 'index_key', 'repeat', 'rng_num', '_gen_fn', '_get', '_batch',
     '#' # When we read in json files, there represent comments
 ]
 
@@ -101,7 +108,11 @@ def ParseValue(config, key, base, value_type):
             param['_gen_fn'] = generate_func
 
         #print('generate_func = ',generate_func)
-        val_safe = generate_func(param, base, value_type)
+        val_safe = None
+        if '_batch_obj_nums' in base and type_name in valid_batch_types:
+            val_safe = _GetBatchValue(param, base, value_type)
+        if val_safe is None:
+            val_safe = generate_func(param, base, value_type)
         #print('returned val, safe = ',val_safe)
         if isinstance(val_safe, tuple):
             val, safe = val_safe
@@ -225,6 +236,78 @@ def EvaluateCurrentValue(key, config, base, value_type=None):
             #print('Parse value normally')
             return ParseValue(config, key, base, value_type)
 
+def SetupBatch(config, obj_num, nobjects):
+    """Set up the config dict to generate parameter values for a batch of objects at once.
+
+    Once this is set, the first time a value is needed for one of the objects with obj_num in
+    the range [obj_num, obj_num + nobjects), the values for all of the objects in the batch
+    are generated together and stored in the parameter dict.  The other objects then just
+    use the stored values.  This is only done for value types that registered a batch
+    function (e.g. Sequence, List, Catalog), and only if all of the parameters they depend on
+    can be batched as well.  Everything else, including all of the random value types, is
+    still generated for each object in turn, since each object uses its own rng.
+
+    @param config           The configuration dict.
+    @param obj_num          The obj_num of the first object in the batch.
+    @param nobjects         The number of objects in the batch.
+    """
+    config['_batch_obj_nums'] = (obj_num, nobjects, next(_batch_ids))
+
+def BatchParseValue(config, key, base, value_type, obj_nums):
+    """@brief Generate the values of a parameter for a number of objects at once.
+
+    @param config           The configuration dict holding the parameter.
+    @param key              The key of the parameter in config.
+    @param base             The base configuration dict.
+    @param value_type       The type of the values to generate.
+    @param obj_nums         A numpy array of the obj_num values of the objects.
+
+    @returns a list of the values, or None if the values have to be generated one object
+             at a time.
+    """
+    param = config[key]
+    if isinstance(param, dict):
+        type_name = param.get('type',None)
+        if type_name not in valid_batch_types:
+            return None
+        if value_type not in valid_value_types[type_name][1]:
+            # Let the normal processing raise the appropriate error.
+            return None
+        return valid_batch_types[type_name](param, base, value_type, obj_nums)
+    elif not _IsConstant(param):
+        return None
+    else:
+        val = ParseValue(config, key, base, value_type)[0]
+        return [val] * len(obj_nums)
+
+def _IsConstant(param):
+    # Whether a parameter is a constant value, rather than something that would be converted
+    # to a dict by ParseValue.
+    return not (isinstance(param, (dict, list)) or
+                (isinstance(param, basestring) and param[:1] in ('$', '@')))
+
+def _AllConstant(config, keys):
+    return all(_IsConstant(config[key]) for key in keys if key in config)
+
+def _GetBatchValue(param, base, value_type):
+    # Get the value for the current object from the batch values stored in param['_batch'],
+    # generating them first if necessary.  Returns None if the value has to be generated
+    # normally.
+    first, nobjects, batch_id = base['_batch_obj_nums']
+    k = base.get('obj_num',0) - first
+    if k < 0 or k >= nobjects:
+        return None
+    batch = param.get('_batch', None)
+    if batch is None or batch[0] != batch_id or batch[1] != value_type:
+        obj_nums = np.arange(first, first + nobjects)
+        values = valid_batch_types[param['type']](param, base, value_type, obj_nums)
+        batch = (batch_id, value_type, values)
+        param['_batch'] = batch
+    values = batch[2]
+    if values is None:
+        return None
+    return values[k], False
+
 def SetDefaultIndex(config, num):
     """
     When the number of items in a list is known, we allow the user to omit some of
@@ -509,9 +592,9 @@ def _GenerateFromDeg(config, base, value_type):
     #print(base['obj_num'],'Generate from Deg: kwargs = ',kwargs)
     return kwargs['theta'] * galsim.degrees, safe
 
-def _GenerateFromSequence(config, base, value_type):
-    """@brief Return next in a sequence of integers
-    """
+def _GetSequenceParams(config, base, value_type):
+    # Parse the parameters of a Sequence.
+    # Returns first, step, repeat, nitems, kwargs
     ignore = [ 'default' ]
     opt = { 'first' : value_type, 'last' : value_type, 'step' : value_type,
             'repeat' : int, 'nitems' : int, 'index_key' : str }
@@ -530,9 +613,6 @@ def _GenerateFromSequence(config, base, value_type):
         raise AttributeError(
             "At most one of the attributes last and nitems is allowed for type = Sequence")
 
-    index, index_key = galsim.config.GetIndex(kwargs, base, is_sequence=True)
-    #print('in GenFromSequence: index = ',index,index_key)
-
     if value_type is bool:
         # Then there are only really two valid sequences: Either 010101... or 101010...
         # Aside from the repeat value of course.
@@ -554,6 +634,16 @@ def _GenerateFromSequence(config, base, value_type):
     #print('nitems = ',nitems)
     #print('repeat = ',repeat)
 
+    return first, step, repeat, nitems, kwargs
+
+def _GenerateFromSequence(config, base, value_type):
+    """@brief Return next in a sequence of integers
+    """
+    first, step, repeat, nitems, kwargs = _GetSequenceParams(config, base, value_type)
+
+    index, index_key = galsim.config.GetIndex(kwargs, base, is_sequence=True)
+    #print('in GenFromSequence: index = ',index,index_key)
+
     index = index // repeat
     #print('index => ',index)
 
@@ -565,6 +655,20 @@ def _GenerateFromSequence(config, base, value_type):
     #print(base[index_key],'Sequence index = %s + %d*%s = %s'%(first,index,step,value))
     return value, False
 
+def _BatchFromSequence(config, base, value_type, obj_nums):
+    """@brief Return the values of a sequence for a batch of objects
+    """
+    if not _AllConstant(config, ['first', 'last', 'step', 'repeat', 'nitems']):
+        return None
+    first, step, repeat, nitems, kwargs = _GetSequenceParams(config, base, value_type)
+
+    index = galsim.config.GetBatchIndices(kwargs, base, obj_nums, is_sequence=True)
+    index = index // repeat
+    if nitems is not None and nitems > 0:
+        index = index % nitems
+
+    return (first + index*step).tolist()
+
 
 def _GenerateFromNumberedFile(config, base, value_type):
     """@brief Return a file_name using a root, a number, and an extension
@@ -657,6 +761,25 @@ def _GenerateFromList(config, base, value_type):
     #print(base['obj_num'],'List index = %d, val = %s'%(index,val))
     return val, safe
 
+def _BatchFromList(config, base, value_type, obj_nums):
+    """@brief Return the items from a provided list for a batch of objects
+    """
+    req = { 'items' : list }
+    opt = { 'index' : int }
+    CheckAllParams(config, req=req, opt=opt)
+    items = config['items']
+    if not isinstance(items,list) or not all(_IsConstant(item) for item in items):
+        return None
+
+    SetDefaultIndex(config, len(items))
+    index = BatchParseValue(config, 'index', base, int, obj_nums)
+    if index is None or min(index) < 0 or max(index) >= len(items):
+        # Let the normal processing raise an error for the right object.
+        return None
+
+    vals = [ ParseValue(items, k, base, value_type)[0] for k in range(len(items)) ]
+    return [ vals[k] for k in index ]
+
 def _GenerateFromSum(config, base, value_type):
     """@brief Return next item from a provided list
     """
@@ -696,7 +819,7 @@ def _GenerateFromCurrent(config, base, value_type):
         raise ValueError("%s\nError generating Current value with key = %s"%(e,key))
 
 
-def RegisterValueType(type_name, gen_func, valid_types, input_type=None):
+def RegisterValueType(type_name, gen_func, valid_types, input_type=None, batch_func=None):
     """Register a value type for use by the config apparatus.
 
     A few notes about the signature of the generating function:
@@ -726,8 +849,20 @@ def RegisterValueType(type_name, gen_func, valid_types, input_type=None):
     @param input_type       If the generator utilises an input object, give the key name of the
                             input type here.  (If it uses more than one, this may be a list.)
                             [default: None]
+    @param batch_func       Optionally, a function to generate the values for a batch of
+                            objects at once.  This is used when the stamps of an image are built
+                            with image.batch_params = True.  The call signature is
+                                values = Batch(config, base, value_type, obj_nums)
+                            where obj_nums is a numpy array of the obj_num values of the
+                            objects.  It should return a list of the values for each object,
+                            which must be identical to what gen_func would return for that
+                            object, or None if the values cannot be generated in a batch
+                            for this config.  (The batch values are never considered safe.)
+                            [default: None]
     """
     valid_value_types[type_name] = (gen_func, tuple(valid_types))
+    if batch_func is not None:
+        valid_batch_types[type_name] = batch_func
     if input_type is not None:
         from .input import RegisterInputConnectedType
         if isinstance(input_type, list): # pragma: no cover
@@ -739,13 +874,14 @@ def RegisterValueType(type_name, gen_func, valid_types, input_type=None):
 
 RegisterValueType('List', _GenerateFromList,
               [ float, int, bool, str, galsim.Angle, galsim.Shear, galsim.PositionD,
-                galsim.CelestialCoord ])
+                galsim.CelestialCoord ], batch_func=_BatchFromList)
 RegisterValueType('Current', _GenerateFromCurrent,
                  [ float, int, bool, str, galsim.Angle, galsim.Shear, galsim.PositionD,
                    galsim.CelestialCoord, None ])
 RegisterValueType('Sum', _GenerateFromSum,
              [ float, int, galsim.Angle, galsim.Shear, galsim.PositionD ])
-RegisterValueType('Sequence', _GenerateFromSequence, [ float, int, bool ])
+RegisterValueType('Sequence', _GenerateFromSequence, [ float, int, bool ],
+                  batch_func=_BatchFromSequence)
 RegisterValueType('NumberedFile', _GenerateFromNumberedFile, [ str ])
 RegisterValueType('FormattedStr', _GenerateFromFormattedStr, [ str ])
 RegisterValueType('Rad', _GenerateFromRad, [ galsim.Angle ])
@@ -19,6 +19,7 @@ from __future__ import print_function
 
 import galsim
 import numpy as np
+import threading
 
 # This file handles the parsing for the special Eval type.
 
@@ -51,36 +52,113 @@ eval_base_variables = [ 'image_pos', 'world_pos', 'image_center', 'image_origin'
                         'wcs', 'rng', 'file_num', 'image_num', 'obj_num', 'start_obj_num', ]
 
 from .value import standard_ignore
-eval_ignore = ['str','_fn'] + standard_ignore
+eval_ignore = ['str','_str','_opt','_last','eval_cache'] + standard_ignore
+
+# The compiled code objects for each string we have evaluated, keyed by the string.  These are
+# kept here rather than in the config dict, since code objects cannot be pickled, and it means
+# that the many copies of the config dict made for multiprocessing all share the same cache.
+_eval_code = {}
+
+# The globals dict to use for evaluating the strings.  It is made the first time it is needed.
+_eval_gdict = None
+
+# The evaluation environment for each string (and set of parameter names).  This starts as a
+# copy of _eval_gdict, and on each evaluation, we just update the values of the parameters,
+# rather than making a new dict each time.  Each thread needs its own environments, since two
+# threads could be evaluating the same string with different parameters at the same time.
+_eval_envs = threading.local()
+
+def _GetEvalGlobals():
+    """Get the globals dict to use for evaluating the strings.
+    """
+    global _eval_gdict
+    if _eval_gdict is None:
+        from future.utils import exec_
+        gdict = globals().copy()
+        # We allow the following modules to be used in the eval string:
+        exec_('import math', gdict)
+        exec_('import numpy', gdict)
+        exec_('import numpy as np', gdict)
+        exec_('import os', gdict)
+        _eval_gdict = gdict
+    return _eval_gdict
+
+def _GetEvalCode(string, value_type):
+    """Get the compiled code object for the given string, compiling it if necessary.
+    """
+    code = _eval_code.get(string, None)
+    if code is None:
+        try:
+            code = compile(string, '<Eval>', 'eval')
+        except KeyboardInterrupt:
+            raise
+        except Exception as e:  # pragma: no cover
+            raise ValueError("Unable to evaluate string %r as a %s\n"%(string,value_type) + str(e))
+        _eval_code[string] = code
+    return code
+
+def _GetEvalEnv(string, params):
+    """Get the (thread-local) evaluation environment to use for the given string and parameters.
+    """
+    try:
+        envs = _eval_envs.envs
+    except AttributeError:
+        envs = _eval_envs.envs = {}
+    # Key on the parameter names as well, so a name that is not a parameter this time can't
+    # pick up a stale value from the evaluation of the same string somewhere else.
+    key = (string, frozenset(params))
+    env = envs.get(key, None)
+    if env is None:
+        env = envs[key] = _GetEvalGlobals().copy()
+    env.update(params)
+    return env
+
+def _SameParams(params1, params2):
+    """Check whether two dicts of parameters have the same values.
+    """
+    if len(params1) != len(params2):
+        return False
+    for key, value in params1.items():
+        if key not in params2:
+            return False
+        value2 = params2[key]
+        if value is value2:
+            continue
+        try:
+            if type(value) != type(value2) or not bool(value == value2):
+                return False
+        except Exception:
+            # e.g. numpy arrays can't be compared this way.  Just say they are different.
+            return False
+    return True
 
 def _GenerateFromEval(config, base, value_type):
     """@brief Evaluate a string as the provided type
+
+    The string is compiled the first time it is evaluated, and the code object is cached for
+    use by subsequent evaluations.  Likewise the environment in which the string is evaluated
+    is reused for each evaluation.
+
+    Reusing the result itself is opt-in: if `eval_cache` is True, either in the Eval dict or
+    at the top level of the config dict, then the most recent result is saved along with the
+    values of the variables that the string uses.  If none of these have changed, then the
+    saved result is used again without evaluating the string.  This assumes that the string
+    doesn't have any side effects, and note that the same object is returned each time, so a
+    mutable result (e.g. a list or numpy array) is shared by all the places that use it.  A
+    string that uses the rng variable is always evaluated.
     """
     #print('Start Eval')
     #print('config = ',config)
     if '_value' in config:
         return config['_value']
-    elif '_fn' in config:
-        #print('Using saved function')
-        fn = config['_fn']
+    elif '_str' in config:
+        #print('Using saved string')
+        string = config['_str']
+        opt = config['_opt']
     else:
-        # If the function is not already compiled, then this is the first time through, so do
+        # If the string has not been parsed yet, then this is the first time through, so do
         # a full parsing of all the possibilities.
 
-        from future.utils import exec_
-        # These will be the variables to use for evaluating the eval statement.
-        # Start with the current locals and globals, and add extra items to them.
-        if 'eval_gdict' not in base:
-            gdict = globals().copy()
-            # We allow the following modules to be used in the eval string:
-            exec_('import math', gdict)
-            exec_('import numpy', gdict)
-            exec_('import numpy as np', gdict)
-            exec_('import os', gdict)
-            base['eval_gdict'] = gdict
-        else:
-            gdict = base['eval_gdict']
-
         if 'str' not in config:
             raise AttributeError("Attribute str is required for type = %s"%(config['type']))
         string = config['str']
@@ -129,29 +207,29 @@ def _GenerateFromEval(config, base, value_type):
         #print('params = ',params)
         #print('config = ',config)
 
-        # Now compile the string into a lambda function, which will be faster for subsequent
-        # passes into this builder.
-        try:
-            if len(params) == 0:
-                value = eval(string, gdict)
-                config['_value'] = value
-                return value
-            else:
-                fn_str = 'lambda %s: %s'%(','.join(params), string)
-                #print('fn_str = ',fn_str)
-                fn = eval(fn_str, gdict)
-                config['_fn'] = fn
-        except KeyboardInterrupt:
-            raise
-        except Exception as e:  # pragma: no cover
-            raise ValueError("Unable to evaluate string %r as a %s\n"%(string,value_type) + str(e))
- 
+        # Compile the string.  This gets saved for subsequent passes into this builder.
+        code = _GetEvalCode(string, value_type)
+        if len(params) == 0:
+            try:
+                value = eval(code, _GetEvalGlobals())
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:  # pragma: no cover
+                raise ValueError("Unable to evaluate string %r as a %s\n"%(string,value_type) +
+                                 str(e))
+            config['_value'] = value
+            return value
+
+        # Save the types of the parameters, so we don't have to figure them out each time.
+        opt = {}
+        for key in config.keys():
+            if key not in eval_ignore:
+                opt[key] = _type_by_letter(key)
+        config['_str'] = string
+        config['_opt'] = opt
+        #print('opt = ',opt)
+
     # Always need to evaluate any parameters to pass to the function
-    opt = {}
-    for key in config.keys():
-        if key not in eval_ignore:
-            opt[key] = _type_by_letter(key)
-    #print('opt = ',opt)
     params, safe = galsim.config.GetAllParams(config, base, opt=opt, ignore=eval_ignore)
     #print('params = ',params)
 
@@ -159,16 +237,31 @@ def _GenerateFromEval(config, base, value_type):
     params = { key[1:] : value for key, value in params.items() }
     #print('params => ',params)
 
-    # Evaluate the compiled function
+    # If requested, and none of the parameters have changed since the last time, we can reuse
+    # the last value.
+    if 'eval_cache' in config:
+        use_last = galsim.config.ParseValue(config, 'eval_cache', base, bool)[0]
+    else:
+        use_last = bool(base.get('eval_cache', False))
+    use_last = use_last and 'rng' not in params
+    if use_last and '_last' in config:
+        last_params, last_val = config['_last']
+        if _SameParams(params, last_params):
+            return last_val, safe
+
+    # Evaluate the compiled string
     try:
-        val = fn(**params)
+        env = _GetEvalEnv(string, params)
+        val = eval(_GetEvalCode(string, value_type), env)
         #print('val = ',val)
-        return val, safe
     except KeyboardInterrupt:
         raise
     except Exception as e:  # pragma: no cover
         raise ValueError("Unable to evaluate string %r as a %s\n"%(config['str'],value_type) +
                          str(e))
+    if use_last:
+        config['_last'] = (params, val)
+    return val, safe
 
 
 # Register this as a valid value type
@@ -0,0 +1,209 @@
+# Copyright (c) 2012-2017 by the GalSim developers team on GitHub
+# https://github.com/GalSim-developers
+#
+# This file is part of GalSim: The modular galaxy image simulation toolkit.
+# https://github.com/GalSim-developers/GalSim
+#
+# GalSim is free software: redistribution and use in source and binary forms,
+# with or without modification, are permitted provided that the following
+# conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions, and the disclaimer given in the accompanying LICENSE
+#    file.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions, and the disclaimer given in the documentation
+#    and/or other materials provided with the distribution.
+#
+"""@file draw_cost.py
+A simple model of how long each of the drawImage methods takes for a given profile, which is used
+by drawImage(method='cheapest') to pick the fastest one.
+"""
+
+import numpy as np
+import galsim
+
+
+class DrawCostModel(object):
+    """A model of the time it takes to draw a profile with each of the drawImage methods.
+
+    This is used by `drawImage(method='cheapest')` to choose among the 'fft', 'real_space', and
+    (optionally) 'phot' methods.  The estimated cost of each method is:
+
+        fft:        fft_coef * N^2 log2(N) + kvalue_coef * Nk^2/2
+                    where N is the size of the FFT and Nk is the size of the k-space image that
+                    drawFFT would use.  (Infinite if Nk > gsparams.maximum_fft_size.)
+        real_space: real_space_coef * nx * ny
+                    (Infinite if the profile is not analytic in real space.)
+        phot:       phot_coef * n_photons
+                    where n_photons is the number drawImage would shoot.
+
+    Each of these methods meets the accuracy targets given by the profile's GSParams in its
+    own way (folding_threshold and maxk_threshold for fft, realspace_relerr and
+    realspace_abserr for real_space).  However, photon shooting only renders the profile up to
+    Poisson noise, so 'phot' is only considered if `allow_phot=True`.  Only use this if you will
+    be adding noise to the image anyway and are happy for it to include the shot noise of the
+    object.
+
+    The default coefficients are rough values for a typical modern machine.  For better choices,
+    call calibrate(), which times each of the methods on the current machine.
+
+        >>> model = galsim.DrawCostModel(allow_phot=True).calibrate()
+        >>> image = obj.drawImage(scale=0.2, method='cheapest', cost_model=model, rng=rng)
+        >>> print(image.draw_method)
+
+    @param fft_coef         The time per N^2 log2(N) of an N x N FFT. [default: 2.e-9]
+    @param kvalue_coef      The time per pixel of filling the k-space image. [default: 5.e-8]
+    @param real_space_coef  The time per pixel of a real-space convolution by the pixel.
+                            [default: 2.e-5]
+    @param phot_coef        The time per photon of photon shooting. [default: 1.e-7]
+    @param allow_phot       Whether 'phot' may be chosen. [default: False]
+    """
+    def __init__(self, fft_coef=2.e-9, kvalue_coef=5.e-8, real_space_coef=2.e-5,
+                 phot_coef=1.e-7, allow_phot=False):
+        self.fft_coef = float(fft_coef)
+        self.kvalue_coef = float(kvalue_coef)
+        self.real_space_coef = float(real_space_coef)
+        self.phot_coef = float(phot_coef)
+        self.allow_phot = bool(allow_phot)
+
+    def calibrate(self, nrep=3):
+        """Set the coefficients from timings of each method on the current machine.
+
+        This takes a few tenths of a second.
+
+        @param nrep         The number of times to repeat each timing. [default: 3]
+
+        @returns self, so you can write `model = galsim.DrawCostModel().calibrate()`.
+        """
+        import time
+        def best_time(func):
+            times = []
+            for i in range(nrep):
+                t1 = time.time()
+                func()
+                times.append(time.time() - t1)
+            return max(min(times), 1.e-9)
+
+        # Use a moderately complicated convolution for the k-space fill.
+        prof = galsim.Convolve(galsim.Exponential(half_light_radius=1.),
+                               galsim.Moffat(beta=2.5, fwhm=1.))
+        N = 256
+        kimage = galsim.ImageCD(bounds=galsim._BoundsI(0,N//2,-N//2,N//2), scale=0.05)
+        t = best_time(lambda: prof._drawKImage(kimage))
+        self.kvalue_coef = t / kimage.array.size
+
+        karray = np.ones((N, N//2+1), dtype=complex)
+        t = best_time(lambda: galsim.fft.irfft2(karray))
+        self.fft_coef = t / (N * N * np.log2(N))
+
+        prof = galsim.Exponential(half_light_radius=1.)
+        image = galsim.ImageD(16, 16, scale=0.2)
+        t = best_time(lambda: prof.drawImage(image, method='real_space'))
+        self.real_space_coef = t / image.array.size
+
+        flux = 1.e5
+        prof = galsim.Exponential(half_light_radius=1., flux=flux)
+        image = galsim.ImageD(64, 64, scale=0.2)
+        rng = galsim.BaseDeviate(1234)
+        t = best_time(lambda: prof.drawImage(image, method='phot', rng=rng))
+        self.phot_coef = t / flux
+        return self
+
+    def fftCost(self, prof, nx=None, ny=None):
+        """Estimate the time to draw a profile with method='fft'.
+
+        @param prof         The profile to draw in image coordinates (i.e. with a pixel scale
+                            of 1), not including the pixel.
+        @param nx           The x size of the image, or None if it will be automatically sized.
+                            [default: None]
+        @param ny           The y size of the image, or None if it will be automatically sized.
+                            [default: None]
+
+        @returns the estimated time (in seconds), or infinity if the FFT would be too large.
+        """
+        gsparams = prof.gsparams
+        prof = galsim.Convolve(prof, galsim.Pixel(scale=1.0, gsparams=gsparams), real_space=False,
+                               gsparams=gsparams)
+        N = prof.getGoodImageSize(1.0)
+        if nx is not None and ny is not None:
+            N = max(N, nx, ny)
+        N = galsim.Image.good_fft_size(N)
+        N = max(N, gsparams.minimum_fft_size)
+        dk = 2.*np.pi / N
+        maxk = prof.maxk
+        if N*dk/2 > maxk:
+            Nk = N
+        else:
+            Nk = int(np.ceil(maxk/dk)) * 2
+        if Nk > gsparams.maximum_fft_size:
+            return np.inf
+        return self.fft_coef * N * N * np.log2(N) + self.kvalue_coef * Nk * (Nk/2 + 1)
+
+    def realSpaceCost(self, prof, nx=None, ny=None):
+        """Estimate the time to draw a profile with method='real_space'.
+
+        The parameters are the same as for fftCost().
+
+        @returns the estimated time (in seconds), or infinity if the profile is not analytic in
+                 real space.
+        """
+        if not prof.is_analytic_x:
+            return np.inf
+        if nx is None or ny is None:
+            nx = ny = prof.getGoodImageSize(1.0)
+        return self.real_space_coef * nx * ny
+
+    def photCost(self, prof, n_photons=0., max_extra_noise=0.):
+        """Estimate the time to draw a profile with method='phot'.
+
+        @param prof             The profile to draw in image coordinates, including the flux
+                                scaling for area and exptime.
+        @param n_photons        The n_photons parameter to be given to drawImage. [default: 0]
+        @param max_extra_noise  The max_extra_noise parameter to be given to drawImage.
+                                [default: 0]
+
+        @returns the estimated time (in seconds), or infinity if photon shooting is not allowed.
+        """
+        if not self.allow_phot:
+            return np.inf
+        n, g = prof._calculate_nphotons(n_photons, False, max_extra_noise, None)
+        return self.phot_coef * n
+
+    def chooseMethod(self, prof, nx=None, ny=None, n_photons=0., max_extra_noise=0.):
+        """Choose the fastest method to draw the given profile.
+
+        @param prof             The profile to draw in image coordinates, including the flux
+                                scaling for area and exptime, but not the pixel.
+        @param nx               The x size of the image, or None if it will be automatically
+                                sized. [default: None]
+        @param ny               The y size of the image, or None if it will be automatically
+                                sized. [default: None]
+        @param n_photons        The n_photons parameter to be given to drawImage. [default: 0]
+        @param max_extra_noise  The max_extra_noise parameter to be given to drawImage.
+                                [default: 0]
+
+        @returns (method, costs), where costs is a dict of the estimated cost of each method.
+        """
+        costs = {
+            'fft' : self.fftCost(prof, nx, ny),
+            'real_space' : self.realSpaceCost(prof, nx, ny),
+            'phot' : self.photCost(prof, n_photons, max_extra_noise),
+        }
+        # If everything is infinite, use fft, which will raise an appropriate exception.
+        method = min(['fft', 'real_space', 'phot'], key=lambda m: costs[m])
+        return method, costs
+
+    def __repr__(self):
+        return ('galsim.DrawCostModel(fft_coef=%r, kvalue_coef=%r, real_space_coef=%r, '
+                'phot_coef=%r, allow_phot=%r)')%(self.fft_coef, self.kvalue_coef,
+                                                 self.real_space_coef, self.phot_coef,
+                                                 self.allow_phot)
+
+    def __eq__(self, other):
+        return isinstance(other, DrawCostModel) and repr(self) == repr(other)
+    def __ne__(self, other): return not self.__eq__(other)
+    def __hash__(self): return hash(repr(self))
+
+# The model used by drawImage(method='cheapest') if no cost_model is given.
+default_cost_model = DrawCostModel()
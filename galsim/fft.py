@@ -271,3 +271,72 @@ def irfft2(a, shift_in=False, shift_out=False):
     return kim.irfft(shift_in=shift_in, shift_out=shift_out).array
 
 
+# The FFTW plans used by all of the FFTs in GalSim (these functions, drawFFT, PhaseScreenPSF,
+# etc.) are made once for each size and kind of transform and then kept for reuse.
+_plan_modes = { 'estimate' : 0, 'measure' : 1, 'patient' : 2 }
+
+def set_plan_mode(mode):
+    """Set how much effort FFTW should spend making the plans for new transforms.
+
+    The plan for each size and kind of transform is only made once per process, and then reused
+    for every transform of that kind.  So for long runs that do many FFTs of the same sizes, it
+    can be worth having FFTW measure which algorithm is fastest on the current machine rather
+    than just estimating it.  Note that planning in 'measure' mode can take a few seconds for
+    large transforms, and 'patient' mode can take much longer.  Use export_wisdom and
+    import_wisdom to save the results of this planning for use by later processes.
+
+    The plans are made on scratch arrays, so planning in any mode is safe to do with the data
+    to be transformed.  But note that the results of the FFTs may differ at the level of
+    rounding errors depending on which algorithm FFTW ends up using.
+
+    @param mode         One of 'estimate' (the default), 'measure', or 'patient'.
+    """
+    if mode not in _plan_modes:
+        raise ValueError("Invalid mode %r.  Must be one of %s"%(mode, list(_plan_modes.keys())))
+    galsim._galsim.SetFFTPlanMode(_plan_modes[mode])
+
+def get_plan_mode():
+    """Get the current plan mode for new FFTW plans.  cf. set_plan_mode.
+
+    @returns one of 'estimate', 'measure', or 'patient'.
+    """
+    mode = galsim._galsim.GetFFTPlanMode()
+    return [ k for k in _plan_modes if _plan_modes[k] == mode ][0]
+
+def clear_plans():
+    """Destroy all of the FFTW plans that have been made in this process.
+
+    This is not normally needed, but it can release a bit of memory if you are done with a
+    number of transforms of sizes that you will not be doing again.  Do not call this while
+    another thread may be doing an FFT.
+    """
+    galsim._galsim.ClearFFTPlans()
+
+def has_single_precision_fft():
+    """Whether GalSim was built with the single precision FFTW library (libfftw3f).
+
+    If it was, then the inverse FFT used when drawing onto float32 images is done in single
+    precision, which uses half as much memory as a double precision FFT.  Otherwise, it is done
+    in double precision.  Note that this only affects the inverse FFT.  The k-space image is
+    stored as complex64 either way, but its values are still calculated in double precision.
+    """
+    return galsim._galsim.HasSinglePrecisionFFT()
+
+def import_wisdom(file_name):
+    """Load FFTW wisdom that was saved by export_wisdom.
+
+    This lets a new process use plans that were already measured by an earlier one (with the
+    same FFTW library on the same kind of machine) without measuring them again.
+
+    @param file_name    The name of the wisdom file.
+    """
+    if not galsim._galsim.ImportFFTWisdom(file_name):
+        raise IOError("Unable to read FFTW wisdom from %s"%file_name)
+
+def export_wisdom(file_name):
+    """Save the FFTW wisdom accumulated by this process to a file.  cf. import_wisdom.
+
+    @param file_name    The name of the wisdom file.
+    """
+    if not galsim._galsim.ExportFFTWisdom(file_name):
+        raise IOError("Unable to write FFTW wisdom to %s"%file_name)
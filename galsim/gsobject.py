@@ -206,7 +206,8 @@ class GSObject(object):
                   'shoot_accuracy' : float,
                   'allowed_flux_variation' : float,
                   'range_division_for_extrema' : int,
-                  'small_fraction_of_flux' : float
+                  'small_fraction_of_flux' : float,
+                  'photon_chunk_size' : int
                 }
     def __init__(self, sbp):
         from .deprecated import depr
@@ -692,6 +693,51 @@ class GSObject(object):
         """
         return self._sbp.kValue(pos)
 
+    def xValues(self, x, y):
+        """Returns the values of the object at many positions in real space.
+
+        This is equivalent to calling xValue() for each position, but the whole calculation is
+        done in a single C++ call, so it is much faster for large numbers of positions.  The
+        positions do not need to be on a regular grid.
+
+        As for xValue(), this is only available if `obj.is_analytic_x == True`.
+
+        @param x        A numpy array (or anything that can be converted to one) of the x values
+                        of the positions.
+        @param y        An array of the y values of the positions.  x and y must have the same
+                        shape (or be broadcastable to a common shape).
+
+        @returns a numpy array of the surface brightness at each position, with the same shape
+                 as x and y.
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        x = np.ascontiguousarray(x)
+        y = np.ascontiguousarray(y)
+        val = np.empty(x.shape, dtype=float)
+        self._sbp.xValues(x.size, x.ctypes.data, y.ctypes.data, val.ctypes.data)
+        return val
+
+    def kValues(self, kx, ky):
+        """Returns the values of the object at many positions in k space.
+
+        This is equivalent to calling kValue() for each position, but the whole calculation is
+        done in a single C++ call.  cf. xValues().
+
+        @param kx       A numpy array (or anything that can be converted to one) of the kx values
+                        of the positions.
+        @param ky       An array of the ky values of the positions.  kx and ky must have the same
+                        shape (or be broadcastable to a common shape).
+
+        @returns a complex numpy array of the fourier amplitude at each position, with the same
+                 shape as kx and ky.
+        """
+        kx, ky = np.broadcast_arrays(np.asarray(kx, dtype=float), np.asarray(ky, dtype=float))
+        kx = np.ascontiguousarray(kx)
+        ky = np.ascontiguousarray(ky)
+        val = np.empty(kx.shape, dtype=complex)
+        self._sbp.kValues(kx.size, kx.ctypes.data, ky.ctypes.data, val.ctypes.data)
+        return val
+
     def withFlux(self, flux):
         """Create a version of the current object with a different flux.
 
@@ -1089,11 +1135,17 @@ class GSObject(object):
         # Do any work that was postponed until drawImage.
         pass
 
+    def _tiled_components(self):
+        # Split this profile into an extended component and a compact kernel for fft_tiled.
+        # Only a Convolution can be split this way.
+        raise ValueError("method='fft_tiled' is only possible for a Convolution")
+
     def drawImage(self, image=None, nx=None, ny=None, bounds=None, scale=None, wcs=None, dtype=None,
                   method='auto', area=1., exptime=1., gain=1., add_to_image=False,
                   use_true_center=True, offset=None, n_photons=0., rng=None, max_extra_noise=0.,
                   poisson_flux=None, sensor=None, surface_ops=(), n_subsample=3, maxN=None,
-                  save_photons=False, setup_only=False, dx=None, wmult=1.):
+                  save_photons=False, setup_only=False, cost_model=None, n_threads=1, dx=None,
+                  wmult=1.):
         """Draws an Image of the object.
 
         The drawImage() method is used to draw an Image of the current object using one of several
@@ -1199,6 +1251,24 @@ class GSObject(object):
                         it could be useful if you want to view the surface brightness profile of an
                         object directly, without including the pixel integration.
 
+            'cheapest'  This uses a simple model of the time each method takes to pick the fastest
+                        of 'fft', 'real_space', and (if the model allows it) 'phot' for this
+                        profile and image size.  See DrawCostModel for details.  The chosen method
+                        is recorded in the returned image as `image.draw_method`.  The photon
+                        shooting parameters (n_photons, rng, etc.) may be given in case it picks
+                        'phot', but if it picks another method, a warning is emitted that they
+                        were ignored.
+
+            'fft_tiled' This is for drawing very large objects whose FFT would be larger than
+                        `gsparams.maximum_fft_size`.  The object must be a Convolution.  Its most
+                        extended component (which must be analytic in real space) is sampled
+                        at the centers of the pixels in tiles, and each tile is convolved by the
+                        other components and the pixel using a moderately sized FFT.  The
+                        results are added together (the "overlap-add" method), so the memory
+                        required is bounded by the tile size, not the size of the object.  This
+                        is accurate as long as the extended component is well sampled by the
+                        pixels, which is normally the case for large objects.
+
         The 'phot' method has a few extra parameters that adjust how it functions.  The total
         number of photons to shoot is normally calculated from the object's flux.  This flux is
         taken to be given in photons/cm^2/s, so for most simple profiles, this times area * exptime
@@ -1418,13 +1488,18 @@ class GSObject(object):
                             [default: 3]
         @param maxN         Sets the maximum number of photons that will be added to the image
                             at a time.  (Memory requirements are proportional to this number.)
-                            [default: None, which means no limit]
+                            [default: None, which means to use gsparams.photon_chunk_size]
         @param save_photons If True, save the PhotonArray as `image.photons`. Only valid if method
-                            is 'phot' or sensor is not None.  [default: False]
+                            is 'phot' or sensor is not None.  All of the photons are saved, even
+                            if they are shot in several chunks.  [default: False]
         @param setup_only   Don't actually draw anything on the image.  Just make sure the image
                             is set up correctly.  This is used internally by GalSim, but there
                             may be cases where the user will want the same functionality.
                             [default: False]
+        @param cost_model   The DrawCostModel to use for method='cheapest'.  [default: None,
+                            which means to use galsim.draw_cost.default_cost_model]
+        @param n_threads    The number of threads to use for photon shooting.  See drawPhot for
+                            details.  [default: 1]
 
         @returns the drawn Image.
         """
@@ -1452,15 +1527,18 @@ class GSObject(object):
         if exptime <= 0.:
             raise ValueError("Invalid exptime <= 0.")
 
-        if method not in ['auto', 'fft', 'real_space', 'phot', 'no_pixel', 'sb']:
+        if method not in ['auto', 'fft', 'real_space', 'phot', 'no_pixel', 'sb', 'cheapest',
+                          'fft_tiled']:
             raise ValueError("Invalid method name = %s"%method)
 
         # Check that the user isn't convolving by a Pixel already.  This is almost always an error.
-        if method == 'auto' and isinstance(self, galsim.Convolution):
+        # (This applies to 'cheapest' too, since none of the methods it might choose is right
+        # for such a profile.)
+        if method in ['auto', 'cheapest'] and isinstance(self, galsim.Convolution):
             if any([ isinstance(obj, galsim.Pixel) for obj in self.obj_list ]):
                 import warnings
                 warnings.warn(
-                    "You called drawImage with `method='auto'` "
+                    "You called drawImage with `method='%s'` "%method +
                     "for an object that includes convolution by a Pixel.  "
                     "This is probably an error.  Normally, you should let GalSim "
                     "handle the Pixel convolution for you.  If you want to handle the Pixel "
@@ -1469,7 +1547,8 @@ class GSObject(object):
                     "an _additional_ Pixel, you can suppress this warning by using method=fft.")
 
         # Some parameters are only relevant for method == 'phot'
-        if method != 'phot' and sensor is None:
+        # (or 'cheapest', which might choose 'phot')
+        if method not in ['phot', 'cheapest'] and sensor is None:
             if n_photons != 0.:
                 raise ValueError("n_photons is only relevant for method='phot'")
             if rng is not None:
@@ -1504,6 +1583,33 @@ class GSObject(object):
 
         # Account for area and exptime.
         flux_scale = area * exptime
+
+        # Pick the fastest method if requested.
+        if method == 'cheapest':
+            if cost_model is None:
+                cost_model = galsim.draw_cost.default_cost_model
+            if new_bounds.isDefined():
+                cost_ny, cost_nx = new_bounds.numpyShape()
+            else:
+                cost_nx = cost_ny = None
+            method = cost_model.chooseMethod(prof * flux_scale, cost_nx, cost_ny,
+                                             n_photons, max_extra_noise)[0]
+            if method != 'phot' and sensor is None:
+                # These are allowed for 'cheapest' in case it picks 'phot', but warn that they
+                # are being ignored if it didn't.
+                ignored = []
+                if n_photons != 0.: ignored.append('n_photons')
+                if rng is not None: ignored.append('rng')
+                if max_extra_noise != 0.: ignored.append('max_extra_noise')
+                if poisson_flux is not None: ignored.append('poisson_flux')
+                if surface_ops != (): ignored.append('surface_ops')
+                if save_photons: ignored.append('save_photons')
+                if len(ignored) > 0:
+                    import warnings
+                    warnings.warn(
+                        "method='cheapest' chose method='%s', so the photon shooting "%method +
+                        "parameters %s are being ignored."%(', '.join(ignored)))
+                save_photons = False
         # For surface brightness normalization, also scale by the pixel area.
         if method == 'sb':
             flux_scale /= local_wcs.pixelArea()
@@ -1514,11 +1620,18 @@ class GSObject(object):
 
         prof *= flux_scale
 
+        if method == 'fft_tiled':
+            # Split the profile into the extended component and the kernel to convolve it by.
+            tiled_ext, tiled_kernel = self._tiled_components()
+            tiled_ext = local_wcs.toImage(tiled_ext) * flux_scale
+            tiled_ext = tiled_ext._fix_center(new_bounds, offset, use_true_center, reverse=False)
+            tiled_kernel = local_wcs.toImage(tiled_kernel)
+
         # If necessary, convolve by the pixel
-        if method in ['auto', 'fft', 'real_space']:
+        if method in ['auto', 'fft', 'real_space', 'fft_tiled']:
             if method == 'auto':
                 real_space = None
-            elif method == 'fft':
+            elif method in ['fft', 'fft_tiled']:
                 real_space = False
             else:
                 real_space = True
@@ -1532,6 +1645,7 @@ class GSObject(object):
         # Make sure image is setup correctly
         image = prof._setup_image(image, nx, ny, bounds, add_to_image, dtype, wmult=wmult)
         image.wcs = wcs
+        image.draw_method = method
 
         if setup_only:
             image.added_flux = 0.
@@ -1546,7 +1660,8 @@ class GSObject(object):
         if method == 'phot':
             added_photons, photons = prof.drawPhot(imview, gain, add_to_image,
                                                    n_photons, rng, max_extra_noise, poisson_flux,
-                                                   sensor, surface_ops, maxN, orig_center)
+                                                   sensor, surface_ops, maxN, orig_center,
+                                                   n_threads, save_photons)
         else:
             # If not using phot, but doing sensor, then make a copy.
             if sensor is not None:
@@ -1563,7 +1678,7 @@ class GSObject(object):
                             galsim.Pixel(scale=1.0/n_subsample, gsparams=self.gsparams),
                             real_space=real_space, gsparams=self.gsparams)
                     prof = prof._fix_center(new_bounds, offset, use_true_center, reverse=False)
-                elif n_subsample != 1:
+                elif method != 'fft_tiled' and n_subsample != 1:
                     # We can't just pull off the pixel-free version, so we need to deconvolve
                     # by the original pixel and reconvolve by the smaller one.
                     prof = galsim.Convolve(
@@ -1577,7 +1692,10 @@ class GSObject(object):
                 draw_image = imview
                 add = add_to_image
 
-            if prof.is_analytic_x:
+            if method == 'fft_tiled':
+                added_photons = _drawFFTTiled(tiled_ext, tiled_kernel, draw_image, add,
+                                              self.gsparams)
+            elif prof.is_analytic_x:
                 added_photons = prof.drawReal(draw_image, add)
             else:
                 added_photons = prof.drawFFT(draw_image, add, wmult)
@@ -1672,6 +1790,11 @@ class GSObject(object):
         @returns (kimage, wrap_size), where wrap_size is either the size of kimage or smaller if
                                       the result should be wrapped before doing the inverse fft.
         """
+        N = self._drawFFT_size(image, wmult)
+        return self._drawFFT_makeKImage(image, N)
+
+    def _drawFFT_size(self, image, wmult=1.):
+        # The size N of the real-space image to use for the FFT.
         # Start with what this profile thinks a good size would be given the image's pixel scale.
         N = self.getGoodImageSize(image.scale/wmult)
 
@@ -1685,7 +1808,10 @@ class GSObject(object):
 
         # Make sure we hit the minimum size specified in the gsparams.
         N = max(N, self.gsparams.minimum_fft_size)
+        return N
 
+    def _drawFFT_makeKImage(self, image, N):
+        # Make the k-space image for an FFT of size N.  cf. drawFFT_makeKImage
         dk = 2.*np.pi / (N * image.scale)
 
         maxk = self.maxk
@@ -1729,8 +1855,13 @@ class GSObject(object):
         bwrap = galsim._BoundsI(0, wrap_size//2, -wrap_size//2, wrap_size//2-1)
         kimage_wrap = kimage._image.wrap(bwrap, True, False)
 
-        # Perform the fourier transform.
-        real_image = kimage_wrap.irfft()
+        # Perform the fourier transform.  If the k-space image is single precision (which it is
+        # when drawing onto a float32 image), then so is the inverse FFT.  (The k-space values
+        # are calculated in double precision regardless.)
+        if kimage.dtype == np.complex64:
+            real_image = kimage_wrap.irfft_float()
+        else:
+            real_image = kimage_wrap.irfft()
 
         # Add (a portion of) this to the original image.
         ar = real_image.subImage(image.bounds).array
@@ -1903,7 +2034,8 @@ class GSObject(object):
 
     def drawPhot(self, image, gain=1., add_to_image=False,
                  n_photons=0, rng=None, max_extra_noise=0., poisson_flux=None,
-                 sensor=None, surface_ops=(), maxN=None, orig_center=galsim.PositionI(0,0)):
+                 sensor=None, surface_ops=(), maxN=None, orig_center=galsim.PositionI(0,0),
+                 n_threads=1, save_photons=False):
         """
         Draw this profile into an Image by shooting photons.
 
@@ -1960,15 +2092,30 @@ class GSObject(object):
                             [default: ()]
         @param maxN         Sets the maximum number of photons that will be added to the image
                             at a time.  (Memory requirements are proportional to this number.)
-                            [default: None, which means no limit]
+                            [default: None, which means to use gsparams.photon_chunk_size]
         @param orig_center  The position of the image center in the original image coordinates.
                             [default: (0,0)]
-
-        @returns The total flux of photons that landed inside the image bounds.
+        @param n_threads    The number of threads to use for shooting the photons.  If this is
+                            more than 1, the photons are split into n_threads independent
+                            streams, each with its own random number generator seeded from `rng`.
+                            Each thread shoots its photons onto its own image, and the images are
+                            added together at the end.  The result is deterministic for a given
+                            `rng` and `n_threads`, but it is not the same as the result with a
+                            different number of threads.  This is only possible if the sensor
+                            is a plain Sensor and there are no surface_ops; otherwise the photons
+                            are shot in a single thread.  [default: 1]
+        @param save_photons Whether to keep all of the shot photons to return them.  Otherwise,
+                            when the photons are shot in several chunks of at most maxN photons,
+                            only the last chunk is returned.  [default: False]
+
+        @returns a tuple (added_flux, photons) of the total flux of photons that landed inside
+                 the image bounds and the PhotonArray of the shot photons.
         """
         # Make sure the type of n_photons is correct and has a valid value:
         if n_photons < 0.:
             raise ValueError("Invalid n_photons < 0.")
+        if n_threads < 1:
+            raise ValueError("Invalid n_threads < 1.")
 
         if poisson_flux is None:
             if n_photons == 0.: poisson_flux = True
@@ -2001,17 +2148,31 @@ class GSObject(object):
         added_flux = 0.
 
         if maxN is None:
-            maxN = Ntot
+            maxN = self.gsparams.photon_chunk_size
+        maxN = max(int(maxN), 1)
 
         if not add_to_image: image.setZero()
 
+        # A SiliconSensor depends on the order in which the photons arrive, and surface_ops may
+        # have their own random numbers, so only split up the work in the simple case.
+        if n_threads > 1 and type(sensor) is galsim.Sensor and len(surface_ops) == 0:
+            return self._drawPhotThreads(image, Ntot, g, ud, maxN, int(n_threads), save_photons)
+
+        if image.dtype not in [np.float32, np.float64]:
+            # Need a temporary
+            im1 = galsim.ImageD(bounds=image.bounds)
+
         # Nleft is the number of photons remaining to shoot.
         Nleft = Ntot
         photons = None  # Just in case Nleft is already 0.
+        saved_photons = []
         while Nleft > 0:
             # Shoot at most maxN at a time
             thisN = min(maxN, Nleft)
 
+            # Let go of the previous chunk before making the next one, so at most one chunk of
+            # photons is in memory at a time.
+            photons = None
             try:
                 photons = self.shoot(thisN, ud)
             except RuntimeError:  # pragma: no cover
@@ -2035,13 +2196,80 @@ class GSObject(object):
             if image.dtype in [np.float32, np.float64]:
                 added_flux += sensor.accumulate(photons, image, orig_center)
             else:
-                # Need a temporary
-                im1 = galsim.ImageD(bounds=image.bounds)
+                im1.setZero()
                 added_flux += sensor.accumulate(photons, im1, orig_center)
                 image.array[:,:] += im1.array.astype(image.dtype, copy=False)
 
+            if save_photons:
+                saved_photons.append(photons)
             Nleft -= thisN
 
+        if save_photons and len(saved_photons) > 1:
+            photons = _concatenate_photons(saved_photons)
+        return added_flux, photons
+
+    def _drawPhotThreads(self, image, Ntot, g, ud, maxN, n_threads, save_photons):
+        # The multi-threaded version of the main loop of drawPhot.
+        # Each thread gets its own share of the photons and its own rng seeded from ud, so the
+        # result only depends on ud and n_threads, not on how the threads get scheduled.
+        # The C++ shoot and addTo functions release the GIL, so the threads run concurrently.
+        import threading
+        n_threads = min(n_threads, max(Ntot,1))
+        counts = [ Ntot // n_threads + (1 if k < Ntot % n_threads else 0)
+                   for k in range(n_threads) ]
+        seeds = [ int(ud() * 2**30) + 1 for k in range(n_threads) ]
+        images = [ galsim.ImageD(bounds=image.bounds) for k in range(n_threads) ]
+        results = [ (0., [None]) ] * n_threads
+        errors = []
+
+        # Some profiles build their photon samplers the first time they shoot, which is not
+        # safe to do from several threads at once.  So shoot one photon here first.
+        self.shoot(1, galsim.BaseDeviate(seeds[0]))
+
+        def run(k):
+            try:
+                thread_ud = galsim.UniformDeviate(seeds[k])
+                flux = 0.
+                photons = None
+                saved_photons = []
+                Nleft = counts[k]
+                while Nleft > 0:
+                    thisN = min(maxN, Nleft)
+                    photons = None
+                    photons = self.shoot(thisN, thread_ud)
+                    if g != 1. or thisN != Ntot:
+                        photons.scaleFlux(g * thisN / Ntot)
+                    if image.scale != 1.:
+                        photons.scaleXY(1./image.scale)
+                    flux += photons.addTo(images[k])
+                    if save_photons:
+                        saved_photons.append(photons)
+                    Nleft -= thisN
+                results[k] = (flux, saved_photons if save_photons else [photons])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [ threading.Thread(target=run, args=(k,)) for k in range(n_threads) ]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        if len(errors) > 0:
+            raise errors[0]
+
+        # Add up the thread-local images in a fixed order.
+        total = images[0]
+        for im in images[1:]:
+            total += im
+        if image.dtype in [np.float32, np.float64]:
+            image += total
+        else:
+            image.array[:,:] += total.array.astype(image.dtype, copy=False)
+        added_flux = sum([ r[0] for r in results ])
+        if save_photons:
+            # Concatenate the photons from all the threads in order.
+            saved_photons = [ p for r in results for p in r[1] ]
+            photons = _concatenate_photons(saved_photons) if len(saved_photons) > 0 else None
+        else:
+            photons = results[-1][1][0]
         return added_flux, photons
 
 
@@ -2233,6 +2461,354 @@ class GSObject(object):
     def __ne__(self, other): return not self.__eq__(other)
     def __hash__(self): return hash(("galsim.GSObject", self._sbp))
 
+
+def _concatenate_photons(photon_list):
+    # Combine a list of PhotonArrays (e.g. the chunks shot by drawPhot) into a single one.
+    # The chunks all went through the same surface_ops, so they have the same arrays allocated.
+    names = ['x', 'y', 'flux']
+    if photon_list[0].hasAllocatedAngles():
+        names += ['dxdz', 'dydz']
+    if photon_list[0].hasAllocatedWavelengths():
+        names += ['wavelength']
+    photons = galsim.PhotonArray(sum([ p.size() for p in photon_list ]))
+    for name in names:
+        getattr(photons, name)[:] = np.concatenate([ getattr(p, name) for p in photon_list ])
+    return photons
+
+
+def _drawFFTTiled(ext, kernel, image, add_to_image, gsparams):
+    # Draw ext convolved by kernel and the pixel onto image using the overlap-add method.
+    # ext is sampled at the pixel centers in tiles of size T, each of which is convolved by the
+    # image of the kernel (of size nk) using an FFT of size L = T + nk.  Both profiles should
+    # already be in image coordinates.
+    kernel = galsim.Convolve(kernel, galsim.Pixel(scale=image.scale, gsparams=gsparams),
+                             real_space=False, gsparams=gsparams)
+    nk = kernel.getGoodImageSize(image.scale)
+    # The FFT has to be larger than the kernel image to leave room for any tile at all.
+    Lmin = galsim.Image.good_fft_size(nk + 1)
+    if Lmin > gsparams.maximum_fft_size:
+        raise RuntimeError(
+            "drawImage with method='fft_tiled' requires an FFT that is too large: %s. "%Lmin +
+            "If you can handle the large FFT, you may update gsparams.maximum_fft_size.")
+    L = galsim.Image.good_fft_size(max(4*nk, gsparams.minimum_fft_size))
+    while L > gsparams.maximum_fft_size:
+        L = galsim.Image.good_fft_size(L // 2)
+    L = max(L, Lmin)
+    T = L - nk
+
+    # The FFT of the kernel image, with the lower left corner of the kernel at (0,0).
+    kimage = galsim.ImageD(nk, nk, scale=image.scale)
+    kimage.setCenter(0,0)
+    kernel.drawFFT(kimage)
+    kx0 = kimage.bounds.xmin
+    ky0 = kimage.bounds.ymin
+    kpad = np.zeros((L,L), dtype=float)
+    kpad[:nk,:nk] = kimage.array
+    kkernel = galsim.fft.rfft2(kpad)
+
+    # Anything in ext farther than nk from the image doesn't affect it.
+    result = np.zeros(image.array.shape, dtype=float)
+    b = image.bounds
+    ext_bounds = b.withBorder(nk)
+    for y1 in range(ext_bounds.ymin, ext_bounds.ymax+1, T):
+        for x1 in range(ext_bounds.xmin, ext_bounds.xmax+1, T):
+            tile_bounds = galsim._BoundsI(x1, min(x1+T-1, ext_bounds.xmax),
+                                          y1, min(y1+T-1, ext_bounds.ymax))
+            tile = galsim.ImageD(bounds=tile_bounds, scale=image.scale)
+            ext.drawReal(tile)
+            ny, nx = tile.array.shape
+            apad = np.zeros((L,L), dtype=float)
+            apad[:ny,:nx] = tile.array
+            conv = galsim.fft.irfft2(galsim.fft.rfft2(apad) * kkernel)
+
+            # conv[i,j] is the value at (x1+kx0+j, y1+ky0+i).  Add the part that overlaps image.
+            xmin = max(x1+kx0, b.xmin)
+            xmax = min(x1+kx0+L-1, b.xmax)
+            ymin = max(y1+ky0, b.ymin)
+            ymax = min(y1+ky0+L-1, b.ymax)
+            if xmin > xmax or ymin > ymax: continue
+            result[ymin-b.ymin:ymax-b.ymin+1, xmin-b.xmin:xmax-b.xmin+1] += (
+                    conv[ymin-y1-ky0:ymax-y1-ky0+1, xmin-x1-kx0:xmax-x1-kx0+1])
+
+    if add_to_image:
+        image.array[:,:] += result.astype(image.dtype, copy=False)
+    else:
+        image.array[:,:] = result
+    return result.sum(dtype=float)
+
+def drawImages(objs, images, scale=None, wcs=None, method='auto', area=1., exptime=1., gain=1.,
+               add_to_image=False, use_true_center=True, offsets=None, share_fft_size=False):
+    """Draw a list of objects onto a list of images in a single call.
+
+    This is equivalent to
+
+        >>> for obj, image, offset in zip(objs, images, offsets):
+        ...     obj.drawImage(image, scale=scale, wcs=wcs, method=method, ..., offset=offset)
+
+    but it skips most of the argument checking and setup that drawImage does for each object,
+    doing it just once for the whole list instead.  When drawing many small stamps, this
+    overhead can take longer than the drawing itself.
+
+    The images must already have defined bounds, since the point is to draw onto existing
+    stamps.  Photon shooting and sensors are not supported.  Use drawImage for those.
+
+    If `share_fft_size` is True, then all of the objects that are drawn with an FFT onto images
+    of the same shape use the same size FFT (the largest of the sizes they would use
+    individually).  This means fewer distinct FFT plans are needed, but the results will differ
+    slightly from drawing each object with drawImage, since the smaller objects are drawn with
+    less aliasing.
+
+    @param objs             A list of GSObjects to draw.
+    @param images           A list of Images onto which to draw them.  This must have the same
+                            length as `objs`.
+    @param scale            If provided, use this as the pixel scale for all of the images.
+                            [default: None]
+    @param wcs              If provided, use this as the wcs for all of the images.
+                            [default: None]
+    @param method           Which method to use for rendering the images.  One of 'auto', 'fft',
+                            'real_space', 'no_pixel', or 'sb'.  See drawImage for details.
+                            [default: 'auto']
+    @param area             Collecting area of telescope in cm^2. [default: 1.]
+    @param exptime          Exposure time in s. [default: 1.]
+    @param gain             The number of photons per ADU. [default: 1.]
+    @param add_to_image     Whether to add flux to the existing images rather than clear out
+                            anything in them before drawing. [default: False]
+    @param use_true_center  Whether to center the objects at the true centers of the images.
+                            See drawImage for details. [default: True]
+    @param offsets          If provided, a list of offsets (one for each object) to apply
+                            when drawing.  See drawImage for details. [default: None]
+    @param share_fft_size   Whether to use the same size FFT for all of the objects drawn onto
+                            images with the same shape. [default: False]
+
+    @returns the list of drawn images.
+    """
+    if len(objs) != len(images):
+        raise ValueError("objs and images must have the same length")
+    if offsets is None:
+        offsets = [None] * len(objs)
+    elif len(offsets) != len(objs):
+        raise ValueError("offsets must have the same length as objs")
+
+    if gain <= 0.:
+        raise ValueError("Invalid gain <= 0.")
+    if area <= 0.:
+        raise ValueError("Invalid area <= 0.")
+    if exptime <= 0.:
+        raise ValueError("Invalid exptime <= 0.")
+    if method == 'phot':
+        raise ValueError("drawImages does not support method='phot'.  Use drawImage.")
+    if method not in ['auto', 'fft', 'real_space', 'no_pixel', 'sb']:
+        raise ValueError("Invalid method name = %s"%method)
+    for image in images:
+        if not isinstance(image, galsim.Image):
+            raise ValueError("image is not an Image instance")
+        if not image.bounds.isDefined():
+            raise ValueError("drawImages requires images with defined bounds")
+
+    if method == 'auto':
+        real_space = None
+    elif method == 'fft':
+        real_space = False
+    else:
+        real_space = True
+    convolve_pixel = method in ['auto', 'fft', 'real_space']
+    flux_scale = area * exptime / gain
+    unit_wcs = galsim.PixelScale(1.0)
+    # The pixels to convolve by, one for each gsparams.
+    pixels = {}
+
+    # First set up the image-coordinate profiles and the image views for all of the objects.
+    profs = []
+    views = []
+    scales = []
+    for obj, image, offset in zip(objs, images, offsets):
+        obj._prepareDraw()
+        image_wcs = obj._determine_wcs(scale, wcs, image)
+        offset = obj._parse_offset(offset)
+        local_wcs = obj._local_wcs(image_wcs, image, offset, use_true_center, image.bounds)
+        prof = local_wcs.toImage(obj)
+        obj_flux_scale = flux_scale
+        if method == 'sb':
+            obj_flux_scale /= local_wcs.pixelArea()
+        if obj_flux_scale != 1.:
+            prof *= obj_flux_scale
+        if convolve_pixel:
+            gsparams = obj.gsparams
+            if gsparams not in pixels:
+                pixels[gsparams] = galsim.Pixel(scale=1.0, gsparams=gsparams)
+            prof = galsim.Convolve(prof, pixels[gsparams], real_space=real_space,
+                                   gsparams=gsparams)
+        prof = prof._fix_center(image.bounds, offset, use_true_center, reverse=False)
+        image.wcs = image_wcs
+        image.draw_method = method
+
+        imview = image._view()
+        imview.setCenter(0,0)
+        imview.wcs = unit_wcs
+        profs.append(prof)
+        views.append(imview)
+        scales.append(obj_flux_scale)
+
+    # Then figure out the FFT sizes for the ones that need an FFT.
+    fft_sizes = {}
+    for k, prof in enumerate(profs):
+        if not prof.is_analytic_x:
+            fft_sizes[k] = prof._drawFFT_size(views[k])
+    if share_fft_size:
+        max_sizes = {}
+        for k, N in fft_sizes.items():
+            shape = views[k].array.shape
+            max_sizes[shape] = max(N, max_sizes.get(shape, 0))
+        for k in fft_sizes:
+            fft_sizes[k] = max_sizes[views[k].array.shape]
+
+    # Finally, draw them all.
+    for k, prof in enumerate(profs):
+        imview = views[k]
+        if k in fft_sizes:
+            kimage, wrap_size = prof._drawFFT_makeKImage(imview, fft_sizes[k])
+            prof._drawKImage(kimage)
+            added_photons = prof.drawFFT_finish(imview, kimage, wrap_size, add_to_image)
+        else:
+            added_photons = prof.drawReal(imview, add_to_image)
+        images[k].added_flux = added_photons / scales[k]
+
+    return images
+
+
+class PreparedDrawer(object):
+    """A helper for drawing the same profile many times with different offsets or fluxes.
+
+    When drawing a profile with an FFT, most of the time is spent filling the k-space image.
+    But shifting the profile only multiplies the k-space image by a phase, and changing the flux
+    only rescales it.  So this class draws the k-space image of the unshifted profile once, and
+    each subsequent call to draw() just applies the phase and flux scaling and does the inverse
+    FFT.  This is useful for things like dithering tests, where the same profile is drawn with
+    many different sub-pixel offsets.
+
+        >>> drawer = galsim.PreparedDrawer(psf, galsim.ImageF(32, 32, scale=0.2))
+        >>> for offset in offsets:
+        ...     image = drawer.draw(offset=offset)
+
+    The result is equivalent to
+
+        >>> image = obj.drawImage(image.copy(), method=method, offset=offset)
+        >>> image *= flux / obj.flux
+
+    up to the small differences that arise if drawImage would have chosen a different FFT size
+    for the shifted profile.  Also, if the image's wcs is not uniform, the local wcs is always
+    evaluated at the center of the image, not at the offset position.
+
+    @param obj          The GSObject to draw.
+    @param image        An image with defined bounds and a wcs to use as the template for the
+                        drawn images.  It is not modified.
+    @param method       Either 'fft' to include the pixel convolution (like drawImage's 'fft'
+                        method) or 'no_pixel' to sample the profile at the pixel centers.
+                        [default: 'fft']
+    @param use_true_center  Same as for drawImage. [default: True]
+    """
+    def __init__(self, obj, image, method='fft', use_true_center=True):
+        if not isinstance(obj, GSObject):
+            raise TypeError("obj must be a GSObject")
+        if image is None or not image.bounds.isDefined():
+            raise ValueError("PreparedDrawer requires an image with defined bounds")
+        if image.wcs is None:
+            raise ValueError("PreparedDrawer requires an image with a wcs")
+        if method not in ['fft', 'no_pixel']:
+            raise ValueError("Invalid method name = %s"%method)
+
+        self.obj = obj
+        self.image = image
+        self.method = method
+        self.use_true_center = use_true_center
+
+        obj._prepareDraw()
+        local_wcs = obj._local_wcs(image.wcs, image, galsim.PositionD(0,0), use_true_center,
+                                   image.bounds)
+        prof = local_wcs.toImage(obj)
+        if method == 'fft':
+            prof = galsim.Convolve(prof, galsim.Pixel(scale=1.0, gsparams=obj.gsparams),
+                                   real_space=False, gsparams=obj.gsparams)
+        self._prof = prof
+
+        imview = self._view(image)
+        N = prof._drawFFT_size(imview)
+        self._kimage, self._wrap_size = prof._drawFFT_makeKImage(imview, N)
+        prof._drawKImage(self._kimage)
+
+        # The kx and ky values of the columns and rows of the k-space image.
+        b = self._kimage.bounds
+        dk = self._kimage.scale
+        self._kx = np.arange(b.xmin, b.xmax+1) * dk
+        self._ky = np.arange(b.ymin, b.ymax+1) * dk
+
+    def _view(self, image):
+        # A view of the image with its center at (0,0) and unit pixel scale.
+        imview = image._view()
+        imview.setCenter(0,0)
+        imview.wcs = galsim.PixelScale(1.0)
+        return imview
+
+    def draw(self, offset=None, flux=None, image=None, add_to_image=False):
+        """Draw the profile with the given offset and flux.
+
+        @param offset       The offset in pixels to apply, as for drawImage. [default: None]
+        @param flux         The flux to give the profile, or None to use the flux of the
+                            original object.  If the original object has zero flux, it cannot
+                            be rescaled, so it is drawn as is (with a warning if flux != 0).
+                            [default: None]
+        @param image        The image to draw onto, which must have the same bounds as the
+                            template image.  [default: None, which means to make a new image
+                            like the template]
+        @param add_to_image Whether to add to the existing image rather than clear out anything
+                            in the image before drawing. [default: False]
+
+        @returns the drawn image.
+        """
+        if image is None:
+            image = galsim.Image(bounds=self.image.bounds, dtype=self.image.dtype,
+                                 wcs=self.image.wcs)
+        elif image.bounds != self.image.bounds:
+            raise ValueError("image must have the same bounds as the template image")
+        else:
+            image.wcs = self.image.wcs
+
+        # Apply the offset (and the centering for even-sized images) as a phase.
+        offset = self.obj._parse_offset(offset)
+        dx = offset.x
+        dy = offset.y
+        if self.use_true_center:
+            shape = self.image.bounds.numpyShape()
+            if shape[1] % 2 == 0: dx -= 0.5
+            if shape[0] % 2 == 0: dy -= 0.5
+
+        if flux is None:
+            flux_ratio = 1.
+        elif self.obj.flux == 0.:
+            if flux != 0.:
+                import warnings
+                warnings.warn("PreparedDrawer cannot rescale a profile with zero flux to "
+                              "flux = %s.  Drawing it with its original flux."%flux)
+            flux_ratio = 1.
+        else:
+            flux_ratio = flux / self.obj.flux
+
+        kimage = self._kimage.copy()
+        if dx != 0. or dy != 0.:
+            phase = np.outer(np.exp(-1j * self._ky * dy), np.exp(-1j * self._kx * dx))
+            kimage.array[:,:] *= flux_ratio * phase
+        elif flux_ratio != 1.:
+            kimage.array[:,:] *= flux_ratio
+
+        imview = self._view(image)
+        image.added_flux = self._prof.drawFFT_finish(imview, kimage, self._wrap_size, add_to_image)
+        return image
+
+    def __repr__(self):
+        return 'galsim.PreparedDrawer(%r, %r, method=%r, use_true_center=%r)'%(
+                self.obj, self.image, self.method, self.use_true_center)
+
+
 # Pickling an SBProfile is a bit tricky, since it's a base class for lots of other classes.
 # Normally, we'll know what the derived class is, so we can just use the pickle stuff that is
 # appropriate for that.  But if we get a SBProfile back from say the getObj() method of
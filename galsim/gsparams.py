@@ -118,6 +118,14 @@ range_division_for_extrema  The number of parts into which to split a range to b
 small_fraction_of_flux      When photon shooting, intervals with less than this fraction of
                             probability are considered ok to use with the dominant-sampling
                             algorithm. [default: 1.e-4]
+@param photon_chunk_size    The maximum number of photons to shoot at a time when drawing with
+                            photon shooting.  Larger numbers of photons are shot in chunks of
+                            this size, each of which has the surface_ops applied and is
+                            accumulated onto the image (by the sensor) before the next one is
+                            shot.  Each photon takes up to 56 bytes (when it has angles and
+                            wavelengths), so this limits the peak memory used for the photons.
+                            The maxN parameter of drawImage overrides this if it is given.
+                            [default: 10000000]
 """
 
 GSParams.__getinitargs__ = lambda self: (
@@ -127,7 +135,8 @@ GSParams.__getinitargs__ = lambda self: (
         self.realspace_relerr, self.realspace_abserr,
         self.integration_relerr, self.integration_abserr,
         self.shoot_accuracy, self.allowed_flux_variation,
-        self.range_division_for_extrema, self.small_fraction_of_flux)
+        self.range_division_for_extrema, self.small_fraction_of_flux,
+        self.photon_chunk_size)
 GSParams.__repr__ = lambda self: \
-        'galsim.GSParams(%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r)'%self.__getinitargs__()
+        'galsim.GSParams(%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r,%r)'%self.__getinitargs__()
 GSParams.__hash__ = lambda self: hash(repr(self))
@@ -606,6 +606,21 @@ class Aperture(object):
         return (lam*1e-9) / self.pupil_plane_scale * galsim.radians/scale_unit
 
 
+def _layer_wavefront_multi(layer, u, v, t, thetas, public):
+    # Compute the wavefront of one layer of a PhaseScreenList at several field angles, using
+    # wavefront_multi (or _wavefront_multi if not public) if the layer has it.  Other screens
+    # (e.g. user-defined ones that only implement wavefront and _wavefront) are evaluated one
+    # field angle at a time.
+    name = 'wavefront_multi' if public else '_wavefront_multi'
+    if hasattr(layer, name):
+        return getattr(layer, name)(u, v, t, thetas)
+    wavefront = layer.wavefront if public else layer._wavefront
+    thetas = list(thetas)
+    if t is None or np.ndim(t) == 0:
+        t = [t] * len(thetas)
+    return np.array([wavefront(u, v, tt, theta) for tt, theta in zip(t, thetas)])
+
+
 class PhaseScreenList(object):
     """ List of phase screens that can be turned into a PSF.  Screens can be either atmospheric
     layers or optical phase screens.  Generally, one would assemble a PhaseScreenList object using
@@ -627,12 +642,28 @@ class PhaseScreenList(object):
     -------
     makePSF()          Obtain a PSF from this set of phase screens.  See PhaseScreenPSF docstring
                        for more details.
+    makePSFs()         Obtain PSFs at several wavelengths, sharing the wavefront calculations.
     wavefront()        Compute the cumulative wavefront due to all screens.
     wavefront_gradient()   Compute the cumulative wavefront gradient due to all screens.
+    wavefront_multi()  Compute the cumulative wavefront at several field angles at once.
+
+    When several PSFs are made from the same PhaseScreenList, they are all computed together the
+    first time any of them is drawn.  If `nthreads` is more than 1, then the PSFs that need to be
+    updated at the same time step are computed concurrently with that many threads.  The results
+    are identical to computing them one at a time.  This may also be changed later by setting the
+    `nthreads` attribute.
+
+        >>> screens = galsim.Atmosphere(...)
+        >>> screens.nthreads = 4
+        >>> psfs = [screens.makePSF(lam=700, exptime=15, theta=theta) for theta in thetas]
 
-    @param layers  Sequence of phase screens.
+    @param layers    Sequence of phase screens.
+    @param nthreads  The number of threads to use to compute pending PSFs. [default: 1]
     """
-    def __init__(self, *layers):
+    def __init__(self, *layers, **kwargs):
+        self.nthreads = kwargs.pop('nthreads', 1)
+        if kwargs:
+            raise TypeError("PhaseScreenList got unexpected keyword arguments: %s"%list(kwargs))
         if len(layers) == 1:
             # First check if layers[0] is a PhaseScreenList, so we avoid nesting.
             if isinstance(layers[0], galsim.PhaseScreenList):
@@ -737,11 +768,25 @@ class PhaseScreenList(object):
         """Calculate previously delayed PSFs."""
         if not self._pending:
             return
-            # See if we have any dynamic screens.  If not, then we can immediately compute each PSF
-            # in a simple loop.
+        if self.nthreads < 1:
+            raise ValueError("nthreads must be >= 1")
+        pool = None
+        if self.nthreads > 1 and len(self._pending) > 1:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(min(self.nthreads, len(self._pending)))
+        try:
+            self._computePending(pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def _computePending(self, pool):
+        # See if we have any dynamic screens.  If not, then we can immediately compute each PSF
+        # in a simple loop.
         if not self.dynamic:
+            self._stepPSFs(self._pending, pool)
             for psf in self._pending:
-                psf._step()
                 psf._finalize()
             self._pending = []
             self._update_time_heap = []
@@ -751,21 +796,61 @@ class PhaseScreenList(object):
         # careful to always stop at multiples of each PSF's time_step attribute to update that PSF.
         # Use a heap to track the next time to stop at.
         while(self._update_time_heap):
-            # Get and seek to next time that has a PSF update.
+            # Get and seek to next time that has a PSF update.  Update all the PSFs that need to
+            # be updated at this time together.
             t, i = heappop(self._update_time_heap)
+            indices = [i]
+            while self._update_time_heap and self._update_time_heap[0][0] == t:
+                indices.append(heappop(self._update_time_heap)[1])
             self._seek(t)
-            # Update that PSF
-            psf = self._pending[i]
-            psf._step()
-            # If that PSF's next possible update time doesn't extend past its exptime, then
+            # Update those PSFs
+            psfs = [self._pending[i] for i in indices]
+            self._stepPSFs(psfs, pool)
+            # If a PSF's next possible update time doesn't extend past its exptime, then
             # push it back on the heap.
-            t += psf.time_step
-            if t < psf.t0 + psf.exptime:
-                heappush(self._update_time_heap, (t, i))
-            else:
-                psf._finalize()
+            for i, psf in zip(indices, psfs):
+                tnext = t + psf.time_step
+                if tnext < psf.t0 + psf.exptime:
+                    heappush(self._update_time_heap, (tnext, i))
+                else:
+                    psf._finalize()
         self._pending = []
 
+    def _stepPSFs(self, psfs, pool=None):
+        """Add the current instantaneous PSF to each of the given PhaseScreenPSFs."""
+        # The LookupTable2D objects used by the screens are not safe to use from several threads
+        # at once, so the wavefronts are all computed here first.  The rest of each step only
+        # touches that PSF's own image, and the FFT releases the GIL, so that part can be done
+        # concurrently without changing the results.
+        wfs = self._currentWavefronts(psfs)
+        if pool is None or len(psfs) == 1:
+            for psf, wf in zip(psfs, wfs):
+                psf._accumulate(wf)
+        else:
+            pool.map(lambda args: args[0]._accumulate(args[1]), list(zip(psfs, wfs)))
+
+    def _currentWavefronts(self, psfs):
+        """Compute the current wavefronts for the given PhaseScreenPSFs.
+
+        The PSFs that use the same aperture have their wavefronts computed together with a single
+        call to _wavefront_multi.  PSFs that also have the same field angle (e.g. the PSFs at
+        several wavelengths made by makePSFs) share the same wavefront, which is only computed
+        once.
+        """
+        groups = {}
+        for k, psf in enumerate(psfs):
+            groups.setdefault(psf.aper, {}).setdefault(tuple(psf.theta), []).append(k)
+        wfs = [None] * len(psfs)
+        for aper, theta_groups in groups.items():
+            u = aper.u[aper.illuminated]
+            v = aper.v[aper.illuminated]
+            thetas = list(theta_groups.keys())
+            wf = self._wavefront_multi(u, v, None, thetas)
+            for theta, w in zip(thetas, wf):
+                for k in theta_groups[theta]:
+                    wfs[k] = w
+        return wfs
+
     def wavefront(self, u, v, t, theta=(0.0*galsim.arcmin, 0.0*galsim.arcmin)):
         """ Compute cumulative wavefront due to all phase screens in PhaseScreenList.
 
@@ -815,6 +900,39 @@ class PhaseScreenList(object):
         else:
             return self._layers[0]._wavefront(u, v, t, theta)
 
+    def wavefront_multi(self, u, v, t, thetas):
+        """ Compute cumulative wavefront due to all phase screens in PhaseScreenList at several
+        field angles at once.
+
+        This is equivalent to calling wavefront() once for each field angle, but is much faster
+        when there are many field angles, since for each screen, the values for all of them are
+        computed in a single vectorized call.
+
+        @param u        Horizontal pupil coordinates (in meters) at which to evaluate wavefront, as
+                        a 1-d iterable.
+        @param v        Vertical pupil coordinates (in meters) at which to evaluate wavefront, as
+                        a 1-d iterable.  The shapes of u and v must match.
+        @param t        Times (in seconds) at which to evaluate wavefront.  Can be a scalar, to use
+                        the same time for each field angle, or an iterable with one time for each
+                        field angle.
+        @param thetas   Sequence of field angles at which to evaluate wavefront, each given as a
+                        2-tuple of `galsim.Angle`s.
+        @returns        Array of wavefront lag or lead in nanometers, with shape
+                        (len(thetas), len(u)).
+        """
+        if len(self._layers) > 1:
+            return np.sum([_layer_wavefront_multi(layer, u, v, t, thetas, True)
+                           for layer in self], axis=0)
+        else:
+            return _layer_wavefront_multi(self._layers[0], u, v, t, thetas, True)
+
+    def _wavefront_multi(self, u, v, t, thetas):
+        if len(self._layers) > 1:
+            return np.sum([_layer_wavefront_multi(layer, u, v, t, thetas, False)
+                           for layer in self], axis=0)
+        else:
+            return _layer_wavefront_multi(self._layers[0], u, v, t, thetas, False)
+
     def _wavefront_gradient(self, u, v, t, theta):
         if len(self._layers) > 1:
             return np.sum([layer._wavefront_gradient(u, v, t, theta) for layer in self], axis=0)
@@ -920,6 +1038,44 @@ class PhaseScreenList(object):
             theta = chain([th0], theta)
             return [PhaseScreenPSF(self, lam, theta=th, **kwargs) for th in theta]
 
+    def makePSFs(self, lams, **kwargs):
+        """Create PSFs at several wavelengths from the current PhaseScreenList.
+
+        This is similar to calling makePSF() once for each wavelength, except that all of the PSFs
+        use the same Aperture.  Since the wavefront doesn't depend on the wavelength, this means
+        that at each time step, the wavefront only needs to be computed once, and is then used
+        for all of the PSFs.  Only the conversion of the wavefront into a PSF is done separately
+        for each wavelength.  This is useful for building chromatic PSFs.
+
+            >>> lams = np.linspace(500, 900, 9)
+            >>> psfs = atm.makePSFs(lams, diam=4.0, exptime=15.0, theta=theta)
+
+        If `aper` is not given, the Aperture is made using the shortest wavelength, since this needs
+        the finest sampling of the pupil plane.  The PSFs at longer wavelengths will therefore
+        have somewhat larger images (with the same pixel scale) than they would get from
+        makePSF().
+
+        @param lams         Sequence of wavelengths in nanometers at which to compute the PSFs.
+
+        The other parameters are the same as for makePSF(), except that `theta` must be a single
+        field angle.
+
+        @returns a list of PhaseScreenPSFs, one for each wavelength.
+        """
+        lams = [float(lam) for lam in lams]
+        if len(lams) == 0:
+            raise ValueError("lams must not be empty")
+        if kwargs.get('aper', None) is None:
+            if 'diam' not in kwargs:
+                raise ValueError("Diameter required if aperture not specified directly.")
+            aper_keys = ('diam', 'circular_pupil', 'obscuration', 'nstruts', 'strut_thick',
+                         'strut_angle', 'oversampling', 'pad_factor', 'pupil_plane_im',
+                         'pupil_angle', 'pupil_plane_scale', 'pupil_plane_size')
+            aper_kwargs = dict((k, kwargs.pop(k)) for k in aper_keys if k in kwargs)
+            kwargs['aper'] = Aperture(lam=min(lams), screen_list=self,
+                                      gsparams=kwargs.get('gsparams', None), **aper_kwargs)
+        return [PhaseScreenPSF(self, lam, **kwargs) for lam in lams]
+
     @property
     def r0_500_effective(self):
         """Effective r0_500 for set of screens in list that define an r0_500 attribute."""
@@ -1192,9 +1348,16 @@ class PhaseScreenPSF(GSObject):
 
     def _step(self):
         """Compute the current instantaneous PSF and add it to the developing integrated PSF."""
+        self._accumulate(self._currentWavefront())
+
+    def _currentWavefront(self):
+        """Compute the current wavefront at the illuminated points of the aperture."""
         u = self.aper.u[self.aper.illuminated]
         v = self.aper.v[self.aper.illuminated]
-        wf = self._screen_list._wavefront(u, v, None, self.theta)
+        return self._screen_list._wavefront(u, v, None, self.theta)
+
+    def _accumulate(self, wf):
+        """Add the instantaneous PSF for the given wavefront to the developing integrated PSF."""
         expwf = np.exp((2j*np.pi/self.lam) * wf)
         expwf_grid = np.zeros_like(self.aper.illuminated, dtype=np.complex128)
         expwf_grid[self.aper.illuminated] = expwf
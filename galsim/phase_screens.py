@@ -18,6 +18,7 @@
 
 from builtins import range, zip
 
+import os
 import numpy as np
 import galsim
 
@@ -62,6 +63,27 @@ class AtmosphericScreen(object):
                          that `alpha` is set to something other than 1.0.  [default: None]
     @param rng           Random number generator as a galsim.BaseDeviate().  If None, then use the
                          clock time or system entropy to seed a new generator.  [default: None]
+    @param evolution     How to do the boiling updates when `alpha` != 1.0.  Either 'real_space' or
+                         'fourier'.  See below.  [default: 'real_space']
+    @param cache_dir     A directory in which to cache frozen-flow (alpha=1) screens.  See below.
+                         [default: None]
+
+    With evolution='real_space', each boiling update draws a new random screen, which takes a
+    forward and an inverse FFT of the full screen, and mixes it into the current screen.  With
+    evolution='fourier', the screen is instead kept in Fourier space, where each update only needs
+    new random Fourier modes, and the screen is only transformed back to real space when it is
+    next used.  If the wavefront is only needed over a small part of the screen (e.g. a single
+    pupil), then only that part is transformed back.  This can be much faster for long exposures
+    with small time steps.  The two modes produce statistically equivalent screens, and start from
+    the same screen at t=0, but the particular realizations differ after the first update.
+
+    Large frozen-flow screens can take a long time to make, and a lot of memory.  If `cache_dir` is
+    given, then the screen is saved to a file in that directory the first time it is made, and
+    later screens with the same rng, r0_500, L0, screen_size and screen_scale (in this or any
+    other process) read it from that file instead.  The file is memory-mapped read-only rather
+    than read into memory, so several processes using the same screen share one copy of it, and
+    pickling the screen (e.g. to send it to another process) doesn't include the screen itself.
+    The cache files are not removed automatically.  `cache_dir` is not used for boiling screens.
 
     Relevant SPIE paper:
     "Remembrance of phases past: An autoregressive method for generating realistic atmospheres in
@@ -73,13 +95,16 @@ class AtmosphericScreen(object):
     September 2014
     """
     def __init__(self, screen_size, screen_scale=None, altitude=0.0, r0_500=0.2, L0=25.0,
-                 vx=0.0, vy=0.0, alpha=1.0, time_step=None, rng=None):
+                 vx=0.0, vy=0.0, alpha=1.0, time_step=None, rng=None, evolution='real_space',
+                 cache_dir=None):
 
         if (alpha != 1.0 and time_step is None):
             raise ValueError("No time_step provided when alpha != 1.0")
         if (alpha == 1.0 and time_step is not None):
             raise ValueError("Setting AtmosphericScreen time_step prohibited when alpha == 1.0.  "
                              "Did you mean to set time_step in makePSF or PhaseScreenPSF?")
+        if evolution not in ('real_space', 'fourier'):
+            raise ValueError("Invalid evolution %r.  Must be 'real_space' or 'fourier'."%evolution)
         if screen_scale is None:
             # We copy Jee+Tyson(2011) and (arbitrarily) set the screen scale equal to r0 by default.
             screen_scale = r0_500
@@ -95,6 +120,7 @@ class AtmosphericScreen(object):
         self.vx = vx
         self.vy = vy
         self.alpha = alpha
+        self.evolution = evolution
         self._time = 0.0
 
         if rng is None:
@@ -104,27 +130,51 @@ class AtmosphericScreen(object):
         self.dynamic = True
         self.reversible = self.alpha == 1.0
 
-        self._init_psi()
+        self.cache_dir = cache_dir
+        if self.reversible and cache_dir is not None:
+            self._cache_file = os.path.join(cache_dir, self._cacheFileName())
+        else:
+            self._cache_file = None
+
+        # We don't need _psi if the screen is already in the cache.
+        if self._cache_file is None or not os.path.exists(self._cache_file):
+            self._init_psi()
         self._reset()
         # Free some RAM for frozen-flow screen.
         if self.reversible:
-            del self._psi, self._screen
+            self.__dict__.pop('_psi', None)
+            del self._screen
 
     def __str__(self):
         return "galsim.AtmosphericScreen(altitude=%s)" % self.altitude
 
     def __repr__(self):
         return ("galsim.AtmosphericScreen(%r, %r, altitude=%r, r0_500=%r, L0=%r, " +
-                "vx=%r, vy=%r, alpha=%r, time_step=%r, rng=%r)") % (
+                "vx=%r, vy=%r, alpha=%r, time_step=%r, rng=%r, evolution=%r, cache_dir=%r)") % (
                         self.screen_size, self.screen_scale, self.altitude, self.r0_500, self.L0,
-                        self.vx, self.vy, self.alpha, self.time_step, self._orig_rng)
+                        self.vx, self.vy, self.alpha, self.time_step, self._orig_rng,
+                        self.evolution, self.cache_dir)
+
+    def __getstate__(self):
+        d = self.__dict__.copy()
+        if self._cache_file is not None:
+            # Don't pickle the screen itself.  It is memory-mapped from the cache file again when
+            # unpickled, so all the processes share the same copy.
+            d.pop('_table', None)
+        return d
+
+    def __setstate__(self, d):
+        self.__dict__ = d
+        if self._cache_file is not None and '_table' not in d:
+            self._table = galsim.LookupTable2D(self._xs, self._ys, self._loadCachedScreen(),
+                                               edge_mode='wrap')
 
     # While AtmosphericScreen does have mutable internal state, it's still possible to treat the
     # object as immutable under the python data model.  The requirements for hashability are that
     # the hash value never changes during the lifetime of the object, __eq__ is defined, and a == b
     # implies hash(a) == hash(b).  We also require that if a == b, then f(a) == f(b) for any public
     # function on an AtmosphericScreen, such as producing a PSF.  The mutable internal state of
-    # AtmosphericScreen, such as the _psi, _screen, _tab2d, _origin attributes, are for
+    # AtmosphericScreen, such as the _psi, _screen, _kscreen, _tab2d attributes, are for
     # computational convenience, and don't "define" the object and are not even strictly necessary
     # for its implementation.
     def __eq__(self, other):
@@ -138,6 +188,7 @@ class AtmosphericScreen(object):
                 self.vy == other.vy and
                 self.alpha == other.alpha and
                 self.time_step == other.time_step and
+                self.evolution == other.evolution and
                 self._orig_rng == other._orig_rng)
 
     def __hash__(self):
@@ -145,7 +196,7 @@ class AtmosphericScreen(object):
             self._hash = hash((
                     "galsim.AtmosphericScreen", self.screen_size, self.screen_scale, self.altitude,
                     self.r0_500, self.L0, self.vx, self.vy, self.alpha, self.time_step,
-                    repr(self._orig_rng.serialize())))
+                    self.evolution, repr(self._orig_rng.serialize())))
         return self._hash
 
     def __ne__(self, other): return not self == other
@@ -172,11 +223,72 @@ class AtmosphericScreen(object):
         self._psi *= 500.0  # Multiply by 500 here so we can divide by arbitrary lam later.
         self._psi[0, 0] = 0.0
 
-    def _random_screen(self):
-        """Generate a random phase screen with power spectrum given by self._psi**2"""
+    def _cacheFileName(self):
+        """The name of the cache file for this screen within cache_dir.
+
+        The screen only depends on the rng, r0_500, L0, screen_size and screen_scale, so the name
+        is made from a hash of these.
+        """
+        import hashlib
+        key = repr(('galsim.AtmosphericScreen', 1, self._orig_rng.serialize(), self.r0_500,
+                    self.L0, self.screen_size, self.screen_scale, self.npix))
+        return 'atmscreen_%s.npy'%hashlib.md5(key.encode('utf-8')).hexdigest()
+
+    def _loadCachedScreen(self):
+        """Memory-map the screen from the cache file, first making the file if necessary."""
+        if not os.path.exists(self._cache_file):
+            import tempfile
+            # Make sure we make the same screen as _reset would, even if this was unpickled.
+            if not hasattr(self, '_psi'):
+                self._init_psi()
+            self.rng = self._orig_rng.duplicate()
+            screen = self._random_screen()
+            try:
+                os.makedirs(self.cache_dir)
+            except OSError:
+                if not os.path.isdir(self.cache_dir): raise
+            # Write to a temporary file and then rename it, so other processes never see a
+            # partially written file.
+            fd, tmp_name = tempfile.mkstemp(suffix='.tmp', dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, 'wb') as fout:
+                    np.save(fout, screen)
+                os.rename(tmp_name, self._cache_file)
+            except OSError:
+                # On Windows, rename fails if another process made the file first.
+                os.remove(tmp_name)
+                if not os.path.exists(self._cache_file): raise
+        screen = np.load(self._cache_file, mmap_mode='r')
+        if screen.shape != (self.npix, self.npix):
+            raise IOError("Cached screen %s has the wrong shape %s"%(self._cache_file,
+                                                                   screen.shape))
+        return screen
+
+    def _random_kscreen(self):
+        """Generate the Fourier transform of a random phase screen with power spectrum given by
+        self._psi**2.
+        """
         gd = galsim.GaussianDeviate(self.rng)
         noise = galsim.utilities.rand_arr(self._psi.shape, gd)
-        return galsim.fft.ifft2(galsim.fft.fft2(noise)*self._psi).real
+        return galsim.fft.fft2(noise)*self._psi
+
+    def _random_screen(self):
+        """Generate a random phase screen with power spectrum given by self._psi**2"""
+        return galsim.fft.ifft2(self._random_kscreen()).real
+
+    def _random_knoise(self):
+        """Generate random Fourier modes for a boiling update with evolution='fourier'.
+
+        Unlike _random_kscreen(), this draws complex Gaussian noise directly in Fourier space, so
+        it doesn't need any FFTs.  The result is not Hermitian, but since we only use the real part
+        of the inverse transform, which comes from the Hermitian part of this array, the screen
+        has the same statistics as one from _random_kscreen().  (The variance of each component
+        is doubled to account for taking the Hermitian part.)
+        """
+        gd = galsim.GaussianDeviate(self.rng, sigma=self.npix)
+        re = galsim.utilities.rand_arr(self._psi.shape, gd)
+        im = galsim.utilities.rand_arr(self._psi.shape, gd)
+        return (re + 1j*im) * self._psi
 
     def _seek(self, t):
         """Set layer's internal clock to time t."""
@@ -193,11 +305,18 @@ class AtmosphericScreen(object):
             final_update_number = int(t // self.time_step)
             n_updates = final_update_number - previous_update_number
             if n_updates > 0:
-                for _ in range(n_updates):
-                    self._screen *= self.alpha
-                    self._screen += np.sqrt(1.-self.alpha**2) * self._random_screen()
-                self._tab2d = galsim.LookupTable2D(self._xs, self._ys, self._screen,
-                                                   edge_mode='wrap')
+                if self.evolution == 'fourier':
+                    for _ in range(n_updates):
+                        self._kscreen *= self.alpha
+                        self._kscreen += np.sqrt(1.-self.alpha**2) * self._random_knoise()
+                    self._screen = None
+                else:
+                    for _ in range(n_updates):
+                        self._screen *= self.alpha
+                        self._screen += np.sqrt(1.-self.alpha**2) * self._random_screen()
+                # The table is remade the next time it is used.
+                self._table = None
+                self._subtable = None
         self._time = float(t)
 
     def _reset(self):
@@ -206,12 +325,99 @@ class AtmosphericScreen(object):
         self._time = 0.0
 
         # Only need to reset/create tab2d if not frozen or doesn't already exist
-        if not self.reversible or not hasattr(self, '_tab2d'):
-            self._screen = self._random_screen()
+        if not self.reversible or not hasattr(self, '_table'):
             self._xs = np.linspace(-0.5*self.screen_size, 0.5*self.screen_size, self.npix,
                                    endpoint=False)
             self._ys = self._xs
-            self._tab2d = galsim.LookupTable2D(self._xs, self._ys, self._screen, edge_mode='wrap')
+            self._subtable = None
+            if self.evolution == 'fourier' and not self.reversible:
+                self._kscreen = self._random_kscreen()
+                self._screen = None
+                self._table = None
+            else:
+                if self._cache_file is not None:
+                    self._screen = self._loadCachedScreen()
+                else:
+                    self._screen = self._random_screen()
+                self._table = galsim.LookupTable2D(self._xs, self._ys, self._screen,
+                                                   edge_mode='wrap')
+
+    @property
+    def _tab2d(self):
+        # The lookup table of the full screen.  After a boiling update, this is only remade when
+        # it is next used.
+        if self._table is None:
+            if self._screen is None:
+                self._screen = galsim.fft.ifft2(self._kscreen).real
+            self._table = galsim.LookupTable2D(self._xs, self._ys, self._screen, edge_mode='wrap')
+        return self._table
+
+    def _lookup(self, u, v):
+        """Get a lookup table that covers the points (u,v).
+
+        Usually, this is just the table of the full screen.  But with evolution='fourier', if
+        the full screen hasn't been made for the current update yet, and the points only cover a
+        small part of it, then only that part of the screen is transformed back to real space.
+
+        @returns table, u, v, where u and v are the points to use with the returned table.
+        """
+        if self._table is not None or self.evolution != 'fourier':
+            return self._tab2d, u, v
+        if self._subtable is None:
+            irange = self._subRange(u, self._xs[0])
+            jrange = self._subRange(v, self._ys[0])
+            if irange is None or jrange is None:
+                return self._tab2d, u, v
+            self._subtable = self._makeSubTable(irange, jrange)
+        table = self._subtable
+        # The sub-table doesn't wrap, so move the points to the period that starts at its edge.
+        u = (u - table.x[0]) % self.screen_size + table.x[0]
+        v = (v - table.y[0]) % self.screen_size + table.y[0]
+        if table._inbounds(u, v):
+            return table, u, v
+        else:
+            # Some other part of the screen is needed now, so just make the full screen.
+            return self._tab2d, u, v
+
+    def _subRange(self, x, x0):
+        """Find the smallest range of screen pixels, possibly wrapping around the edge of the
+        screen, that is needed to interpolate the screen at the positions x.
+
+        @returns (start, n), or None if that would be more than half of the screen.
+        """
+        if np.size(x) == 0:
+            return None
+        n = self.npix
+        index = np.unique(np.floor((x - x0) / self.screen_scale).astype(int) % n)
+        # The range starts just after the largest gap between the used pixels.
+        gaps = np.diff(np.append(index, index[0]+n))
+        k = np.argmax(gaps)
+        start = index[(k+1) % len(index)]
+        # Include an extra pixel on each side for the interpolation.
+        length = (index[k] - start) % n + 3
+        start = (start - 1) % n
+        if length > n // 2:
+            return None
+        return start, length
+
+    def _makeSubTable(self, irange, jrange):
+        """Make a lookup table of part of the screen from the Fourier transform of the screen.
+
+        This does the inverse FFT along one axis for the full screen, but only for the needed
+        rows along the other axis, which is about half the work of a full 2d inverse FFT.
+
+        @param irange   (start, n) for the first (u) axis of the screen.
+        @param jrange   (start, n) for the second (v) axis of the screen.
+        """
+        i = (irange[0] + np.arange(irange[1])) % self.npix
+        j = (jrange[0] + np.arange(jrange[1])) % self.npix
+        if len(i) <= len(j):
+            screen = np.fft.ifft(np.fft.ifft(self._kscreen, axis=0)[i,:], axis=1)[:,j].real
+        else:
+            screen = np.fft.ifft(np.fft.ifft(self._kscreen, axis=1)[:,j], axis=0)[i,:].real
+        xs = self._xs[0] + (irange[0] + np.arange(irange[1])) * self.screen_scale
+        ys = self._ys[0] + (jrange[0] + np.arange(jrange[1])) * self.screen_scale
+        return galsim.LookupTable2D(xs, ys, screen)
 
     # Note -- use **kwargs here so that AtmosphericScreen.stepk and OpticalScreen.stepk
     # can use the same signature, even though they depend on different parameters.
@@ -282,7 +488,58 @@ class AtmosphericScreen(object):
             t = self._time
         u = u - t*self.vx + 1000*self.altitude*theta[0].tan()
         v = v - t*self.vy + 1000*self.altitude*theta[1].tan()
-        return self._tab2d(u, v)
+        table, u, v = self._lookup(u, v)
+        return table(u, v)
+
+    def wavefront_multi(self, u, v, t, thetas):
+        """ Compute wavefront due to atmospheric phase screen at several field angles at once.
+
+        This is equivalent to calling wavefront() once for each field angle, but is much faster
+        when there are many field angles, since the lookups into the phase screen for all of them
+        are done in a single vectorized call.
+
+        @param u        Horizontal pupil coordinates (in meters) at which to evaluate wavefront, as
+                        a 1-d iterable.
+        @param v        Vertical pupil coordinates (in meters) at which to evaluate wavefront, as
+                        a 1-d iterable.  The shapes of u and v must match.
+        @param t        Times (in seconds) at which to evaluate wavefront.  Can be a scalar, to use
+                        the same time for each field angle, or an iterable with one time for each
+                        field angle.
+        @param thetas   Sequence of field angles at which to evaluate wavefront, each given as a
+                        2-tuple of `galsim.Angle`s.
+        @returns        Array of wavefront lag or lead in nanometers, with shape
+                        (len(thetas), len(u)).
+        """
+        u, v, t, thetas = _parse_wavefront_multi_args(u, v, t, thetas)
+        if self.reversible:
+            return self._wavefront_multi(u, v, t, thetas)
+        else:
+            out = np.empty((len(thetas), len(u)), dtype=float)
+            tmin = np.min(t)
+            tmax = np.max(t)
+            tt = (tmin // self.time_step) * self.time_step
+            while tt <= tmax:
+                here = ((tt <= t) & (t < tt+self.time_step))
+                if np.any(here):
+                    self._seek(tt)
+                    out[here] = self._wavefront_multi(u, v, t[here],
+                                                      [th for th, h in zip(thetas, here) if h])
+                tt += self.time_step
+            return out
+
+    def _wavefront_multi(self, u, v, t, thetas):
+        # Same as wavefront_multi(), but no argument checking and no boiling updates.
+        # t is either None, meaning the current time, or an array with one time per field angle.
+        if t is None:
+            t = np.empty(len(thetas), dtype=float)
+            t.fill(self._time)
+        tanx = np.array([theta[0].tan() for theta in thetas])
+        tany = np.array([theta[1].tan() for theta in thetas])
+        # The points for all the field angles are looked up in the table together.
+        u = u - t[:,np.newaxis]*self.vx + 1000*self.altitude*tanx[:,np.newaxis]
+        v = v - t[:,np.newaxis]*self.vy + 1000*self.altitude*tany[:,np.newaxis]
+        table, u, v = self._lookup(u, v)
+        return table(u, v)
 
     def wavefront_gradient(self, u, v, t, theta=(0.0*galsim.arcmin, 0.0*galsim.arcmin)):
         """ Compute gradient of wavefront due to atmospheric phase screen.
@@ -333,7 +590,8 @@ class AtmosphericScreen(object):
         # Same as wavefront(), but no argument checking and no boiling updates.
         u = u - t*self.vx + 1000*self.altitude*theta[0].tan()
         v = v - t*self.vy + 1000*self.altitude*theta[1].tan()
-        return self._tab2d.gradient(u, v)
+        table, u, v = self._lookup(u, v)
+        return table.gradient(u, v)
 
 
 def Atmosphere(screen_size, rng=None, **kwargs):
@@ -449,6 +707,10 @@ def Atmosphere(screen_size, rng=None, **kwargs):
                          that `alpha` is set to something other than 1.0.  [default: None]
     @param rng           Random number generator as a galsim.BaseDeviate().  If None, then use the
                          clock time or system entropy to seed a new generator.  [default: None]
+    @param evolution     How to do the boiling updates, either 'real_space' or 'fourier'.  See the
+                         AtmosphericScreen docstring for details.  [default: 'real_space']
+    @param cache_dir     A directory in which to cache frozen-flow screens.  See the
+                         AtmosphericScreen docstring for details.  [default: None]
     """
     # Fill in screen_size here, since there isn't a default in AtmosphericScreen
     kwargs['screen_size'] = galsim.utilities.listify(screen_size)
@@ -470,6 +732,11 @@ def Atmosphere(screen_size, rng=None, **kwargs):
         del kwargs['speed']
         del kwargs['direction']
 
+    # A single string would look like a list to the broadcasting below.
+    for key in ['evolution', 'cache_dir']:
+        if key in kwargs and isinstance(kwargs[key], str):
+            kwargs[key] = [kwargs[key]]
+
     # Determine broadcast size
     nmax = max(len(v) for v in kwargs.values() if hasattr(v, '__len__'))
 
@@ -490,6 +757,38 @@ def Atmosphere(screen_size, rng=None, **kwargs):
                                    for kw in galsim.utilities.dol_to_lod(kwargs, nmax)])
 
 
+def _parse_wavefront_multi_args(u, v, t, thetas):
+    """Check the arguments of the wavefront_multi methods and convert them to arrays.
+
+    @returns u, v, t, thetas, where u and v are 1-d arrays, t is an array with one time for
+             each field angle, and thetas is a list.
+    """
+    u = np.array(u, dtype=float)
+    v = np.array(v, dtype=float)
+    if u.shape != v.shape:
+        raise ValueError("u.shape not equal to v.shape")
+    if u.ndim != 1:
+        raise ValueError("u and v must be 1-d arrays")
+    if thetas is None:
+        raise TypeError("thetas is required")
+    thetas = list(thetas)
+    if len(thetas) == 0:
+        raise ValueError("thetas must not be empty")
+
+    from numbers import Real
+    if t is None:
+        t = 0.0
+    if isinstance(t, Real):
+        tmp = np.empty(len(thetas), dtype=float)
+        tmp.fill(t)
+        t = tmp
+    else:
+        t = np.array(t, dtype=float)
+        if t.shape != (len(thetas),):
+            raise ValueError("t must have one time for each theta if t is not a scalar")
+    return u, v, t, thetas
+
+
 # Some utilities for working with Zernike polynomials
 # Combinations.  n choose r.
 # See http://stackoverflow.com/questions/3025162/statistics-combinations-in-python
@@ -846,6 +1145,29 @@ class OpticalScreen(object):
         rsqr = np.abs(r)**2
         return galsim.utilities.horner2d(rsqr, r, self._coef_array, dtype=complex).real * self.lam_0
 
+    def wavefront_multi(self, u, v, t=None, thetas=None):
+        """ Compute wavefront due to optical phase screen at several field angles at once.
+
+        Since an OpticalScreen is independent of time and field angle, each row of the result is
+        the same.
+
+        @param u        Horizontal pupil coordinates (in meters) at which to evaluate wavefront, as
+                        a 1-d iterable.
+        @param v        Vertical pupil coordinates (in meters) at which to evaluate wavefront, as
+                        a 1-d iterable.  The shapes of u and v must match.
+        @param t        Ignored for OpticalScreen.
+        @param thetas   Sequence of field angles.  Only the number of them is used.
+        @returns        Array of wavefront lag or lead in nanometers, with shape
+                        (len(thetas), len(u)).
+        """
+        u, v, t, thetas = _parse_wavefront_multi_args(u, v, t, thetas)
+        return self._wavefront_multi(u, v, t, thetas)
+
+    def _wavefront_multi(self, u, v, t, thetas):
+        # Same as wavefront_multi(), but no argument checking.
+        wf = self._wavefront(u, v, t, None)
+        return np.tile(wf, (len(thetas), 1))
+
     def wavefront_gradient(self, u, v, t=None, theta=None):
         """ Compute gradient of wavefront due to atmospheric phase screen.
 
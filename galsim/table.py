@@ -440,7 +440,10 @@ class LookupTable2D(object):
 
     @param x              Strictly increasing array of `x` positions at which to create table.
     @param y              Strictly increasing array of `y` positions at which to create table.
-    @param f              Nx by Ny input array of function values.
+    @param f              Nx by Ny input array of function values.  If this is a read-only
+                          C-contiguous float64 array, such as a memory-mapped array from
+                          `np.load(file_name, mmap_mode='r')`, then the table uses it in place
+                          rather than making a copy.
     @param interpolant    Interpolant to use.  One of 'floor', 'ceil', 'nearest', or 'linear'.
                           [default: 'linear']
     @param edge_mode      Keyword controlling how extrapolation beyond the input range is handled.
@@ -471,21 +474,25 @@ class LookupTable2D(object):
         self.edge_mode = edge_mode
         self.constant = float(constant)
 
+        self._periodic = False
         if self.edge_mode == 'wrap':
             # Can wrap if x and y arrays are equally spaced ...
             if np.allclose(dx, dx[0]) and np.allclose(dy, dy[0]):
-                # Underlying Table2D requires us to extend x, y, and f.
+                # Underlying Table2D requires us to extend x and y.  It wraps around to the first
+                # row and column of f itself, so we don't need to extend (i.e. copy) f.
                 self.x = np.append(self.x, self.x[-1]+dx[0])
                 self.y = np.append(self.y, self.y[-1]+dy[0])
-                self.f = np.pad(self.f, [(0,1), (0,1)], mode='wrap')
-            if (all(self.f[0] == self.f[-1]) and all(self.f[:,0] == self.f[:,-1])):
-                self.xperiod = self.x[-1] - self.x[0]
-                self.yperiod = self.y[-1] - self.y[0]
-            else:
+                self._periodic = True
+            elif not (all(self.f[0] == self.f[-1]) and all(self.f[:,0] == self.f[:,-1])):
                 raise ValueError("Cannot use edge_mode='wrap' unless either x and y are equally "
                                  "spaced or first/last row/column of f are identical.")
+            self.xperiod = self.x[-1] - self.x[0]
+            self.yperiod = self.y[-1] - self.y[0]
 
-        self.table = _galsim._LookupTable2D(self.x, self.y, self.f, self.interpolant)
+        # Note: if f is read-only (e.g. a memory-mapped array from np.load(file, mmap_mode='r')),
+        # then the table uses it in place rather than making a copy.
+        self.table = _galsim._LookupTable2D(self.x, self.y, self.f, self.interpolant,
+                                            self._periodic)
 
     def _inbounds(self, x, y):
         """Return whether or not *all* coords specified by x and y are in bounds of the original
@@ -616,9 +623,12 @@ class LookupTable2D(object):
             self.interpolant, self.edge_mode))
 
     def __repr__(self):
+        # If we extended x and y for wrapping, then give the original x and y.
+        x = self.x[:-1] if self._periodic else self.x
+        y = self.y[:-1] if self._periodic else self.y
         return ("galsim.LookupTable2D(x=array(%r), y=array(%r), "
                 "f=array(%r), interpolant=%r, edge_mode=%r)"%(
-            self.x.tolist(), self.y.tolist(), self.f.tolist(), self.interpolant, self.edge_mode))
+            x.tolist(), y.tolist(), self.f.tolist(), self.interpolant, self.edge_mode))
 
     def __eq__(self, other):
         return (isinstance(other, LookupTable2D) and
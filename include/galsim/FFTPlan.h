@@ -0,0 +1,102 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2017 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+#ifndef GalSim_FFTPlan_H
+#define GalSim_FFTPlan_H
+
+/**
+ * @file FFTPlan.h
+ *
+ * @brief A process-wide cache of the FFTW plans used for the 2d FFTs in GalSim.
+ *
+ * Making an FFTW plan can take much longer than doing the transform itself, especially when
+ * FFTW is allowed to measure the speed of different algorithms.  So rather than make and
+ * destroy a plan for every transform, we make each plan once and keep it.  The plans are keyed
+ * by the kind of transform, its size, whether it is done in place, and the alignment of the
+ * arrays, and they are run on each new set of arrays using the FFTW new-array execute
+ * functions.
+ *
+ * The planning is always done with scratch arrays, so the planning mode may be changed to
+ * FFTW_MEASURE or FFTW_PATIENT without clobbering the data to be transformed.  The wisdom that
+ * FFTW accumulates may be saved to a file and loaded again by later processes so they don't
+ * have to measure the same transforms again.
+ *
+ * If GalSim was built with the single precision FFTW library (fftw3f), the float versions
+ * of the real transforms use single precision plans, which are cached the same way.
+ *
+ * All of these functions are thread safe.
+ */
+
+#include <string>
+#include "fftw3.h"
+
+namespace galsim {
+
+    /**
+     * @brief Set the planning mode for new FFTW plans.
+     *
+     * @param mode      0 for FFTW_ESTIMATE (the default), 1 for FFTW_MEASURE, or
+     *                  2 for FFTW_PATIENT.
+     *
+     * Plans that were already made with a different mode are kept, but are not used anymore
+     * unless the mode is changed back.
+     */
+    void SetFFTPlanMode(int mode);
+
+    /// @brief Get the current planning mode for new FFTW plans.
+    int GetFFTPlanMode();
+
+    /// @brief Destroy all of the cached FFTW plans.  (Not safe while any FFT is in progress.)
+    void ClearFFTPlans();
+
+    /// @brief Get the number of cached FFTW plans.
+    int GetNFFTPlans();
+
+    /// @brief Load FFTW wisdom from a file.  Returns whether it was read successfully.
+    bool ImportFFTWisdom(const std::string& file_name);
+
+    /// @brief Save the current FFTW wisdom to a file.  Returns whether it was written successfully.
+    bool ExportFFTWisdom(const std::string& file_name);
+
+    /// @brief Do a 2d real to complex FFT with a cached plan.  in may equal out.
+    void ExecuteFFT_R2C(int Ny, int Nx, double* in, fftw_complex* out);
+
+    /// @brief Do a 2d complex to real FFT with a cached plan.  in may equal out.
+    /// Note: as usual for FFTW, the input array is overwritten.
+    void ExecuteFFT_C2R(int Ny, int Nx, fftw_complex* in, double* out);
+
+    /// @brief Do a 2d complex FFT with a cached plan.  in may equal out.
+    /// @param sign     FFTW_FORWARD or FFTW_BACKWARD
+    void ExecuteFFT_C2C(int Ny, int Nx, fftw_complex* in, fftw_complex* out, int sign);
+
+    /// @brief Whether GalSim was built with the single precision FFTW library.
+    bool HasSinglePrecisionFFT();
+
+    /// @brief Do a 2d real to complex FFT in single precision.  in may equal out.
+    /// If the single precision FFTW library is not available, this is done in double precision
+    /// (with temporary double arrays) instead.
+    void ExecuteFFT_R2C(int Ny, int Nx, float* in, fftwf_complex* out);
+
+    /// @brief Do a 2d complex to real FFT in single precision.  in may equal out.
+    /// If the single precision FFTW library is not available, this is done in double precision
+    /// (with temporary double arrays) instead.
+    void ExecuteFFT_C2R(int Ny, int Nx, fftwf_complex* in, float* out);
+
+}
+
+#endif
@@ -100,6 +100,9 @@ namespace galsim {
          *                                    extrema.
          * @param small_fraction_of_flux      Intervals with less than this fraction of probability
          *                                    are ok to use dominant-sampling method.
+         * @param photon_chunk_size           The maximum number of photons to shoot and
+         *                                    accumulate at a time.  This bounds the memory used
+         *                                    for photon arrays when drawing very bright objects.
          */
         GSParams(int _minimum_fft_size,
                  int _maximum_fft_size,
@@ -116,7 +119,8 @@ namespace galsim {
                  double _shoot_accuracy,
                  double _allowed_flux_variation,
                  int _range_division_for_extrema,
-                 double _small_fraction_of_flux);
+                 double _small_fraction_of_flux,
+                 int _photon_chunk_size);
 
         /**
          * A reasonable set of default values
@@ -140,7 +144,8 @@ namespace galsim {
             shoot_accuracy(1.e-5),
             allowed_flux_variation(0.81),
             range_division_for_extrema(32),
-            small_fraction_of_flux(1.e-4)
+            small_fraction_of_flux(1.e-4),
+            photon_chunk_size(10000000)
             {}
 
         bool operator==(const GSParams& rhs) const;
@@ -167,6 +172,7 @@ namespace galsim {
         double allowed_flux_variation;
         int range_division_for_extrema;
         double small_fraction_of_flux;
+        int photon_chunk_size;
 
     };
 
@@ -320,6 +320,16 @@ namespace galsim {
          */
         ImageView<double> inverse_fft(bool shift_in=true, bool shift_out=true) const;
 
+        /**
+         *  @brief Perform a 2D inverse FFT from k-space to real space in single precision.
+         *
+         *  This uses single precision FFTW if it is available.  It uses half the memory of
+         *  inverse_fft, which is normally plenty accurate for drawing float images.
+         *  Only the transform itself is single precision.  The input k-space values are
+         *  converted to float as they are copied in, whatever their original type.
+         */
+        ImageView<float> inverse_fft_float(bool shift_in=true, bool shift_out=true) const;
+
         /**
          *  @brief Perform a 2D FFT from complex space to k-space or the inverse.
          */
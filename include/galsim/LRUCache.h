@@ -24,6 +24,7 @@
 #include <map>
 #include <boost/tuple/tuple.hpp>
 #include <boost/tuple/tuple_comparison.hpp>  // Need this for t1 < t2
+#include "Mutex.h"
 
 namespace galsim {
 
@@ -100,6 +101,9 @@ namespace galsim {
      *
      * At most nmax items will be saved in the cache.
      *
+     * The cache is thread-safe, since the drawing routines release the GIL, so several Python
+     * threads may be making new profiles (and thus calling get) at the same time.
+     *
      */
     template <typename Key, typename Value>
     class LRUCache
@@ -121,6 +125,7 @@ namespace galsim {
 
         boost::shared_ptr<Value> get(const Key& key)
         {
+            MutexLock lock(_mutex);
             assert(_entries.size() == _cache.size());
             MapIter iter = _cache.find(key);
             if (iter != _cache.end()) {
@@ -154,6 +159,7 @@ namespace galsim {
     private:
 
         size_t _nmax;
+        Mutex _mutex;
 
         typedef std::pair<Key, boost::shared_ptr<Value> > Entry;
         std::list<Entry> _entries;
@@ -0,0 +1,113 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2017 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#ifndef GalSim_Mutex_H
+#define GalSim_Mutex_H
+
+#include <pthread.h>
+
+namespace galsim {
+
+    /**
+     * @brief A simple (recursive) mutex.
+     *
+     * The drawing functions release the Python GIL, so things like the static LRUCache
+     * instances and the lazily built tables in the cached Info classes may be accessed from
+     * several threads at once.  This class protects such objects.  It is recursive, so it is
+     * safe for a function holding the lock to call another function that also takes it.
+     */
+    class Mutex
+    {
+    public:
+        Mutex()
+        {
+            pthread_mutexattr_t attr;
+            pthread_mutexattr_init(&attr);
+            pthread_mutexattr_settype(&attr, PTHREAD_MUTEX_RECURSIVE);
+            pthread_mutex_init(&_mutex, &attr);
+            pthread_mutexattr_destroy(&attr);
+        }
+        ~Mutex() { pthread_mutex_destroy(&_mutex); }
+
+        void lock() { pthread_mutex_lock(&_mutex); }
+        void unlock() { pthread_mutex_unlock(&_mutex); }
+
+    private:
+        Mutex(const Mutex& rhs); ///< Hide the copy constructor.
+        void operator=(const Mutex& rhs); ///< Hide assignment operator.
+
+        pthread_mutex_t _mutex;
+    };
+
+    /**
+     * @brief Lock a Mutex for the lifetime of this object.
+     *
+     *     {
+     *         MutexLock lock(_mutex);
+     *         // ... Do things that require the lock ...
+     *     }  // The mutex is unlocked here, even if an exception was thrown.
+     */
+    class MutexLock
+    {
+    public:
+        MutexLock(Mutex& mutex) : _mutex(mutex) { _mutex.lock(); }
+        ~MutexLock() { _mutex.unlock(); }
+
+    private:
+        MutexLock(const MutexLock& rhs); ///< Hide the copy constructor.
+        void operator=(const MutexLock& rhs); ///<Hide assignment operator.
+
+        Mutex& _mutex;
+    };
+
+    /**
+     * @brief A flag that one thread may set while other threads read it without a lock.
+     *
+     * This is used for double-checked locking of lazily computed values:
+     *
+     *     if (!_built.isSet()) {
+     *         MutexLock lock(_mutex);
+     *         if (!_built.isSet()) {
+     *             // ... Compute the values ...
+     *             _built.set();
+     *         }
+     *     }
+     *     // ... Use the values ...
+     *
+     * set() and isSet() use release and acquire semantics respectively, so a thread that sees
+     * the flag set also sees everything that was written before it was set.
+     */
+    class AtomicFlag
+    {
+    public:
+        AtomicFlag() : _flag(0) {}
+
+        bool isSet() const { return __atomic_load_n(&_flag, __ATOMIC_ACQUIRE) != 0; }
+        void set() { __atomic_store_n(&_flag, 1, __ATOMIC_RELEASE); }
+
+    private:
+        AtomicFlag(const AtomicFlag& rhs); ///< Hide the copy constructor.
+        void operator=(const AtomicFlag& rhs); ///< Hide assignment operator.
+
+        int _flag;
+    };
+
+}
+
+#endif
@@ -38,6 +38,10 @@ namespace galsim {
         double xValue(const Position<double>& p) const;
         std::complex<double> kValue(const Position<double>& k) const;
 
+        void xValues(int n, const double* x, const double* y, double* val) const;
+        void kValues(int n, const double* kx, const double* ky,
+                     std::complex<double>* val) const;
+
         double maxK() const { return _maxMaxK; }
         double stepK() const { return _minStepK; }
 
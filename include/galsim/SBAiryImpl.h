@@ -86,6 +86,11 @@ namespace galsim {
         ///< Class that can sample radial distribution
         mutable boost::shared_ptr<OneDimensionalDeviate> _sampler;
 
+        ///< Guards the lazy construction of _sampler, which may be done by several threads at once.
+        mutable Mutex _mutex;
+        ///< Whether _sampler has been built.
+        mutable AtomicFlag _sampler_built;
+
     private:
         AiryInfo(const AiryInfo& rhs); ///< Hides the copy constructor.
         void operator=(const AiryInfo& rhs); ///<Hide assignment operator.
@@ -92,6 +92,19 @@ namespace galsim {
         /// @brief Return whether the convolution should be done in real space
         bool isRealSpace() const;
 
+        /**
+         * @brief Set the maximum number of component k-space images to keep for reuse.
+         *
+         * When drawing the k-space image of a convolution, the k-space images of any components
+         * that are shared with other convolutions (e.g. a common PSF) are kept in a cache, so
+         * other convolutions using the same component on the same k-space grid can reuse them.
+         * Setting the size to 0 turns off the cache.  The default size is 8.
+         */
+        static void SetKImageCacheSize(int maxsize);
+
+        /// @brief Get the number of component k-space images currently in the cache.
+        static int GetKImageCacheCount();
+
     protected:
 
         class SBConvolveImpl;
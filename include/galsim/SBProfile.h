@@ -157,6 +157,33 @@ namespace galsim {
          */
         std::complex<double> kValue(const Position<double>& k) const;
 
+        /**
+         * @brief Return the values of SBProfile at a list of 2D positions in real space.
+         *
+         * This is equivalent to calling xValue() for each position, but without the overhead
+         * of a separate call for each one.  Some profiles (e.g. SBTransform and SBAdd) are
+         * able to do the calculation more efficiently for many positions at once.
+         *
+         * @param[in] n     The number of positions.
+         * @param[in] x     The x values of the positions.
+         * @param[in] y     The y values of the positions.
+         * @param[out] val  The output values.
+         */
+        void xValues(int n, const double* x, const double* y, double* val) const;
+
+        /**
+         * @brief Return the values of SBProfile at a list of 2D positions in k space.
+         *
+         * This is equivalent to calling kValue() for each position.  cf. xValues().
+         *
+         * @param[in] n     The number of positions.
+         * @param[in] kx    The kx values of the positions.
+         * @param[in] ky    The ky values of the positions.
+         * @param[out] val  The output values.
+         */
+        void kValues(int n, const double* kx, const double* ky,
+                     std::complex<double>* val) const;
+
         //@{
         /**
          *  @brief Define the range over which the profile is not trivially zero.
@@ -40,6 +40,13 @@ namespace galsim {
         virtual double xValue(const Position<double>& p) const =0;
         virtual std::complex<double> kValue(const Position<double>& k) const =0;
 
+        // Calculate xValues and kValues for a list of arbitrary positions.
+        // If these aren't overridden, then the regular xValue or kValue will be called for each
+        // position.
+        virtual void xValues(int n, const double* x, const double* y, double* val) const;
+        virtual void kValues(int n, const double* kx, const double* ky,
+                             std::complex<double>* val) const;
+
         // Calculate xValues and kValues for a bunch of positions at once.
         // For some profiles, this may be more efficient than repeated calls of xValue(pos)
         // since it affords the opportunity for vectorization of the calculations.
@@ -123,8 +123,19 @@ namespace galsim {
         mutable boost::shared_ptr<FluxDensity> _radial;
         mutable boost::shared_ptr<OneDimensionalDeviate> _sampler;
 
+        // The SersicInfo objects are shared via the cache, so several threads may need the
+        // lazily calculated values above at once.  Each group of values is calculated while
+        // holding _mutex, and its flag is set once it is ready to be used.
+        mutable Mutex _mutex;
+        mutable AtomicFlag _stepk_built;  ///< Whether _stepk has been calculated.
+        mutable AtomicFlag _hlr_built;    ///< Whether _re and _b have been calculated.
+        mutable AtomicFlag _flux_built;   ///< Whether _flux has been calculated.
+        mutable AtomicFlag _ft_built;     ///< Whether _ft, _maxk, etc. have been built.
+        mutable AtomicFlag _sampler_built; ///< Whether _radial and _sampler have been built.
+
         // Helper functions used internally:
         void buildFT() const;
+        void checkSampler() const;
         void calculateHLR() const;
         double calculateMissingFluxRadius(double missing_flux_frac) const;
     };
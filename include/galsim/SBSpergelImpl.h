@@ -103,6 +103,18 @@ namespace galsim {
         // Classes used for photon shooting
         mutable boost::shared_ptr<FluxDensity> _radial;
         mutable boost::shared_ptr<OneDimensionalDeviate> _sampler;
+
+        // The SpergelInfo objects are shared via the cache, so several threads may need the
+        // lazily calculated values above at once.  Each of them is calculated while holding
+        // _mutex, and its flag is set once it is ready to be used.
+        mutable Mutex _mutex;
+        mutable AtomicFlag _maxk_built;    ///< Whether _maxk has been calculated.
+        mutable AtomicFlag _stepk_built;   ///< Whether _stepk has been calculated.
+        mutable AtomicFlag _hlr_built;     ///< Whether _re has been calculated.
+        mutable AtomicFlag _sampler_built; ///< Whether _radial and _sampler have been built.
+
+        // Helper function used internally:
+        void checkSampler() const;
     };
 
     class SBSpergel::SBSpergelImpl : public SBProfileImpl
@@ -27,6 +27,7 @@
 #include <stdexcept>
 #include <iostream>
 #include <functional>
+#include <boost/shared_ptr.hpp>
 
 #include "Std.h"
 #include "OneDimensionalDeviate.h"
@@ -86,6 +87,9 @@ namespace galsim {
 
         int upperIndex(const A a) const;
 
+        /// Do the setup that is otherwise done on the first call to upperIndex.
+        void prepare() const { if (!isReady) setup(); }
+
         // pass through a few std::vector methods.
         typename std::vector<A>::iterator begin() {return vec.begin();}
         typename std::vector<A>::iterator end() {return vec.end();}
@@ -135,6 +139,14 @@ namespace galsim {
 
         void init(); /// Common initialization code.
 
+        /**
+         * @brief Do the setup that is otherwise done on the first lookup.
+         *
+         * After this, lookups in a table whose args are equally spaced only read the table, so
+         * it may be used by several threads at once.
+         */
+        void prepare() const { setup(); args.prepare(); }
+
         A argMin() const {return args.front();}
         A argMax() const {return args.back();}
 
@@ -219,6 +231,22 @@ namespace galsim {
         /// Table from xargs, yargs, vals
         Table2D(const A* _xargs, const A* _yargs, const V* _vals, int Nx, int Ny, interpolant in);
 
+        /**
+         * @brief Table from xargs, yargs, vals, possibly using vals in place.
+         *
+         * If owner is not null, then vals is used directly rather than copied, and owner should
+         * keep that memory alive for the life of the table.  If owner is null, vals is copied.
+         *
+         * If periodic is true, then vals is only (Nx-1) x (Ny-1), and the last row and column of
+         * the table are taken to be the same as the first row and column.  This lets a table
+         * with edge_mode='wrap' use an array that wasn't padded with the wrapped values.
+         */
+        Table2D(const A* _xargs, const A* _yargs, const V* _vals, int Nx, int Ny, interpolant in,
+                bool periodic, boost::shared_ptr<V> owner);
+
+        /// Copy constructor.  (vals needs to point to the new copy of storage.)
+        Table2D(const Table2D<V,A>& rhs);
+
         A xmin() const {return xargs.front();}
         A xmax() const {return xargs.back();}
         A ymin() const {return yargs.front();}
@@ -239,7 +267,8 @@ namespace galsim {
 
         const std::vector<A>& getXArgs() const { return xargs.getArgs(); }
         const std::vector<A>& getYArgs() const { return yargs.getArgs(); }
-        const std::vector<V>& getVals() const { return vals; }
+        /// Copy the Nx x Ny table values (including the wrapped ones if periodic) into vals.
+        void getVals(V* vals) const;
         int getNx() const {return Nx;}
         int getNy() const {return Ny;}
         interpolant getInterp() const { return iType; }
@@ -247,9 +276,22 @@ namespace galsim {
     private:
         interpolant iType;
         const int Nx, Ny; // Array dimensions
+        const int nxv, nyv; // Dimensions of vals.  (Nx-1, Ny-1 if periodic, else Nx, Ny.)
         const ArgVec<A> xargs;
         const ArgVec<A> yargs;
-        const std::vector<V> vals;
+        std::vector<V> storage; // The values if they were copied.
+        boost::shared_ptr<V> owner; // The owner of the values if they were not copied.
+        const V* vals;
+
+        void setInterpolant();
+
+        // The value at (i,j), wrapping around to the start if the table is periodic.
+        V val(int i, int j) const
+        {
+            if (i == nxv) i = 0;
+            if (j == nyv) j = 0;
+            return vals[i*nyv + j];
+        }
 
         typedef V (Table2D<V,A>::*Table2DMemFn)(const A x, const A y, int i, int j) const;
         Table2DMemFn interpolate;
@@ -0,0 +1,53 @@
+/* -*- c++ -*-
+ * Copyright (c) 2012-2017 by the GalSim developers team on GitHub
+ * https://github.com/GalSim-developers
+ *
+ * This file is part of GalSim: The modular galaxy image simulation toolkit.
+ * https://github.com/GalSim-developers/GalSim
+ *
+ * GalSim is free software: redistribution and use in source and binary forms,
+ * with or without modification, are permitted provided that the following
+ * conditions are met:
+ *
+ * 1. Redistributions of source code must retain the above copyright notice, this
+ *    list of conditions, and the disclaimer given in the accompanying LICENSE
+ *    file.
+ * 2. Redistributions in binary form must reproduce the above copyright notice,
+ *    this list of conditions, and the disclaimer given in the documentation
+ *    and/or other materials provided with the distribution.
+ */
+
+#ifndef GalSim_GILHelper_H
+#define GalSim_GILHelper_H
+
+#include "boost/python.hpp"
+
+namespace galsim {
+
+    // Release the Python GIL for the lifetime of this object, so other Python threads can run
+    // while we do some long calculation in C++.  e.g.
+    //
+    //     {
+    //         ReleaseGIL gil;
+    //         prof.draw(image, dx, add);
+    //     }  // The GIL is reacquired here, even if an exception was thrown.
+    //
+    // Nothing in the scope of the ReleaseGIL object may touch any Python objects.  In particular,
+    // be careful that the last reference to an ImageView whose memory is owned by a numpy
+    // array is not dropped while the GIL is released.
+    class ReleaseGIL
+    {
+    public:
+        ReleaseGIL() : _state(PyEval_SaveThread()) {}
+        ~ReleaseGIL() { PyEval_RestoreThread(_state); }
+
+    private:
+        ReleaseGIL(const ReleaseGIL& rhs); ///< Hide the copy constructor.
+        void operator=(const ReleaseGIL& rhs); ///<Hide assignment operator.
+
+        PyThreadState* _state;
+    };
+
+}
+
+#endif
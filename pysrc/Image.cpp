@@ -24,6 +24,8 @@
 
 #include "NumpyHelper.h"
 #include "Image.h"
+#include "FFTPlan.h"
+#include "GILHelper.h"
 
 namespace bp = boost::python;
 
@@ -148,6 +150,36 @@ struct PyImage {
         image.resize(new_bounds);
     }
 
+    // The FFTs can take a while for large images, so we release the GIL while they run to let
+    // other Python threads do their own FFTs at the same time.  (e.g. PhaseScreenList with
+    // nthreads > 1.)
+    static ImageView<std::complex<double> > Fft(
+        const BaseImage<T>& image, bool shift_in, bool shift_out)
+    {
+        ReleaseGIL gil;
+        return image.fft(shift_in, shift_out);
+    }
+
+    static ImageView<double> InverseFft(const BaseImage<T>& image, bool shift_in, bool shift_out)
+    {
+        ReleaseGIL gil;
+        return image.inverse_fft(shift_in, shift_out);
+    }
+
+    static ImageView<float> InverseFftFloat(
+        const BaseImage<T>& image, bool shift_in, bool shift_out)
+    {
+        ReleaseGIL gil;
+        return image.inverse_fft_float(shift_in, shift_out);
+    }
+
+    static ImageView<std::complex<double> > Cfft(
+        const BaseImage<T>& image, bool inverse, bool shift_in, bool shift_out)
+    {
+        ReleaseGIL gil;
+        return image.cfft(inverse, shift_in, shift_out);
+    }
+
     static bp::object GetArray(bp::object image) { return GetArrayImpl(image, false); }
     static bp::object GetConstArray(bp::object image) { return GetArrayImpl(image, true); }
 
@@ -217,11 +249,13 @@ struct PyImage {
             .add_property("array", &GetConstArray)
             .def("getBounds", getBounds)
             .add_property("bounds", getBounds)
-            .def("rfft", &BaseImage<T>::fft,
+            .def("rfft", &Fft,
+                 (bp::arg("shift_in")=true, bp::arg("shift_out")=true))
+            .def("irfft", &InverseFft,
                  (bp::arg("shift_in")=true, bp::arg("shift_out")=true))
-            .def("irfft", &BaseImage<T>::inverse_fft,
+            .def("irfft_float", &InverseFftFloat,
                  (bp::arg("shift_in")=true, bp::arg("shift_out")=true))
-            .def("cfft", &BaseImage<T>::cfft,
+            .def("cfft", &Cfft,
                  (bp::arg("inverse")=false, bp::arg("shift_in")=true, bp::arg("shift_out")=true))
             ;
         ADD_CORNER(pyBaseImage, getXMin, xmin);
@@ -398,6 +432,15 @@ void pyExportImage() {
 
     bp::def("goodFFTSize", &goodFFTSize, (bp::arg("input_size")),
             "Round up to the next larger 2^n or 3x2^n.");
+
+    // The FFTW plan cache used by the rfft, irfft, and cfft methods.
+    bp::def("SetFFTPlanMode", &SetFFTPlanMode, (bp::arg("mode")));
+    bp::def("GetFFTPlanMode", &GetFFTPlanMode);
+    bp::def("ClearFFTPlans", &ClearFFTPlans);
+    bp::def("GetNFFTPlans", &GetNFFTPlans);
+    bp::def("HasSinglePrecisionFFT", &HasSinglePrecisionFFT);
+    bp::def("ImportFFTWisdom", &ImportFFTWisdom, (bp::arg("file_name")));
+    bp::def("ExportFFTWisdom", &ExportFFTWisdom, (bp::arg("file_name")));
 }
 
 } // namespace galsim
@@ -25,6 +25,7 @@
 
 #include "PhotonArray.h"
 #include "NumpyHelper.h"
+#include "GILHelper.h"
 
 namespace bp = boost::python;
 
@@ -40,11 +41,19 @@ namespace {
 
 
     struct PyPhotonArray {
+        // Release the GIL while accumulating, so several threads can accumulate photons
+        // onto their own images at the same time.
+        template <typename U>
+        static double addTo(const PhotonArray& phot, ImageView<U> image)
+        {
+            ReleaseGIL gil;
+            return phot.addTo(image);
+        }
+
         template <typename U, typename W>
         static void wrapTemplates(W & wrapper) {
             wrapper
-                .def("addTo",
-                     (double (PhotonArray::*)(ImageView<U>) const)&PhotonArray::addTo,
+                .def("addTo", &addTo<U>,
                      (bp::arg("image")),
                      "Add flux of photons to an image by binning into pixels.")
                 ;
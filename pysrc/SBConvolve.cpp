@@ -64,6 +64,8 @@ namespace galsim {
                 .def("getObjs", getObjs)
                 .def("isRealSpace", &SBConvolve::isRealSpace)
                 ;
+            bp::def("SetConvolveKImageCacheSize", &SBConvolve::SetKImageCacheSize);
+            bp::def("GetConvolveKImageCacheCount", &SBConvolve::GetKImageCacheCount);
         }
 
     };
@@ -28,6 +28,7 @@
 
 #include "SBProfile.h"
 #include "SBTransform.h"
+#include "GILHelper.h"
 
 namespace bp = boost::python;
 
@@ -40,7 +41,7 @@ namespace galsim {
             bp::class_<GSParams, boost::shared_ptr<GSParams> > ("GSParams", bp::no_init)
                 .def(bp::init<
                     int, int, double, double, double, double, double, double, double, double,
-                    double, double, double, double, int, double>((
+                    double, double, double, double, int, double, int>((
                         bp::arg("minimum_fft_size")=128,
                         bp::arg("maximum_fft_size")=4096,
                         bp::arg("folding_threshold")=5.e-3,
@@ -56,7 +57,8 @@ namespace galsim {
                         bp::arg("shoot_accuracy")=1.e-5,
                         bp::arg("allowed_flux_variation")=0.81,
                         bp::arg("range_division_for_extrema")=32,
-                        bp::arg("small_fraction_of_flux")=1.e-4)
+                        bp::arg("small_fraction_of_flux")=1.e-4,
+                        bp::arg("photon_chunk_size")=10000000)
                     )
                 )
                 .def_readonly("minimum_fft_size", &GSParams::minimum_fft_size)
@@ -75,6 +77,7 @@ namespace galsim {
                 .def_readonly("allowed_flux_variation", &GSParams::allowed_flux_variation)
                 .def_readonly("range_division_for_extrema", &GSParams::range_division_for_extrema)
                 .def_readonly("small_fraction_of_flux", &GSParams::small_fraction_of_flux)
+                .def_readonly("photon_chunk_size", &GSParams::photon_chunk_size)
                 .def(bp::self == bp::other<GSParams>())
                 .enable_pickling()
                 ;
@@ -91,6 +94,53 @@ namespace galsim {
     struct PySBProfile
     {
 
+        // The drawing functions can take a while, so we release the GIL while they run to
+        // let other Python threads do their own drawing at the same time.
+        // Note: The image arguments are taken by value here, so the Python-side reference to
+        // the underlying array is held until after the GIL is reacquired.
+        template <typename U>
+        static double draw(const SBProfile& prof, ImageView<U> image, double dx, bool add)
+        {
+            ReleaseGIL gil;
+            return prof.draw(image, dx, add);
+        }
+
+        template <typename U>
+        static void drawK(const SBProfile& prof, ImageView<std::complex<U> > image,
+                          double dk, bool add)
+        {
+            ReleaseGIL gil;
+            prof.drawK(image, dk, add);
+        }
+
+        static boost::shared_ptr<PhotonArray> shoot(const SBProfile& prof, int n,
+                                                    UniformDeviate u)
+        {
+            ReleaseGIL gil;
+            return prof.shoot(n, u);
+        }
+
+        // The arrays for xValues and kValues are passed as the addresses of numpy arrays.
+        static void xValues(const SBProfile& prof, int n, size_t x_data, size_t y_data,
+                            size_t val_data)
+        {
+            const double* x = reinterpret_cast<const double*>(x_data);
+            const double* y = reinterpret_cast<const double*>(y_data);
+            double* val = reinterpret_cast<double*>(val_data);
+            ReleaseGIL gil;
+            prof.xValues(n, x, y, val);
+        }
+
+        static void kValues(const SBProfile& prof, int n, size_t kx_data, size_t ky_data,
+                            size_t val_data)
+        {
+            const double* kx = reinterpret_cast<const double*>(kx_data);
+            const double* ky = reinterpret_cast<const double*>(ky_data);
+            std::complex<double>* val = reinterpret_cast<std::complex<double>*>(val_data);
+            ReleaseGIL gil;
+            prof.kValues(n, kx, ky, val);
+        }
+
         template <typename U, typename W>
         static void wrapTemplates(W & wrapper) {
             // We don't need to wrap templates in a separate function, but it keeps us
@@ -98,14 +148,11 @@ namespace galsim {
             // We also don't need to make 'W' a template parameter in this case,
             // but it's easier to do that than write out the full class_ type.
             wrapper
-                .def("draw",
-                     (double (SBProfile::*)(ImageView<U>, double, bool) const)&SBProfile::draw,
+                .def("draw", &draw<U>,
                      (bp::arg("image"), bp::arg("dx"), bp::arg("add")),
                      "Draw in-place and return the summed flux.");
             wrapper
-                .def("drawK",
-                     (void (SBProfile::*)(ImageView<std::complex<U> >, double, bool) const)
-                     &SBProfile::drawK,
+                .def("drawK", &drawK<U>,
                      (bp::arg("image"), bp::arg("dk"), bp::arg("add")),
                      "Draw k-space image.");
         }
@@ -154,6 +201,10 @@ namespace galsim {
                      "require an FFT to determine real-space values.")
                 .def("kValue", &SBProfile::kValue,
                      "Return value of SBProfile at a chosen 2d position in k-space.")
+                .def("xValues", &xValues, bp::args("n", "x", "y", "val"),
+                     "Fill val with the values of SBProfile at n positions in real space.")
+                .def("kValues", &kValues, bp::args("n", "kx", "ky", "val"),
+                     "Fill val with the values of SBProfile at n positions in k-space.")
                 .def("maxK", &SBProfile::maxK, "Value of k beyond which aliasing can be neglected")
                 .def("nyquistDx", &SBProfile::nyquistDx,
                      "Image pixel spacing that does not alias maxK")
@@ -179,7 +230,7 @@ namespace galsim {
                 .def("shift", &SBProfile::shift, bp::args("delta"))
                 .def("expand", &SBProfile::expand, bp::args("scale"))
                 .def("transform", &SBProfile::transform, bp::args("dudx", "dudy", "dvdx", "dvdy"))
-                .def("shoot", &SBProfile::shoot, bp::args("n", "u"))
+                .def("shoot", &shoot, bp::args("n", "u"))
                 .def("__repr__", &SBProfile::repr)
                 .def("serialize", &SBProfile::serialize)
                 .enable_pickling()
@@ -153,17 +153,19 @@ namespace {
     struct PyTable2D{
         static Table2D<double, double>* makeTable2D(
             const bp::object& x, const bp::object& y, const bp::object& f,
-            const char* interp_c)
+            const char* interp_c, bool periodic)
         {
 
             const std::string interp = interp_c;
 
-            const int Nx = GetNumpyArrayDim(f.ptr(), 0);
-            const int Ny = GetNumpyArrayDim(f.ptr(), 1);
-            const int Nx2 = GetNumpyArrayDim(x.ptr(), 0);
-            const int Ny2 = GetNumpyArrayDim(y.ptr(), 0);
-            assert(Nx == Nx2);
-            assert(Ny == Ny2);
+            const int Nx = GetNumpyArrayDim(x.ptr(), 0);
+            const int Ny = GetNumpyArrayDim(y.ptr(), 0);
+            const int Nf = periodic ? 1 : 0;  // f is one smaller in each direction if periodic.
+            if (GetNumpyArrayDim(f.ptr(), 0) != Nx - Nf ||
+                GetNumpyArrayDim(f.ptr(), 1) != Ny - Nf) {
+                PyErr_SetString(PyExc_ValueError, "Shape of f does not match x and y");
+                bp::throw_error_already_set();
+            }
             const double* xargs = GetNumpyArrayData<double>(x.ptr());
             const double* yargs = GetNumpyArrayData<double>(y.ptr());
             const double* vals = GetNumpyArrayData<double>(f.ptr());
@@ -176,7 +178,21 @@ namespace {
                 PyErr_SetString(PyExc_ValueError, "Invalid interpolant");
                 bp::throw_error_already_set();
             }
-            return new Table2D<double,double>(xargs, yargs, vals, Nx, Ny, i);
+            // If f is read-only (e.g. a memory-mapped file), then the table uses its memory
+            // directly rather than making a copy.  (If it is writeable, we still copy it, so
+            // later changes to the array don't change the table.)  The owner keeps a reference
+            // to the array for the life of the table.
+            boost::shared_ptr<double> owner;
+            if (!(GetNumpyArrayFlags(f.ptr()) & NPY_ARRAY_WRITEABLE)) {
+                double* data;
+                int step, stride;
+                CheckNumpyArray(f, 2, true, data, owner, step, stride);
+                if (step != 1 || stride != Ny - Nf) {
+                    PyErr_SetString(PyExc_ValueError, "f must be C-contiguous");
+                    bp::throw_error_already_set();
+                }
+            }
+            return new Table2D<double,double>(xargs, yargs, vals, Nx, Ny, i, periodic, owner);
         }
 
         static void interpMany(const Table2D<double,double>& table2d,
@@ -239,9 +255,12 @@ namespace {
 
         static bp::object convertGetVals(const Table2D<double,double>& table2d)
         {
-            const std::vector<double>& v = table2d.getVals();
-            return MakeNumpyArray(&v[0], table2d.getNx(), table2d.getNy(), 1, table2d.getNy(),
-                                  true);
+            // This returns a new array, which includes the wrapped last row and column of a
+            // periodic table.
+            npy_intp shape[2] = { table2d.getNx(), table2d.getNy() };
+            PyObject* array = PyArray_SimpleNew(2, shape, NPY_DOUBLE);
+            table2d.getVals(GetNumpyArrayData<double>(array));
+            return bp::object(bp::handle<>(array));
         }
 
         static std::string convertGetInterp(const Table2D<double,double>& table2d)
@@ -271,7 +290,8 @@ namespace {
                 .def("__init__",
                     bp::make_constructor(
                         &makeTable2D, bp::default_call_policies(),
-                        (bp::arg("x"), bp::arg("y"), bp::arg("f"), bp::arg("interp"))
+                        (bp::arg("x"), bp::arg("y"), bp::arg("f"), bp::arg("interp"),
+                         bp::arg("periodic")=false)
                     )
                 )
                 .def("__call__", &Table2D<double,double>::lookup)
@@ -23,8 +23,11 @@
 
 #include <limits>
 #include <vector>
+#include <map>
 #include <cassert>
 #include "FFT.h"
+#include "FFTPlan.h"
+#include "Mutex.h"
 #include "Std.h"
 
 #ifdef __SSE2__
@@ -1038,16 +1041,9 @@ namespace galsim {
         }
         xdbg<<"After fill t_array, t_array[0] = "<<t_array[0]<<std::endl;
 
-        fftw_plan plan = fftw_plan_dft_c2r_2d(
-            _N, _N, t_array.get_fftw(), xt._array.get_fftw(), FFTW_ESTIMATE);
-        xdbg<<"After make plan"<<std::endl;
-        if (plan==NULL) throw FFTInvalid();
-
         // Run the transform:
-        fftw_execute(plan);
+        ExecuteFFT_C2R(_N, _N, t_array.get_fftw(), xt._array.get_fftw());
         xdbg<<"After exec plan"<<std::endl;
-        fftw_destroy_plan(plan);
-        xdbg<<"After destroy plan"<<std::endl;
 
         xt._dx = 2.*M_PI*_invNd*_invdk;
         dbg<<"dx = "<<xt._dx<<std::endl;
@@ -1086,11 +1082,7 @@ namespace galsim {
         // Make a new copy of data array since measurement will overwrite:
         FFTW_Array<double> t_array = _array;
 
-        fftw_plan plan = fftw_plan_dft_r2c_2d(
-            _N,_N, t_array.get_fftw(), kt._array.get_fftw(), FFTW_ESTIMATE);
-        if (plan==NULL) throw FFTInvalid();
-        fftw_execute(plan);
-        fftw_destroy_plan(plan);
+        ExecuteFFT_R2C(_N, _N, t_array.get_fftw(), kt._array.get_fftw());
 
         // Now scale the k spectrum and flip signs for x=0 in middle.
         double fac = _dx * _dx;
@@ -1114,4 +1106,282 @@ namespace galsim {
     }
 
 
+    //
+    // The FFTW plan cache
+    //
+
+    namespace {
+
+        enum FFTKind { FFT_R2C, FFT_C2R, FFT_C2C_FORWARD, FFT_C2C_BACKWARD,
+                       FFT_R2C_FLOAT, FFT_C2R_FLOAT };
+
+        // Everything about a transform that determines whether a plan can be used for it.
+        struct PlanKey
+        {
+            PlanKey(FFTKind kind_, int Ny_, int Nx_, int flags_, const void* in, const void* out) :
+                kind(kind_), Ny(Ny_), Nx(Nx_), flags(flags_), inplace(in == out),
+                in_align(fftw_alignment_of((double*)in)),
+                out_align(fftw_alignment_of((double*)out))
+            {}
+
+            bool operator<(const PlanKey& rhs) const
+            {
+                if (kind != rhs.kind) return kind < rhs.kind;
+                if (Ny != rhs.Ny) return Ny < rhs.Ny;
+                if (Nx != rhs.Nx) return Nx < rhs.Nx;
+                if (flags != rhs.flags) return flags < rhs.flags;
+                if (inplace != rhs.inplace) return inplace < rhs.inplace;
+                if (in_align != rhs.in_align) return in_align < rhs.in_align;
+                return out_align < rhs.out_align;
+            }
+
+            FFTKind kind;
+            int Ny, Nx;
+            int flags;
+            bool inplace;
+            int in_align, out_align;
+        };
+
+        // A scratch array to use for planning with the same SIMD alignment as a given array.
+        // (FFTW only allows a plan to be executed on arrays with the same alignment as the
+        // ones it was made with.)
+        class ScratchArray
+        {
+        public:
+            ScratchArray(size_t nbytes, const void* p)
+            {
+                // fftw_malloc returns memory with the maximum alignment, so adding the
+                // alignment of p gives us the same alignment as p.
+                _mem = fftw_malloc(nbytes + 64);
+                if (!_mem) throw std::bad_alloc();
+                _p = static_cast<char*>(_mem) + fftw_alignment_of((double*)p);
+            }
+            ~ScratchArray() { fftw_free(_mem); }
+            double* real() { return reinterpret_cast<double*>(_p); }
+            fftw_complex* cplx() { return reinterpret_cast<fftw_complex*>(_p); }
+            float* realf() { return reinterpret_cast<float*>(_p); }
+            fftwf_complex* cplxf() { return reinterpret_cast<fftwf_complex*>(_p); }
+
+        private:
+            void* _mem;
+            char* _p;
+        };
+
+        // The FFTW planner functions are not thread safe, so everything here other than
+        // running the plans is protected by this mutex.
+        Mutex plan_mutex;
+        std::map<PlanKey, fftw_plan> plan_cache;
+        int plan_mode = 0;
+
+        int PlanFlags()
+        {
+            if (plan_mode == 2) return FFTW_PATIENT;
+            else if (plan_mode == 1) return FFTW_MEASURE;
+            else return FFTW_ESTIMATE;
+        }
+
+        fftw_plan GetPlan(FFTKind kind, int Ny, int Nx, const void* in, const void* out)
+        {
+            MutexLock lock(plan_mutex);
+            PlanKey key(kind, Ny, Nx, PlanFlags(), in, out);
+            std::map<PlanKey, fftw_plan>::iterator it = plan_cache.find(key);
+            if (it != plan_cache.end()) return it->second;
+
+            dbg<<"Make new fftw plan: kind = "<<kind<<", N = "<<Ny<<','<<Nx<<
+                ", flags = "<<key.flags<<", inplace = "<<key.inplace<<std::endl;
+            // The size of the complex half of a real transform.
+            const size_t nhalf = size_t(Ny) * (Nx/2+1) * sizeof(fftw_complex);
+            const size_t nreal = size_t(Ny) * Nx * sizeof(double);
+            const size_t ncplx = size_t(Ny) * Nx * sizeof(fftw_complex);
+            const int sign = (kind == FFT_C2C_FORWARD) ? FFTW_FORWARD : FFTW_BACKWARD;
+            fftw_plan plan;
+            if (key.inplace) {
+                ScratchArray a((kind == FFT_R2C || kind == FFT_C2R) ? nhalf : ncplx, in);
+                if (kind == FFT_R2C)
+                    plan = fftw_plan_dft_r2c_2d(Ny, Nx, a.real(), a.cplx(), key.flags);
+                else if (kind == FFT_C2R)
+                    plan = fftw_plan_dft_c2r_2d(Ny, Nx, a.cplx(), a.real(), key.flags);
+                else
+                    plan = fftw_plan_dft_2d(Ny, Nx, a.cplx(), a.cplx(), sign, key.flags);
+            } else if (kind == FFT_R2C) {
+                ScratchArray a(nreal, in);
+                ScratchArray b(nhalf, out);
+                plan = fftw_plan_dft_r2c_2d(Ny, Nx, a.real(), b.cplx(), key.flags);
+            } else if (kind == FFT_C2R) {
+                ScratchArray a(nhalf, in);
+                ScratchArray b(nreal, out);
+                plan = fftw_plan_dft_c2r_2d(Ny, Nx, a.cplx(), b.real(), key.flags);
+            } else {
+                ScratchArray a(ncplx, in);
+                ScratchArray b(ncplx, out);
+                plan = fftw_plan_dft_2d(Ny, Nx, a.cplx(), b.cplx(), sign, key.flags);
+            }
+            if (plan==NULL) throw FFTInvalid();
+            plan_cache[key] = plan;
+            return plan;
+        }
+
+#ifdef USE_FFTWF
+        // The single precision plans are a different type, so they get their own cache.
+        std::map<PlanKey, fftwf_plan> fplan_cache;
+
+        fftwf_plan GetPlanF(FFTKind kind, int Ny, int Nx, const void* in, const void* out)
+        {
+            MutexLock lock(plan_mutex);
+            PlanKey key(kind, Ny, Nx, PlanFlags(), in, out);
+            std::map<PlanKey, fftwf_plan>::iterator it = fplan_cache.find(key);
+            if (it != fplan_cache.end()) return it->second;
+
+            dbg<<"Make new fftwf plan: kind = "<<kind<<", N = "<<Ny<<','<<Nx<<
+                ", flags = "<<key.flags<<", inplace = "<<key.inplace<<std::endl;
+            const size_t nhalf = size_t(Ny) * (Nx/2+1) * sizeof(fftwf_complex);
+            const size_t nreal = size_t(Ny) * Nx * sizeof(float);
+            fftwf_plan plan;
+            if (key.inplace) {
+                ScratchArray a(nhalf, in);
+                if (kind == FFT_R2C_FLOAT)
+                    plan = fftwf_plan_dft_r2c_2d(Ny, Nx, a.realf(), a.cplxf(), key.flags);
+                else
+                    plan = fftwf_plan_dft_c2r_2d(Ny, Nx, a.cplxf(), a.realf(), key.flags);
+            } else if (kind == FFT_R2C_FLOAT) {
+                ScratchArray a(nreal, in);
+                ScratchArray b(nhalf, out);
+                plan = fftwf_plan_dft_r2c_2d(Ny, Nx, a.realf(), b.cplxf(), key.flags);
+            } else {
+                ScratchArray a(nhalf, in);
+                ScratchArray b(nreal, out);
+                plan = fftwf_plan_dft_c2r_2d(Ny, Nx, a.cplxf(), b.realf(), key.flags);
+            }
+            if (plan==NULL) throw FFTInvalid();
+            fplan_cache[key] = plan;
+            return plan;
+        }
+#endif
+
+    }
+
+    void SetFFTPlanMode(int mode)
+    {
+        if (mode < 0 || mode > 2) throw FFTError("Invalid fft plan mode");
+        MutexLock lock(plan_mutex);
+        plan_mode = mode;
+    }
+
+    int GetFFTPlanMode()
+    {
+        MutexLock lock(plan_mutex);
+        return plan_mode;
+    }
+
+    void ClearFFTPlans()
+    {
+        MutexLock lock(plan_mutex);
+        for (std::map<PlanKey, fftw_plan>::iterator it = plan_cache.begin();
+             it != plan_cache.end(); ++it) {
+            fftw_destroy_plan(it->second);
+        }
+        plan_cache.clear();
+#ifdef USE_FFTWF
+        for (std::map<PlanKey, fftwf_plan>::iterator it = fplan_cache.begin();
+             it != fplan_cache.end(); ++it) {
+            fftwf_destroy_plan(it->second);
+        }
+        fplan_cache.clear();
+#endif
+    }
+
+    int GetNFFTPlans()
+    {
+        MutexLock lock(plan_mutex);
+#ifdef USE_FFTWF
+        return int(plan_cache.size() + fplan_cache.size());
+#else
+        return int(plan_cache.size());
+#endif
+    }
+
+    bool ImportFFTWisdom(const std::string& file_name)
+    {
+        MutexLock lock(plan_mutex);
+        return fftw_import_wisdom_from_filename(file_name.c_str()) != 0;
+    }
+
+    bool ExportFFTWisdom(const std::string& file_name)
+    {
+        MutexLock lock(plan_mutex);
+        return fftw_export_wisdom_to_filename(file_name.c_str()) != 0;
+    }
+
+    // Note: the new-array execute functions are thread safe, so these don't need the lock.
+    void ExecuteFFT_R2C(int Ny, int Nx, double* in, fftw_complex* out)
+    {
+        fftw_plan plan = GetPlan(FFT_R2C, Ny, Nx, in, out);
+        fftw_execute_dft_r2c(plan, in, out);
+    }
+
+    void ExecuteFFT_C2R(int Ny, int Nx, fftw_complex* in, double* out)
+    {
+        fftw_plan plan = GetPlan(FFT_C2R, Ny, Nx, in, out);
+        fftw_execute_dft_c2r(plan, in, out);
+    }
+
+    void ExecuteFFT_C2C(int Ny, int Nx, fftw_complex* in, fftw_complex* out, int sign)
+    {
+        FFTKind kind = (sign == FFTW_FORWARD) ? FFT_C2C_FORWARD : FFT_C2C_BACKWARD;
+        fftw_plan plan = GetPlan(kind, Ny, Nx, in, out);
+        fftw_execute_dft(plan, in, out);
+    }
+
+    bool HasSinglePrecisionFFT()
+    {
+#ifdef USE_FFTWF
+        return true;
+#else
+        return false;
+#endif
+    }
+
+#ifdef USE_FFTWF
+    void ExecuteFFT_R2C(int Ny, int Nx, float* in, fftwf_complex* out)
+    {
+        fftwf_plan plan = GetPlanF(FFT_R2C_FLOAT, Ny, Nx, in, out);
+        fftwf_execute_dft_r2c(plan, in, out);
+    }
+
+    void ExecuteFFT_C2R(int Ny, int Nx, fftwf_complex* in, float* out)
+    {
+        fftwf_plan plan = GetPlanF(FFT_C2R_FLOAT, Ny, Nx, in, out);
+        fftwf_execute_dft_c2r(plan, in, out);
+    }
+#else
+    // Without fftw3f, copy to double arrays and back.  Note that for an in-place transform,
+    // each row of the real array is padded to 2*(Nx/2+1) elements.
+    void ExecuteFFT_R2C(int Ny, int Nx, float* in, fftwf_complex* out)
+    {
+        const int Nxo2p1 = Nx/2+1;
+        const int instride = ((void*)in == (void*)out) ? 2*Nxo2p1 : Nx;
+        std::vector<double> xd(size_t(Ny)*Nx);
+        std::vector<std::complex<double> > kd(size_t(Ny)*Nxo2p1);
+        for (int j=0; j<Ny; ++j)
+            for (int i=0; i<Nx; ++i) xd[size_t(j)*Nx+i] = in[size_t(j)*instride+i];
+        ExecuteFFT_R2C(Ny, Nx, &xd[0], reinterpret_cast<fftw_complex*>(&kd[0]));
+        for (size_t k=0; k<kd.size(); ++k) {
+            out[k][0] = float(kd[k].real());
+            out[k][1] = float(kd[k].imag());
+        }
+    }
+
+    void ExecuteFFT_C2R(int Ny, int Nx, fftwf_complex* in, float* out)
+    {
+        const int Nxo2p1 = Nx/2+1;
+        const int outstride = ((void*)in == (void*)out) ? 2*Nxo2p1 : Nx;
+        std::vector<std::complex<double> > kd(size_t(Ny)*Nxo2p1);
+        std::vector<double> xd(size_t(Ny)*Nx);
+        for (size_t k=0; k<kd.size(); ++k) kd[k] = std::complex<double>(in[k][0], in[k][1]);
+        ExecuteFFT_C2R(Ny, Nx, reinterpret_cast<fftw_complex*>(&kd[0]), &xd[0]);
+        for (int j=0; j<Ny; ++j)
+            for (int i=0; i<Nx; ++i) out[size_t(j)*outstride+i] = float(xd[size_t(j)*Nx+i]);
+    }
+#endif
+
 }
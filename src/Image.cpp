@@ -28,6 +28,7 @@
 
 #include "Image.h"
 #include "ImageArith.h"
+#include "FFTPlan.h"
 
 namespace galsim {
 
@@ -731,10 +732,7 @@ ImageView<std::complex<double> > BaseImage<T>::fft(bool shift_in, bool shift_out
     fftw_complex* kdata = reinterpret_cast<fftw_complex*>(kim.getData());
     double* xdata = reinterpret_cast<double*>(kim.getData());
 
-    fftw_plan plan = fftw_plan_dft_r2c_2d(Ny, Nx, xdata, kdata, FFTW_ESTIMATE);
-    if (plan==NULL) throw std::runtime_error("fftw_plan cannot be created");
-    fftw_execute(plan);
-    fftw_destroy_plan(plan);
+    ExecuteFFT_R2C(Ny, Nx, xdata, kdata);
 
     // The resulting image will still have a checkerboard pattern of +-1 on it, which
     // we want to remove.
@@ -751,25 +749,38 @@ ImageView<std::complex<double> > BaseImage<T>::fft(bool shift_in, bool shift_out
     return kim.view();
 }
 
-template <typename T>
-ImageView<double> BaseImage<T>::inverse_fft(bool shift_in, bool shift_out) const
+// The fftw complex type with a given precision.
+template <typename U>
+struct FFTWComplex { typedef fftw_complex type; };
+template <>
+struct FFTWComplex<float> { typedef fftwf_complex type; };
+
+// The implementation of inverse_fft and inverse_fft_float.
+// U is the precision to use for the FFT: double or float.
+template <typename U, typename T>
+static ImageView<U> DoInverseFFT(const BaseImage<T>& im, bool shift_in, bool shift_out)
 {
     dbg<<"Start BaseImage::inverse_fft\n";
-    dbg<<"self bounds = "<<this->_bounds<<std::endl;
+    dbg<<"self bounds = "<<im.getBounds()<<std::endl;
 
-    if (!_data or !this->_bounds.isDefined())
+    const T* data = im.getData();
+    const Bounds<int>& bounds = im.getBounds();
+    const int stride = im.getStride();
+    const int step = im.getStep();
+
+    if (!data or !bounds.isDefined())
         throw ImageError("Attempting to perform inverse fft on undefined image.");
 
-    if (this->_bounds.getXMin() != 0)
+    if (bounds.getXMin() != 0)
         throw ImageError("inverse_fft requires bounds to be (0, Nx/2, -Ny/2, Ny/2-1)");
 
-    const int Nxo2 = this->_bounds.getXMax();
-    const int Nyo2 = this->_bounds.getYMax()+1;
+    const int Nxo2 = bounds.getXMax();
+    const int Nyo2 = bounds.getYMax()+1;
     const int Nx = Nxo2 << 1;
     const int Ny = Nyo2 << 1;
     dbg<<"Nx,Ny = "<<Nx<<','<<Ny<<std::endl;
 
-    if (this->_bounds.getYMin() != -Nyo2)
+    if (bounds.getYMin() != -Nyo2)
         throw ImageError("inverse_fft requires bounds to be (0, N/2, -N/2, N/2-1)");
 
     // ImageAlloc's memory allocation is aligned on 16 byte boundaries, which means we can
@@ -780,73 +791,79 @@ ImageView<double> BaseImage<T>::inverse_fft(bool shift_in, bool shift_out) const
     // (x in our case) to allow for the extra column in the k array.
     // cf. http://www.fftw.org/doc/Real_002ddata-DFT-Array-Format.html
     // The bounds we care about are (-Nxo2, Nxo2-1, -Nyo2, Nyo2-1).
-    ImageAlloc<double> xim(Bounds<int>(-Nxo2, Nxo2+1, -Nyo2, Nyo2-1));
+    ImageAlloc<U> xim(Bounds<int>(-Nxo2, Nxo2+1, -Nyo2, Nyo2-1));
 
-    std::complex<double>* kptr = reinterpret_cast<std::complex<double>*>(xim.getData());
+    std::complex<U>* kptr = reinterpret_cast<std::complex<U>*>(xim.getData());
 
     // FFTW wants the locations of the + and - ky values swapped relative to how
     // we store it in an image.
     // Also, to put x=0 in center of array, we need to flop the sign of every other element
     // and need to scale by (1/N)^2.
-    double fac = 1./(Nx*Ny);
+    U fac = U(1.)/(Nx*Ny);
 
-    const int start_offset = shift_in ? Nyo2 * _stride : 0;
-    const int mid_offset = shift_in ? 0 : Nyo2 * _stride;
+    const int start_offset = shift_in ? Nyo2 * stride : 0;
+    const int mid_offset = shift_in ? 0 : Nyo2 * stride;
 
-    const int skip = this->getNSkip();
+    const int skip = im.getNSkip();
     if (shift_out) {
-        const T* ptr = _data + start_offset;
+        const T* ptr = data + start_offset;
         const bool extra_flip = (Nxo2 % 2 == 1);
-        if (_step == 1) {
+        if (step == 1) {
             for (int j=Nyo2; j; --j, ptr+=skip, fac=(extra_flip?-fac:fac))
                 for (int i=Nxo2+1; i; --i, fac=-fac)
-                    *kptr++ = fac * *ptr++;
-            ptr = _data + mid_offset;
+                    *kptr++ = fac * std::complex<U>(*ptr++);
+            ptr = data + mid_offset;
             for (int j=Nyo2; j; --j, ptr+=skip, fac=(extra_flip?-fac:fac))
                 for (int i=Nxo2+1; i; --i, fac=-fac)
-                    *kptr++ = fac * *ptr++;
+                    *kptr++ = fac * std::complex<U>(*ptr++);
         } else {
             for (int j=Nyo2; j; --j, ptr+=skip, fac=(extra_flip?-fac:fac))
-                for (int i=Nxo2+1; i; --i, ptr+=_step, fac=-fac)
-                    *kptr++ = fac * *ptr;
-            ptr = _data + mid_offset;
+                for (int i=Nxo2+1; i; --i, ptr+=step, fac=-fac)
+                    *kptr++ = fac * std::complex<U>(*ptr);
+            ptr = data + mid_offset;
             for (int j=Nyo2; j; --j, ptr+=skip, fac=(extra_flip?-fac:fac))
-                for (int i=Nxo2+1; i; --i, ptr+=_step, fac=-fac)
-                    *kptr++ = fac * *ptr;
+                for (int i=Nxo2+1; i; --i, ptr+=step, fac=-fac)
+                    *kptr++ = fac * std::complex<U>(*ptr);
         }
     } else {
-        const T* ptr = _data + start_offset;
-        if (_step == 1) {
+        const T* ptr = data + start_offset;
+        if (step == 1) {
             for (int j=Nyo2; j; --j, ptr+=skip)
                 for (int i=Nxo2+1; i; --i)
-                    *kptr++ = fac * *ptr++;
-            ptr = _data + mid_offset;
+                    *kptr++ = fac * std::complex<U>(*ptr++);
+            ptr = data + mid_offset;
             for (int j=Nyo2; j; --j, ptr+=skip)
                 for (int i=Nxo2+1; i; --i)
-                    *kptr++ = fac * *ptr++;
+                    *kptr++ = fac * std::complex<U>(*ptr++);
         } else {
             for (int j=Nyo2; j; --j, ptr+=skip)
-                for (int i=Nxo2+1; i; --i, ptr+=_step)
-                    *kptr++ = fac * *ptr;
-            ptr = _data + mid_offset;
+                for (int i=Nxo2+1; i; --i, ptr+=step)
+                    *kptr++ = fac * std::complex<U>(*ptr);
+            ptr = data + mid_offset;
             for (int j=Nyo2; j; --j, ptr+=skip)
-                for (int i=Nxo2+1; i; --i, ptr+=_step)
-                    *kptr++ = fac * *ptr;
+                for (int i=Nxo2+1; i; --i, ptr+=step)
+                    *kptr++ = fac * std::complex<U>(*ptr);
         }
     }
 
-    double* xdata = xim.getData();
-    fftw_complex* kdata = reinterpret_cast<fftw_complex*>(xdata);
+    U* xdata = xim.getData();
+    typedef typename FFTWComplex<U>::type fftw_complex_type;
+    fftw_complex_type* kdata = reinterpret_cast<fftw_complex_type*>(xdata);
 
-    fftw_plan plan = fftw_plan_dft_c2r_2d(Ny, Nx, kdata, xdata, FFTW_ESTIMATE);
-    if (plan==NULL) throw std::runtime_error("fftw_plan cannot be created");
-    fftw_execute(plan);
-    fftw_destroy_plan(plan);
+    ExecuteFFT_C2R(Ny, Nx, kdata, xdata);
 
     // Now simply return a view of this image.
     return xim.subImage(Bounds<int>(-Nxo2, Nxo2-1, -Nyo2, Nyo2-1));
 }
 
+template <typename T>
+ImageView<double> BaseImage<T>::inverse_fft(bool shift_in, bool shift_out) const
+{ return DoInverseFFT<double>(*this, shift_in, shift_out); }
+
+template <typename T>
+ImageView<float> BaseImage<T>::inverse_fft_float(bool shift_in, bool shift_out) const
+{ return DoInverseFFT<float>(*this, shift_in, shift_out); }
+
 template <typename T>
 ImageView<std::complex<double> > BaseImage<T>::cfft(bool inverse, bool shift_in, bool shift_out) const
 {
@@ -907,11 +924,7 @@ ImageView<std::complex<double> > BaseImage<T>::cfft(bool inverse, bool shift_in,
 
     fftw_complex* kdata = reinterpret_cast<fftw_complex*>(kim.getData());
 
-    fftw_plan plan = fftw_plan_dft_2d(Ny, Nx, kdata, kdata, inverse ? FFTW_BACKWARD : FFTW_FORWARD,
-                                      FFTW_ESTIMATE);
-    if (plan==NULL) throw std::runtime_error("fftw_plan cannot be created");
-    fftw_execute(plan);
-    fftw_destroy_plan(plan);
+    ExecuteFFT_C2C(Ny, Nx, kdata, kdata, inverse ? FFTW_BACKWARD : FFTW_FORWARD);
 
     if (shift_in) {
         kptr = kim.getData();
@@ -125,6 +125,31 @@ namespace galsim {
         return kv;
     }
 
+    void SBAdd::SBAddImpl::xValues(int n, const double* x, const double* y, double* val) const
+    {
+        ConstIter pptr = _plist.begin();
+        assert(pptr != _plist.end());
+        pptr->xValues(n,x,y,val);
+        std::vector<double> temp(n);
+        for (++pptr; pptr != _plist.end(); ++pptr) {
+            pptr->xValues(n,x,y,&temp[0]);
+            for (int i=0; i<n; ++i) val[i] += temp[i];
+        }
+    }
+
+    void SBAdd::SBAddImpl::kValues(int n, const double* kx, const double* ky,
+                                   std::complex<double>* val) const
+    {
+        ConstIter pptr = _plist.begin();
+        assert(pptr != _plist.end());
+        pptr->kValues(n,kx,ky,val);
+        std::vector<std::complex<double> > temp(n);
+        for (++pptr; pptr != _plist.end(); ++pptr) {
+            pptr->kValues(n,kx,ky,&temp[0]);
+            for (int i=0; i<n; ++i) val[i] += temp[i];
+        }
+    }
+
     template <typename T>
     void SBAdd::SBAddImpl::fillXImage(ImageView<T> im,
                                       double x0, double dx, int izero,
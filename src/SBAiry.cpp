@@ -390,7 +390,10 @@ namespace galsim {
 
     void AiryInfoObs::checkSampler() const
     {
-        if (this->_sampler.get()) return;
+        if (this->_sampler_built.isSet()) return;
+        MutexLock lock(this->_mutex);
+        // Check again, in case another thread built it while we were waiting for the lock.
+        if (this->_sampler_built.isSet()) return;
         dbg<<"Airy sampler\n";
         dbg<<"obsc = "<<_obscuration<<std::endl;
         std::vector<double> ranges(1,0.);
@@ -405,6 +408,7 @@ namespace galsim {
         ranges.reserve(int((rmax-rmin+2)/0.5+0.5));
         for(double r=rmin; r<=rmax; r+=0.5) ranges.push_back(r);
         this->_sampler.reset(new OneDimensionalDeviate(_radial, ranges, true, _gsparams));
+        this->_sampler_built.set();
     }
 
     // Now the specializations for when obs = 0
@@ -466,7 +470,10 @@ namespace galsim {
 
     void AiryInfoNoObs::checkSampler() const
     {
-        if (this->_sampler.get()) return;
+        if (this->_sampler_built.isSet()) return;
+        MutexLock lock(this->_mutex);
+        // Check again, in case another thread built it while we were waiting for the lock.
+        if (this->_sampler_built.isSet()) return;
         dbg<<"AiryNoObs sampler\n";
         std::vector<double> ranges(1,0.);
         double rmin = 1.1;
@@ -477,5 +484,6 @@ namespace galsim {
         ranges.reserve(int((rmax-rmin+2)/0.5+0.5));
         for(double r=rmin; r<=rmax; r+=0.5) ranges.push_back(r);
         this->_sampler.reset(new OneDimensionalDeviate(_radial, ranges, true, _gsparams));
+        this->_sampler_built.set();
     }
 }
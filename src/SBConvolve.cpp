@@ -19,12 +19,135 @@
 
 //#define DEBUGLOGGING
 
+#include <list>
+#include <algorithm>
 #include "SBConvolve.h"
 #include "SBConvolveImpl.h"
 #include "SBTransform.h"
+#include "Mutex.h"
 
 namespace galsim {
 
+    // A cache of the k-space images of the components of convolutions.
+    //
+    // When many objects are convolved by the same PSF, each convolution would otherwise fill the
+    // same k-space image of the PSF again.  So once a component has been seen in more than one
+    // convolution, we keep its k-space images for reuse.  The key is the identity of the
+    // component (i.e. its impl pointer), along with the bounds of the image and the k-space grid.
+    // Each entry holds a copy of the component, so its impl stays alive (and its pointer can't
+    // be reused by another profile) while it is in the cache.
+    namespace {
+
+        struct KImageKey
+        {
+            KImageKey(const void* _id, const Bounds<int>& _b, bool _sheared,
+                      double _kx0, double _dkx, double _a, double _ky0, double _dky, double _b2) :
+                id(_id), b(_b), sheared(_sheared),
+                kx0(_kx0), dkx(_dkx), a(_a), ky0(_ky0), dky(_dky), b2(_b2) {}
+
+            bool operator==(const KImageKey& rhs) const
+            {
+                return (id == rhs.id && b == rhs.b && sheared == rhs.sheared &&
+                        kx0 == rhs.kx0 && dkx == rhs.dkx && a == rhs.a &&
+                        ky0 == rhs.ky0 && dky == rhs.dky && b2 == rhs.b2);
+            }
+
+            const void* id;
+            Bounds<int> b;
+            // For the unsheared fill, a,b2 are izero,jzero.  For the sheared one, dkxy,dkyx.
+            bool sheared;
+            double kx0, dkx, a, ky0, dky, b2;
+        };
+
+        template <typename T>
+        struct KImageEntry
+        {
+            KImageEntry(const KImageKey& _key, const SBProfile& _prof,
+                        const BaseImage<std::complex<T> >& im) :
+                key(_key), prof(_prof), kimage(new ImageAlloc<std::complex<T> >(im)) {}
+
+            KImageKey key;
+            SBProfile prof;
+            boost::shared_ptr<ImageAlloc<std::complex<T> > > kimage;
+        };
+
+        template <typename T>
+        struct KImageCache
+        {
+            static std::list<KImageEntry<T> > entries;
+        };
+        template <typename T>
+        std::list<KImageEntry<T> > KImageCache<T>::entries;
+
+        Mutex kimage_mutex;
+        int kimage_cache_size = 8;
+
+        // The components seen in recent convolutions.  Only these are cached.
+        std::list<const void*> recent_ids;
+        const size_t max_recent_ids = 16;
+
+        // Don't keep images larger than this.  (4 MB for complex<double>)
+        const int max_kimage_area = 1<<18;
+
+        // If the k-space image for key is in the cache, either copy it to im or multiply im by
+        // it, and return true.  Otherwise return false.
+        template <typename T>
+        bool UseCachedKImage(const KImageKey& key, ImageView<std::complex<T> > im, bool multiply)
+        {
+            boost::shared_ptr<ImageAlloc<std::complex<T> > > kimage;
+            {
+                MutexLock lock(kimage_mutex);
+                std::list<KImageEntry<T> >& entries = KImageCache<T>::entries;
+                typename std::list<KImageEntry<T> >::iterator it = entries.begin();
+                for (; it != entries.end(); ++it) if (it->key == key) break;
+                if (it == entries.end()) return false;
+                // Move to the front to mark it as the most recently used.
+                entries.splice(entries.begin(), entries, it);
+                kimage = it->kimage;
+            }
+            dbg<<"Using cached k-space image for component "<<key.id<<std::endl;
+            if (multiply) im *= *kimage;
+            else im.copyFrom(*kimage);
+            return true;
+        }
+
+        // Save the k-space image for key if the component has been seen before.
+        template <typename T>
+        void SaveKImage(const KImageKey& key, const SBProfile& prof,
+                        const BaseImage<std::complex<T> >& im)
+        {
+            MutexLock lock(kimage_mutex);
+            if (kimage_cache_size <= 0 || im.getBounds().area() > max_kimage_area) return;
+            std::list<const void*>::iterator it =
+                std::find(recent_ids.begin(), recent_ids.end(), key.id);
+            if (it == recent_ids.end()) {
+                recent_ids.push_front(key.id);
+                if (recent_ids.size() > max_recent_ids) recent_ids.pop_back();
+                return;
+            }
+            recent_ids.splice(recent_ids.begin(), recent_ids, it);
+            std::list<KImageEntry<T> >& entries = KImageCache<T>::entries;
+            entries.push_front(KImageEntry<T>(key, prof, im));
+            while (int(entries.size()) > kimage_cache_size) entries.pop_back();
+        }
+    }
+
+    void SBConvolve::SetKImageCacheSize(int maxsize)
+    {
+        MutexLock lock(kimage_mutex);
+        kimage_cache_size = maxsize;
+        while (int(KImageCache<float>::entries.size()) > std::max(maxsize,0))
+            KImageCache<float>::entries.pop_back();
+        while (int(KImageCache<double>::entries.size()) > std::max(maxsize,0))
+            KImageCache<double>::entries.pop_back();
+    }
+
+    int SBConvolve::GetKImageCacheCount()
+    {
+        MutexLock lock(kimage_mutex);
+        return KImageCache<float>::entries.size() + KImageCache<double>::entries.size();
+    }
+
     SBConvolve::SBConvolve(const std::list<SBProfile>& plist, bool real_space,
                            const GSParamsPtr& gsparams) :
         SBProfile(new SBConvolveImpl(plist,real_space,gsparams)) {}
@@ -203,11 +326,18 @@ namespace galsim {
         dbg<<"ky = "<<ky0<<" + j * "<<dky<<", jzero = "<<jzero<<std::endl;
         ConstIter pptr = _plist.begin();
         assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillKImage(im,kx0,dkx,izero,ky0,dky,jzero);
+        KImageKey key(GetImpl(*pptr), im.getBounds(), false, kx0, dkx, izero, ky0, dky, jzero);
+        if (!UseCachedKImage(key, im, false)) {
+            GetImpl(*pptr)->fillKImage(im,kx0,dkx,izero,ky0,dky,jzero);
+            SaveKImage(key, *pptr, im);
+        }
         if (++pptr != _plist.end()) {
             ImageAlloc<std::complex<T> > im2(im.getBounds());
             for (; pptr != _plist.end(); ++pptr) {
+                key.id = GetImpl(*pptr);
+                if (UseCachedKImage(key, im, true)) continue;
                 GetImpl(*pptr)->fillKImage(im2.view(),kx0,dkx,izero,ky0,dky,jzero);
+                SaveKImage(key, *pptr, im2);
                 im *= im2;
             }
         }
@@ -223,11 +353,18 @@ namespace galsim {
         dbg<<"ky = "<<ky0<<" + i * "<<dkyx<<" + j * "<<dky<<std::endl;
         ConstIter pptr = _plist.begin();
         assert(pptr != _plist.end());
-        GetImpl(*pptr)->fillKImage(im,kx0,dkx,dkxy,ky0,dky,dkyx);
+        KImageKey key(GetImpl(*pptr), im.getBounds(), true, kx0, dkx, dkxy, ky0, dky, dkyx);
+        if (!UseCachedKImage(key, im, false)) {
+            GetImpl(*pptr)->fillKImage(im,kx0,dkx,dkxy,ky0,dky,dkyx);
+            SaveKImage(key, *pptr, im);
+        }
         if (++pptr != _plist.end()) {
             ImageAlloc<std::complex<T> > im2(im.getBounds());
             for (; pptr != _plist.end(); ++pptr) {
+                key.id = GetImpl(*pptr);
+                if (UseCachedKImage(key, im, true)) continue;
                 GetImpl(*pptr)->fillKImage(im2.view(),kx0,dkx,dkxy,ky0,dky,dkyx);
+                SaveKImage(key, *pptr, im2);
                 im *= im2;
             }
         }
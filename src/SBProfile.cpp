@@ -85,6 +85,19 @@ namespace galsim {
         return _pimpl->kValue(k);
     }
 
+    void SBProfile::xValues(int n, const double* x, const double* y, double* val) const
+    {
+        assert(_pimpl.get());
+        if (n > 0) _pimpl->xValues(n,x,y,val);
+    }
+
+    void SBProfile::kValues(int n, const double* kx, const double* ky,
+                            std::complex<double>* val) const
+    {
+        assert(_pimpl.get());
+        if (n > 0) _pimpl->kValues(n,kx,ky,val);
+    }
+
     void SBProfile::getXRange(double& xmin, double& xmax, std::vector<double>& splits) const
     {
         assert(_pimpl.get());
@@ -227,6 +240,20 @@ namespace galsim {
         return N;
     }
 
+    void SBProfile::SBProfileImpl::xValues(int n, const double* x, const double* y,
+                                           double* val) const
+    {
+        for (int i=0; i<n; ++i)
+            val[i] = xValue(Position<double>(x[i],y[i]));
+    }
+
+    void SBProfile::SBProfileImpl::kValues(int n, const double* kx, const double* ky,
+                                           std::complex<double>* val) const
+    {
+        for (int i=0; i<n; ++i)
+            val[i] = kValue(Position<double>(kx[i],ky[i]));
+    }
+
     // Most derived classes override these functions, since there are usually (at least minor)
     // efficiency gains from doing so.  But in some cases, these straightforward impleentations
     // are perfectly fine.
@@ -387,45 +387,54 @@ namespace galsim {
 
     double SersicInfo::stepK() const
     {
-        if (_stepk == 0.) {
-            // How far should the profile extend, if not truncated?
-            // Estimate number of effective radii needed to enclose (1-folding_threshold) of flux
-            double R = calculateMissingFluxRadius(_gsparams->folding_threshold);
-            if (_truncated && _trunc < R)  R = _trunc;
-            // Go to at least 5*re
-            R = std::max(R,_gsparams->stepk_minimum_hlr);
-            dbg<<"R => "<<R<<std::endl;
-            _stepk = M_PI / R;
-            dbg<<"stepk = "<<_stepk<<std::endl;
+        if (!_stepk_built.isSet()) {
+            MutexLock lock(_mutex);
+            if (!_stepk_built.isSet()) {
+                // How far should the profile extend, if not truncated?
+                // Estimate number of effective radii needed to enclose (1-folding_threshold)
+                // of flux
+                double R = calculateMissingFluxRadius(_gsparams->folding_threshold);
+                if (_truncated && _trunc < R)  R = _trunc;
+                // Go to at least 5*re
+                R = std::max(R,_gsparams->stepk_minimum_hlr);
+                dbg<<"R => "<<R<<std::endl;
+                _stepk = M_PI / R;
+                dbg<<"stepk = "<<_stepk<<std::endl;
+                _stepk_built.set();
+            }
         }
         return _stepk;
     }
 
     double SersicInfo::maxK() const
     {
-        if (_maxk == 0.) buildFT();
+        if (!_ft_built.isSet()) buildFT();
         return _maxk;
     }
 
     double SersicInfo::getHLR() const
     {
-        if (_re == 0.) calculateHLR();
+        if (!_hlr_built.isSet()) calculateHLR();
         return _re;
     }
 
     double SersicInfo::getFluxFraction() const
     {
-        if (_flux == 0.) {
-            // Calculate the flux of a truncated profile (relative to the integral for
-            // an untruncated profile).
-            if (_truncated) {
-                double z = fast_pow(_trunc, 1./_n);
-                // integrate from 0. to _trunc
-                double gamma2nz = boost::math::tgamma_lower(2.*_n, z);
-                _flux = gamma2nz / _gamma2n;  // _flux < 1
-                dbg << "Flux fraction = " << _flux << std::endl;
-            } else {
-                _flux = 1.;
+        if (!_flux_built.isSet()) {
+            MutexLock lock(_mutex);
+            if (!_flux_built.isSet()) {
+                // Calculate the flux of a truncated profile (relative to the integral for
+                // an untruncated profile).
+                if (_truncated) {
+                    double z = fast_pow(_trunc, 1./_n);
+                    // integrate from 0. to _trunc
+                    double gamma2nz = boost::math::tgamma_lower(2.*_n, z);
+                    _flux = gamma2nz / _gamma2n;  // _flux < 1
+                    dbg << "Flux fraction = " << _flux << std::endl;
+                } else {
+                    _flux = 1.;
+                }
+                _flux_built.set();
             }
         }
         return _flux;
@@ -443,7 +452,7 @@ namespace galsim {
     double SersicInfo::kValue(double ksq) const
     {
         assert(ksq >= 0.);
-        if (_ft.size() == 0) buildFT();
+        if (!_ft_built.isSet()) buildFT();
 
         if (ksq>=_ksq_max)
             return (_highk_a + _highk_b/sqrt(ksq))/ksq; // high-k asymptote
@@ -471,6 +480,11 @@ namespace galsim {
 
     void SersicInfo::buildFT() const
     {
+        // The SersicInfo objects are shared via the cache, so another thread may be building
+        // the table at the same time.  Only the first one to get the lock needs to do it.
+        MutexLock lock(_mutex);
+        if (_ft_built.isSet()) return;
+
         // The small-k expansion of the Hankel transform is (normalized to have flux=1):
         // 1 - Gamma(4n) / 4 Gamma(2n) + Gamma(6n) / 64 Gamma(2n) - Gamma(8n) / 2304 Gamma(2n)
         // from the series summation J_0(x) = Sum^inf_{m=0} (-1)^m (m!)^-2 (x/2)^2m
@@ -637,6 +651,11 @@ namespace galsim {
                 xdbg<<"maxk => "<<_maxk<<std::endl;
             }
         }
+        // Finish setting up the table here rather than on the first lookup, so that later
+        // lookups (which may be in several threads at once) only read it.  The args are
+        // equally spaced in log(k), so the lookups don't need to update the table's index hint.
+        _ft.prepare();
+        _ft_built.set();
     }
 
     // Function object for finding the r that encloses all except a particular flux fraction.
@@ -725,6 +744,9 @@ namespace galsim {
 
     void SersicInfo::calculateHLR() const
     {
+        MutexLock lock(_mutex);
+        if (_hlr_built.isSet()) return;
+
         dbg<<"Find HLR for (n,gamma2n) = ("<<_n<<","<<_gamma2n<<")"<<std::endl;
         // Find solution to gamma(2n,re^(1/n)) = gamma2n / 2
         // where gamma2n is the truncated gamma function Gamma(2n,trunc^(1/n))
@@ -753,6 +775,7 @@ namespace galsim {
         // re = b^n
         _re = std::pow(_b,_n);
         dbg<<"re is "<<_re<<std::endl;
+        _hlr_built.set();
     }
 
     // Function object for finding the r that encloses all except a particular flux fraction.
@@ -862,7 +885,18 @@ namespace galsim {
         dbg<<"SersicInfo shoot: N = "<<N<<std::endl;
         dbg<<"Target flux = 1.0\n";
 
-        if (!_sampler) {
+        checkSampler();
+        assert(_sampler.get());
+        boost::shared_ptr<PhotonArray> result = _sampler->shoot(N,ud);
+        dbg<<"SersicInfo Realized flux = "<<result->getTotalFlux()<<std::endl;
+        return result;
+    }
+
+    void SersicInfo::checkSampler() const
+    {
+        if (_sampler_built.isSet()) return;
+        MutexLock lock(_mutex);
+        if (!_sampler_built.isSet()) {
             // Set up the classes for photon shooting
             _radial.reset(new SersicRadialFunction(_invn));
             std::vector<double> range(2,0.);
@@ -870,12 +904,8 @@ namespace galsim {
             if (_truncated && _trunc < shoot_maxr) shoot_maxr = _trunc;
             range[1] = shoot_maxr;
             _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, _gsparams));
+            _sampler_built.set();
         }
-
-        assert(_sampler.get());
-        boost::shared_ptr<PhotonArray> result = _sampler->shoot(N,ud);
-        dbg<<"SersicInfo Realized flux = "<<result->getTotalFlux()<<std::endl;
-        return result;
     }
 
     boost::shared_ptr<PhotonArray> SBSersic::SBSersicImpl::shoot(int N, UniformDeviate ud) const
@@ -641,29 +641,43 @@ namespace galsim {
 
     double SpergelInfo::stepK() const
     {
-        if (_stepk == 0.) {
-            double R = calculateFluxRadius(1.0 - _gsparams->folding_threshold);
-            // Go to at least 5*re
-            R = std::max(R,_gsparams->stepk_minimum_hlr);
-            dbg<<"R => "<<R<<std::endl;
-            _stepk = M_PI / R;
-            dbg<<"stepk = "<<_stepk<<std::endl;
+        if (!_stepk_built.isSet()) {
+            MutexLock lock(_mutex);
+            if (!_stepk_built.isSet()) {
+                double R = calculateFluxRadius(1.0 - _gsparams->folding_threshold);
+                // Go to at least 5*re
+                R = std::max(R,_gsparams->stepk_minimum_hlr);
+                dbg<<"R => "<<R<<std::endl;
+                _stepk = M_PI / R;
+                dbg<<"stepk = "<<_stepk<<std::endl;
+                _stepk_built.set();
+            }
         }
         return _stepk;
     }
 
     double SpergelInfo::maxK() const
     {
-        if(_maxk == 0.) {
-            // Solving (1+k^2)^(-1-nu) = maxk_threshold for k
-            _maxk = std::sqrt(std::pow(_gsparams->maxk_threshold, -1./(1+_nu))-1.0);
+        if (!_maxk_built.isSet()) {
+            MutexLock lock(_mutex);
+            if (!_maxk_built.isSet()) {
+                // Solving (1+k^2)^(-1-nu) = maxk_threshold for k
+                _maxk = std::sqrt(std::pow(_gsparams->maxk_threshold, -1./(1+_nu))-1.0);
+                _maxk_built.set();
+            }
         }
         return _maxk;
     }
 
     double SpergelInfo::getHLR() const
     {
-        if (_re == 0.0) _re = calculateFluxRadius(0.5);
+        if (!_hlr_built.isSet()) {
+            MutexLock lock(_mutex);
+            if (!_hlr_built.isSet()) {
+                _re = calculateFluxRadius(0.5);
+                _hlr_built.set();
+            }
+        }
         return _re;
     }
 
@@ -717,7 +731,18 @@ namespace galsim {
         dbg<<"SpergelInfo shoot: N = "<<N<<std::endl;
         dbg<<"Target flux = 1.0\n";
 
-        if (!_sampler) {
+        checkSampler();
+        assert(_sampler.get());
+        boost::shared_ptr<PhotonArray> result = _sampler->shoot(N,ud);
+        dbg<<"SpergelInfo Realized flux = "<<result->getTotalFlux()<<std::endl;
+        return result;
+    }
+
+    void SpergelInfo::checkSampler() const
+    {
+        if (_sampler_built.isSet()) return;
+        MutexLock lock(_mutex);
+        if (!_sampler_built.isSet()) {
             // Set up the classes for photon shooting
             double shoot_rmax = calculateFluxRadius(1. - _gsparams->shoot_accuracy);
             if (_nu > 0.) {
@@ -750,12 +775,8 @@ namespace galsim {
                 _radial.reset(new SpergelNuNegativeRadialFunction(_nu, shoot_rmin, a, b));
                 _sampler.reset(new OneDimensionalDeviate( *_radial, range, true, _gsparams));
             }
+            _sampler_built.set();
         }
-
-        assert(_sampler.get());
-        boost::shared_ptr<PhotonArray> result = _sampler->shoot(N,ud);
-        dbg<<"SpergelInfo Realized flux = "<<result->getTotalFlux()<<std::endl;
-        return result;
     }
 
     boost::shared_ptr<PhotonArray> SBSpergel::SBSpergelImpl::shoot(int N, UniformDeviate ud) const
@@ -503,6 +503,41 @@ namespace galsim {
     std::complex<double> SBTransform::SBTransformImpl::kValue(const Position<double>& k) const
     { return _kValue(_adaptee,fwdT(k),_fluxScaling,k,_cen); }
 
+    // For lists of positions, transform all the positions first, so the adaptee can do its
+    // own calculation for the whole list at once.
+    void SBTransform::SBTransformImpl::xValues(int n, const double* x, const double* y,
+                                               double* val) const
+    {
+        std::vector<double> xa(n), ya(n);
+        for (int i=0; i<n; ++i) {
+            Position<double> p = inv(Position<double>(x[i],y[i])-_cen);
+            xa[i] = p.x;
+            ya[i] = p.y;
+        }
+        _adaptee.xValues(n,&xa[0],&ya[0],val);
+        for (int i=0; i<n; ++i) val[i] *= _ampScaling;
+    }
+
+    void SBTransform::SBTransformImpl::kValues(int n, const double* kx, const double* ky,
+                                               std::complex<double>* val) const
+    {
+        std::vector<double> kxa(n), kya(n);
+        for (int i=0; i<n; ++i) {
+            Position<double> k = fwdT(Position<double>(kx[i],ky[i]));
+            kxa[i] = k.x;
+            kya[i] = k.y;
+        }
+        _adaptee.kValues(n,&kxa[0],&kya[0],val);
+        if (_zeroCen) {
+            // Match kValue, which skips the flux scaling if it is within kvalue_accuracy of 1.
+            if (_kValueNoPhase != &SBTransform::SBTransformImpl::_kValueNoPhaseNoDet)
+                for (int i=0; i<n; ++i) val[i] *= _fluxScaling;
+        } else {
+            for (int i=0; i<n; ++i)
+                val[i] *= std::polar(_fluxScaling, -kx[i]*_cen.x-ky[i]*_cen.y);
+        }
+    }
+
     std::complex<double> SBTransform::SBTransformImpl::kValueNoPhase(
         const Position<double>& k) const
     { return _kValueNoPhase(_adaptee,fwdT(k),_fluxScaling,k,_cen); }
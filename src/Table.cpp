@@ -307,9 +307,35 @@ namespace galsim {
 
     template<class V, class A>
     Table2D<V,A>::Table2D(const A* _xargs, const A* _yargs, const V* _vals, int _Nx, int _Ny,
-        interpolant in) : iType(in), Nx(_Nx), Ny(_Ny),
+        interpolant in) : iType(in), Nx(_Nx), Ny(_Ny), nxv(_Nx), nyv(_Ny),
                           xargs(_xargs, _xargs+Nx), yargs(_yargs, _yargs+Ny),
-                          vals(_vals, _vals+Nx*Ny)
+                          storage(_vals, _vals+Nx*Ny), vals(&storage[0])
+    {
+        setInterpolant();
+    }
+
+    template<class V, class A>
+    Table2D<V,A>::Table2D(const A* _xargs, const A* _yargs, const V* _vals, int _Nx, int _Ny,
+        interpolant in, bool periodic, boost::shared_ptr<V> _owner) :
+        iType(in), Nx(_Nx), Ny(_Ny), nxv(periodic ? _Nx-1 : _Nx), nyv(periodic ? _Ny-1 : _Ny),
+        xargs(_xargs, _xargs+Nx), yargs(_yargs, _yargs+Ny), owner(_owner), vals(_vals)
+    {
+        if (!owner) {
+            storage.assign(_vals, _vals+nxv*nyv);
+            vals = &storage[0];
+        }
+        setInterpolant();
+    }
+
+    template<class V, class A>
+    Table2D<V,A>::Table2D(const Table2D<V,A>& rhs) :
+        iType(rhs.iType), Nx(rhs.Nx), Ny(rhs.Ny), nxv(rhs.nxv), nyv(rhs.nyv),
+        xargs(rhs.xargs), yargs(rhs.yargs), storage(rhs.storage), owner(rhs.owner),
+        vals(rhs.owner ? rhs.vals : &storage[0]), interpolate(rhs.interpolate)
+    {}
+
+    template<class V, class A>
+    void Table2D<V,A>::setInterpolant()
     {
         // Map specific interpolator to `interpolate`.
         switch (iType) {
@@ -330,6 +356,14 @@ namespace galsim {
         }
     }
 
+    template<class V, class A>
+    void Table2D<V,A>::getVals(V* out) const
+    {
+        for (int i=0; i<Nx; ++i)
+            for (int j=0; j<Ny; ++j)
+                *out++ = val(i,j);
+    }
+
     //lookup and interpolate function value.
     template<class V, class A>
     V Table2D<V,A>::lookup(const A x, const A y) const
@@ -382,10 +416,10 @@ namespace galsim {
         int j = yargs.upperIndex(y);
         A dx = xargs[i] - xargs[i-1];
         A dy = yargs[j] - yargs[j-1];
-        V f00 = vals[(i-1)*Ny+j-1];
-        V f01 = vals[(i-1)*Ny+j];
-        V f10 = vals[i*Ny+j-1];
-        V f11 = vals[i*Ny+j];
+        V f00 = val(i-1,j-1);
+        V f01 = val(i-1,j);
+        V f10 = val(i,j-1);
+        V f11 = val(i,j);
         A ax = (xargs[i] - x) / (xargs[i] - xargs[i-1]);
         A bx = 1.0 - ax;
         A ay = (yargs[j] - y) / (yargs[j] - yargs[j-1]);
@@ -412,10 +446,10 @@ namespace galsim {
         A ay = (yargs[j] - y) / (yargs[j] - yargs[j-1]);
         A by = 1.0 - ay;
 
-        return (vals[(i-1)*Ny+j-1] * ax * ay
-                + vals[i*Ny+j-1] * bx * ay
-                + vals[(i-1)*Ny+j] * ax * by
-                + vals[i*Ny+j] * bx * by);
+        return (val(i-1,j-1) * ax * ay
+                + val(i,j-1) * bx * ay
+                + val(i-1,j) * ax * by
+                + val(i,j) * bx * by);
     }
 
     template<class V, class A>
@@ -426,7 +460,7 @@ namespace galsim {
         // check to see if we should choose the opposite bound.
         if (x == xargs[i]) i++;
         if (y == yargs[j]) j++;
-        return vals[(i-1)*Ny+j-1];
+        return val(i-1,j-1);
     }
 
     template<class V, class A>
@@ -434,7 +468,7 @@ namespace galsim {
     {
         if (x == xargs[i-1]) i--;
         if (y == yargs[j-1]) j--;
-        return vals[i*Ny+j];
+        return val(i,j);
     }
 
     template<class V, class A>
@@ -442,7 +476,7 @@ namespace galsim {
     {
         if ((x - xargs[i-1]) < (xargs[i] - x)) i--;
         if ((y - yargs[j-1]) < (yargs[j] - y)) j--;
-        return vals[i*Ny+j];
+        return val(i,j);
     }
 
     template class Table2D<double,double>;
@@ -2527,6 +2527,53 @@ def test_ne():
     all_obj_diff(gals)
 
 
+@timer
+def test_xvalues():
+    """Test xValues and kValues for arrays of positions.
+    """
+    rng = np.random.RandomState(8675309)
+    x = rng.uniform(-3, 3, size=(7,5))
+    y = rng.uniform(-3, 3, size=(7,5))
+    kx = rng.uniform(-5, 5, size=50)
+    ky = rng.uniform(-5, 5, size=50)
+
+    im = galsim.Gaussian(sigma=1.2).drawImage(nx=32, ny=32, scale=0.3)
+    objs = [ galsim.Gaussian(sigma=1.3, flux=2.3),
+             galsim.Exponential(half_light_radius=0.8),
+             galsim.Sersic(n=2.5, half_light_radius=1.1),
+             galsim.Moffat(beta=2.5, fwhm=0.9, trunc=4.),
+             galsim.Airy(lam_over_diam=0.6, obscuration=0.2),
+             galsim.Kolmogorov(fwhm=0.7),
+             galsim.Spergel(nu=0.3, half_light_radius=1.),
+             galsim.Box(width=1.5, height=2.),
+             galsim.Exponential(scale_radius=0.7).shear(g1=0.2, g2=-0.1).shift(0.3,-0.4) * 3.,
+             galsim.Gaussian(sigma=1.) + galsim.Exponential(half_light_radius=1.5, flux=0.3),
+             galsim.InterpolatedImage(im),
+             galsim.InterpolatedImage(im).rotate(33 * galsim.degrees).dilate(1.2),
+           ]
+    for obj in objs:
+        xv = obj.xValues(x, y)
+        assert xv.shape == x.shape
+        np.testing.assert_array_equal(
+                xv, [ [ obj.xValue(xx,yy) for xx,yy in zip(xr,yr) ] for xr,yr in zip(x,y) ],
+                err_msg="xValues don't match xValue for %r"%obj)
+        kv = obj.kValues(kx, ky)
+        assert kv.shape == kx.shape
+        assert kv.dtype == complex
+        np.testing.assert_array_equal(
+                kv, [ obj.kValue(kxx,kyy) for kxx,kyy in zip(kx,ky) ],
+                err_msg="kValues don't match kValue for %r"%obj)
+
+    # Scalars, lists, and broadcasting work too.
+    obj = objs[0]
+    np.testing.assert_array_equal(obj.xValues(0.3, -0.2), obj.xValue(0.3, -0.2))
+    np.testing.assert_array_equal(obj.xValues([0.1, 0.2, 0.3], 0.5),
+                                  [ obj.xValue(xx, 0.5) for xx in [0.1, 0.2, 0.3] ])
+    np.testing.assert_array_equal(obj.kValues(x[::2,::2], y[::2,::2]),
+                                  obj.kValues(x[::2,::2].copy(), y[::2,::2].copy()))
+    assert obj.xValues([], []).shape == (0,)
+
+
 if __name__ == "__main__":
     test_gaussian()
     test_gaussian_properties()
@@ -2564,3 +2611,4 @@ if __name__ == "__main__":
     test_deltaFunction_flux_scaling()
     test_deltaFunction_convolution()
     test_ne()
+    test_xvalues()
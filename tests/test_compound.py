@@ -1182,6 +1182,47 @@ def test_compound_noise():
             err_msg = "Convolution of three objects did not correctly propagate noise varinace")
 
 
+@timer
+def test_convolve_kimage_cache():
+    """Test that a common PSF reuses its k-space image in several convolutions.
+    """
+    psf = galsim.Moffat(beta=2.5, fwhm=0.7).shear(e1=0.05, e2=-0.03)
+    gals = [ galsim.Exponential(half_light_radius=0.3 + 0.05*k).shear(g1=0.01*k, g2=0.1)
+             for k in range(5) ]
+
+    # Draw them all with and without the cache.  The results should be identical.
+    galsim.Convolution.resize_kimage_cache(0)
+    assert galsim._galsim.GetConvolveKImageCacheCount() == 0
+    ref_images = [ galsim.Convolve(gal, psf).drawImage(nx=32, ny=32, scale=0.2)
+                   for gal in gals ]
+    assert galsim._galsim.GetConvolveKImageCacheCount() == 0
+    galsim.Convolution.resize_kimage_cache(8)
+    images = [ galsim.Convolve(gal, psf).drawImage(nx=32, ny=32, scale=0.2) for gal in gals ]
+    assert galsim._galsim.GetConvolveKImageCacheCount() > 0
+    for im, ref in zip(images, ref_images):
+        np.testing.assert_array_equal(im.array, ref.array)
+
+    # An equal, but different, PSF object doesn't share the cached k-space image, but still
+    # gets the right answer.
+    psf2 = galsim.Moffat(beta=2.5, fwhm=0.7).shear(e1=0.05, e2=-0.03)
+    im = galsim.Convolve(gals[0], psf2).drawImage(nx=32, ny=32, scale=0.2)
+    np.testing.assert_array_equal(im.array, ref_images[0].array)
+
+    # ChromaticConvolutions at a fixed wavelength use the same monochromatic PSF each time.
+    sed = galsim.SED('1', 'nm', 'fphotons')
+    chrom_psf = galsim.ChromaticAtmosphere(galsim.Kolmogorov(fwhm=0.6), base_wavelength=500,
+                                           zenith_angle=20*galsim.degrees)
+    mono1 = galsim.Convolve(gals[0]*sed, chrom_psf).evaluateAtWavelength(600.)
+    mono2 = galsim.Convolve(gals[1]*sed, chrom_psf).evaluateAtWavelength(600.)
+    assert mono1.obj_list[1] is mono2.obj_list[1]
+    mono3 = galsim.Convolve(gals[1]*sed, chrom_psf).evaluateAtWavelength(700.)
+    assert mono3.obj_list[1] is not mono2.obj_list[1]
+    np.testing.assert_array_equal(
+            mono2.drawImage(nx=32, ny=32, scale=0.2).array,
+            galsim.Convolve(gals[1], chrom_psf.evaluateAtWavelength(600.)).drawImage(
+                nx=32, ny=32, scale=0.2).array)
+
+
 if __name__ == "__main__":
     test_convolve()
     test_convolve_flux_scaling()
@@ -1199,3 +1240,4 @@ if __name__ == "__main__":
     test_fourier_sqrt()
     test_sum_transform()
     test_compound_noise()
+    test_convolve_kimage_cache()
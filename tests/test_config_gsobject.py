@@ -1439,6 +1439,71 @@ def test_usertype():
     gsobject_compare(gal3a, gal3b, conv=psf)
 
 
+@timer
+def test_cache():
+    """Test that objects built with the same parameters are reused
+    """
+    config = {
+        'psf' : { 'type' : 'OpticalPSF', 'lam_over_diam' : 0.3, 'obscuration' : 0.2,
+                  'defocus' : { 'type' : 'List', 'items' : [ 0.1, 0.2 ] } },
+    }
+
+    psfs = []
+    for k in range(4):
+        config['obj_num'] = k
+        psf, safe = galsim.config.BuildGSObject(config, 'psf')
+        assert not safe
+        psfs.append(psf)
+    assert psfs[2] is psfs[0]
+    assert psfs[3] is psfs[1]
+    assert psfs[1] is not psfs[0]
+    assert psfs[0] == galsim.OpticalPSF(lam_over_diam=0.3, obscuration=0.2, defocus=0.1)
+    assert psfs[1] == galsim.OpticalPSF(lam_over_diam=0.3, obscuration=0.2, defocus=0.2)
+
+    # Different gsparams are a different object.
+    config['obj_num'] = 4
+    psf4 = galsim.config.BuildGSObject(config, 'psf', gsparams={'folding_threshold' : 1.e-3})[0]
+    assert psf4 is not psfs[0]
+    assert psf4 == galsim.OpticalPSF(lam_over_diam=0.3, obscuration=0.2, defocus=0.1,
+                                     gsparams=galsim.GSParams(folding_threshold=1.e-3))
+
+    # Simple types are cached too.
+    config['gal'] = { 'type' : 'Sersic', 'half_light_radius' : 1.3,
+                      'n' : { 'type' : 'Sequence', 'first' : 1, 'step' : 1, 'repeat' : 2,
+                              'nitems' : 2 } }
+    config['obj_num'] = 0
+    gal0 = galsim.config.BuildGSObject(config, 'gal')[0]
+    config['obj_num'] = 2
+    gal2 = galsim.config.BuildGSObject(config, 'gal')[0]
+    config['obj_num'] = 4
+    gal4 = galsim.config.BuildGSObject(config, 'gal')[0]
+    assert gal2 is not gal0
+    assert gal4 is gal0
+
+    # Other threads do not share the cached objects, since they may not be thread safe.
+    import threading
+    gals = []
+    def build_gal():
+        config1 = galsim.config.CopyConfig(config)
+        config1['obj_num'] = 0
+        gals.append(galsim.config.BuildGSObject(config1, 'gal')[0])
+    t = threading.Thread(target=build_gal)
+    t.start()
+    t.join()
+    assert gals[0] is not gal4
+    assert gals[0] == gal4
+
+    # The caching can be turned off.
+    galsim.config.SetGSObjectCacheSize(0)
+    try:
+        config['obj_num'] = 6
+        gal6 = galsim.config.BuildGSObject(config, 'gal')[0]
+        assert gal6 is not gal0
+        assert gal6 == gal0
+    finally:
+        galsim.config.SetGSObjectCacheSize(20)
+
+
 if __name__ == "__main__":
     test_gaussian()
     test_moffat()
@@ -1459,3 +1524,4 @@ if __name__ == "__main__":
     test_list()
     test_repeat()
     test_usertype()
+    test_cache()
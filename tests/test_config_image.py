@@ -1672,6 +1672,337 @@ def test_variable_cat_size():
     np.testing.assert_array_equal(cfg_images[1], ref_images[1])
 
 
+@timer
+def test_persistent_pool():
+    """Test using a persistent pool of worker processes for image.nproc > 1
+    """
+    config = {
+        'image' : {
+            'pixel_scale' : 0.3,
+            'size' : 32,
+            'random_seed' : 1234,
+            'nproc' : 2,
+            'persistent_pool' : True,
+        },
+        'gal' : {
+            'type' : 'Sersic',
+            'n' : { 'type' : 'Random', 'min' : 1, 'max' : 4 },
+            'half_light_radius' : 1.3,
+            'flux' : 100,
+        },
+        'psf' : {
+            'type' : 'Moffat',
+            'beta' : 3,
+            'fwhm' : 0.9,
+        },
+    }
+    nimages = 4
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['nproc']
+    images1 = galsim.config.BuildImages(nimages, config1)
+
+    config2 = galsim.config.CopyConfig(config)
+    images2 = galsim.config.BuildImages(nimages, config2)
+    pool = galsim.config.process._worker_pool
+    assert pool is not None
+    pids = [ p.pid for p in pool.p_list ]
+    for im1, im2 in zip(images1, images2):
+        np.testing.assert_array_equal(im2.array, im1.array)
+
+    # A second call reuses the same processes.
+    config3 = galsim.config.CopyConfig(config)
+    images3 = galsim.config.BuildImages(nimages, config3, image_num=nimages, obj_num=nimages)
+    assert galsim.config.process._worker_pool is pool
+    assert [ p.pid for p in pool.p_list ] == pids
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['nproc']
+    images1 = galsim.config.BuildImages(nimages, config1, image_num=nimages, obj_num=nimages)
+    for im1, im3 in zip(images1, images3):
+        np.testing.assert_array_equal(im3.array, im1.array)
+
+    # Asking for more processes than the pool has starts a new pool.
+    config4 = galsim.config.CopyConfig(config)
+    config4['image']['nproc'] = 3
+    images4 = galsim.config.BuildImages(nimages, config4)
+    assert galsim.config.process._worker_pool is not pool
+    assert galsim.config.process._worker_pool.nproc == 3
+    for im2, im4 in zip(images2, images4):
+        np.testing.assert_array_equal(im4.array, im2.array)
+
+    # Input objects are only sent to the workers the first time they are used.
+    config5 = galsim.config.CopyConfig(config4)
+    config5['input'] = { 'catalog' : { 'dir' : 'config_input', 'file_name' : 'catalog.txt' } }
+    config5['gal']['flux'] = { 'type' : 'Catalog', 'col' : 0 }
+    galsim.config.ProcessInput(config5)
+    cat = config5['input_objs']['catalog'][0]
+    images5 = galsim.config.BuildImages(nimages, config5)
+    pool = galsim.config.process._worker_pool
+    assert pool.sent_inputs['catalog'][0] is cat
+    images6 = galsim.config.BuildImages(nimages, config5, image_num=nimages, obj_num=nimages)
+    assert galsim.config.process._worker_pool is pool
+    assert pool.sent_inputs['catalog'][0] is cat
+    config1 = galsim.config.CopyConfig(config5)
+    del config1['image']['nproc']
+    images1 = galsim.config.BuildImages(nimages, config1)
+    images1 += galsim.config.BuildImages(nimages, config1, image_num=nimages, obj_num=nimages)
+    for im1, im5 in zip(images1, images5 + images6):
+        np.testing.assert_array_equal(im5.array, im1.array)
+
+    # A different nproc starts a new pool.
+    config4['image']['nproc'] = 2
+    galsim.config.BuildImages(nimages, config4)
+    assert galsim.config.process._worker_pool is not pool
+    assert galsim.config.process._worker_pool.nproc == 2
+
+    galsim.config.CloseWorkerPool()
+    assert galsim.config.process._worker_pool is None
+
+
+@timer
+def test_schedule():
+    """Test the scheduling of tasks into chunks for multiprocessing
+    """
+    # With no costs, the order is preserved, and the chunks get smaller as the work remaining
+    # gets smaller.
+    tasks = [ [ ({'obj_num' : k}, k) ] for k in range(100) ]
+    chunks = galsim.config.ScheduleTasks(tasks, 4)
+    print('chunk sizes = ',[len(c) for c in chunks])
+    assert [ t for c in chunks for t in c ] == tasks
+    assert len(chunks[0]) == 13
+    assert len(chunks[-1]) == 1
+    assert all(len(c1) >= len(c2) for c1, c2 in zip(chunks[:-1], chunks[1:]))
+
+    # With costs, the most expensive ones are done first.
+    costs = [ (k * 37) % 100 for k in range(100) ]
+    chunks = galsim.config.ScheduleTasks(tasks, 4, costs)
+    all_tasks = [ t for c in chunks for t in c ]
+    assert sorted(all_tasks, key=lambda t: t[0][1]) == tasks
+    all_costs = [ costs[t[0][1]] for t in all_tasks ]
+    assert all_costs == sorted(costs, reverse=True)
+    assert len(chunks[0]) < 13
+    assert len(chunks[-1]) == 1
+
+    np.testing.assert_raises(ValueError, galsim.config.ScheduleTasks, tasks, 4, costs[:10])
+
+    # The default cost estimate for the Basic stamp type uses the stamp size and the profile type.
+    config = {
+        'image' : { 'type' : 'Single', 'pixel_scale' : 0.3, 'random_seed' : 1234 },
+        'stamp' : { 'type' : 'Basic', 'size' : 32 },
+        'gal' : { 'type' : 'Sersic', 'n' : 2, 'half_light_radius' : 1.2 },
+        'psf' : { 'type' : 'Gaussian', 'sigma' : 0.7 },
+    }
+    builder = galsim.config.stamp.valid_stamp_types['Basic']
+    job = { 'obj_num' : 0, 'xsize' : 0, 'ysize' : 0, 'do_noise' : True }
+    cost1 = builder.getJobCost(config['stamp'], config, job, None)
+    assert cost1 == 32 * 32 * galsim.config.stamp.profile_cost_factors['Sersic']
+    job2 = { 'obj_num' : 1, 'xsize' : 64, 'ysize' : 48, 'do_noise' : True }
+    cost2 = builder.getJobCost(config['stamp'], config, job2, None)
+    assert cost2 == 64 * 48 * galsim.config.stamp.profile_cost_factors['Sersic']
+    config['stamp']['size'] = { 'type' : 'Random', 'min' : 20, 'max' : 40 }
+    config['gal']['type'] = 'Exponential'
+    del config['gal']['n']
+    cost3 = builder.getJobCost(config['stamp'], config, job, None)
+    assert cost3 == 1.
+
+    # Building the stamps with nproc > 1 uses the scheduler, but gives the same results.
+    config = {
+        'image' : {
+            'type' : 'Tiled',
+            'nx_tiles' : 4,
+            'ny_tiles' : 3,
+            'stamp_size' : 32,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+        },
+        'gal' : {
+            'type' : 'Sersic',
+            'n' : { 'type' : 'Random', 'min' : 1, 'max' : 4 },
+            'half_light_radius' : 1.3,
+            'flux' : 100,
+        },
+        'psf' : { 'type' : 'Moffat', 'beta' : 3, 'fwhm' : 0.9 },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    im1 = galsim.config.BuildImage(config1)
+    config2 = galsim.config.CopyConfig(config)
+    config2['image']['nproc'] = 3
+    with CaptureLog(level=3) as cl:
+        im2 = galsim.config.BuildImage(config2, logger=cl.logger)
+    assert 'Split 12 tasks into' in cl.output
+    np.testing.assert_array_equal(im2.array, im1.array)
+
+
+@timer
+def test_shared_memory():
+    """Test returning stamps and images from the worker processes via shared memory
+    """
+    # First the basic round trip.
+    im = galsim.ImageF(np.arange(20*30, dtype=np.float32).reshape(30,20), scale=0.3)
+    im.setCenter(123,456)
+    shared_dir = galsim.config.MakeSharedDir()
+    shared_im = galsim.config.WriteSharedImage(im, shared_dir, 'test')
+    assert isinstance(shared_im, galsim.config.SharedImage)
+    assert shared_im.bounds == im.bounds
+    im2 = galsim.config.ReadSharedImage(shared_im)
+    assert not os.path.exists(shared_im.file_name)
+    assert im2 == im
+    assert galsim.config.WriteSharedImage(None, shared_dir, 'test') is None
+    assert galsim.config.ReadSharedImage(im) is im
+    os.rmdir(shared_dir)
+
+    config = {
+        'image' : {
+            'type' : 'Scattered',
+            'size' : 128,
+            'nobjects' : 10,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+            'nproc' : 2,
+            'shared_memory' : True,
+        },
+        'stamp' : { 'size' : 32 },
+        'gal' : {
+            'type' : 'Exponential',
+            'half_light_radius' : { 'type' : 'Random', 'min' : 0.5, 'max' : 1.5 },
+            'flux' : 100,
+        },
+        'psf' : { 'type' : 'Moffat', 'beta' : 3, 'fwhm' : 0.9 },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['nproc']
+    im1 = galsim.config.BuildImage(config1)
+    config2 = galsim.config.CopyConfig(config)
+    im2 = galsim.config.BuildImage(config2)
+    np.testing.assert_array_equal(im2.array, im1.array)
+
+    # Stamps and images can both be returned this way.
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['nproc']
+    stamps1, _ = galsim.config.BuildStamps(10, config1, do_noise=False)
+    config2 = galsim.config.CopyConfig(config)
+    stamps2, _ = galsim.config.BuildStamps(10, config2, do_noise=False)
+    for s1, s2 in zip(stamps1, stamps2):
+        assert s2 == s1
+
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['nproc']
+    images1 = galsim.config.BuildImages(3, config1)
+    config2 = galsim.config.CopyConfig(config)
+    images2 = galsim.config.BuildImages(3, config2)
+    for im1, im2 in zip(images1, images2):
+        assert im2 == im1
+
+
+@timer
+def test_threads():
+    """Test drawing the stamps in multiple threads using image.nthreads
+    """
+    config = {
+        'image' : {
+            'type' : 'Scattered',
+            'size' : 128,
+            'nobjects' : 20,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+            'nthreads' : 4,
+        },
+        'stamp' : { 'size' : 32 },
+        'gal' : {
+            # Use a few different Sersic indices, so the threads share the SersicInfo cache.
+            'type' : 'Sersic',
+            'n' : { 'type' : 'List', 'items' : [ 1.5, 2.5, 3.5 ] },
+            'half_light_radius' : { 'type' : 'Random', 'min' : 0.5, 'max' : 1.5 },
+            'flux' : 100,
+        },
+        'psf' : { 'type' : 'Moffat', 'beta' : 3, 'fwhm' : 0.9 },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['nthreads']
+    im1 = galsim.config.BuildImage(config1)
+    config2 = galsim.config.CopyConfig(config)
+    im2 = galsim.config.BuildImage(config2)
+    np.testing.assert_array_equal(im2.array, im1.array)
+    assert 'current_nproc' not in config2
+
+    # Photon shooting uses the lazily built samplers in the shared Info objects.
+    config['stamp']['draw_method'] = 'phot'
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['nthreads']
+    im1 = galsim.config.BuildImage(config1)
+    config2 = galsim.config.CopyConfig(config)
+    im2 = galsim.config.BuildImage(config2)
+    np.testing.assert_array_equal(im2.array, im1.array)
+
+    # nthreads = -1 means to use ncpu threads.
+    config2 = galsim.config.CopyConfig(config)
+    config2['image']['nthreads'] = -1
+    im2 = galsim.config.BuildImage(config2)
+    np.testing.assert_array_equal(im2.array, im1.array)
+
+    # Errors in the threads are propagated back to the main thread.
+    config2 = galsim.config.CopyConfig(config)
+    config2['gal']['flux'] = { 'type' : 'Eval', 'str' : '100 / (obj_num - 7)' }
+    np.testing.assert_raises(ZeroDivisionError, galsim.config.BuildImage, config2)
+
+
+@timer
+def test_batch_params():
+    """Test generating the values for all the stamps at once using image.batch_params
+    """
+    config = {
+        'input' : { 'catalog' : { 'dir' : 'config_input', 'file_name' : 'catalog.txt' } },
+        'image' : {
+            'type' : 'Tiled',
+            'nx_tiles' : 4,
+            'ny_tiles' : 3,
+            'stamp_size' : 32,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+            'batch_params' : True,
+        },
+        'gal' : {
+            'type' : 'Gaussian',
+            'sigma' : { 'type' : 'Catalog', 'col' : 0 },
+            'flux' : { 'type' : 'Sequence', 'first' : 100, 'step' : 10, 'repeat' : 2 },
+            'shear' : {
+                'type' : 'G1G2',
+                'g1' : { 'type' : 'List', 'items' : [ 0.1, -0.1, 0.2 ] },
+                # Random values can't be batched, but still need to come out the same.
+                'g2' : { 'type' : 'Random', 'min' : -0.2, 'max' : 0.2 },
+            },
+        },
+        'psf' : { 'type' : 'Moffat', 'beta' : 3, 'fwhm' : 0.9 },
+    }
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['batch_params']
+    im1 = galsim.config.BuildImage(config1)
+    config2 = galsim.config.CopyConfig(config)
+    im2 = galsim.config.BuildImage(config2)
+    np.testing.assert_array_equal(im2.array, im1.array)
+    assert '_batch_obj_nums' not in config2
+    assert '_batch' in config2['gal']['sigma']
+    assert '_batch' in config2['gal']['flux']
+    assert '_batch' in config2['gal']['shear']['g1']
+    assert '_batch' not in config2['gal']['shear']['g2']
+    sigma = config2['gal']['sigma']['_batch'][2]
+    np.testing.assert_array_equal(sigma, [1.234, 2.345, 3.456] * 4)
+
+    # The batches are redone for each image, with the right obj_nums.
+    images1 = galsim.config.BuildImages(2, config1, obj_num=12)
+    images2 = galsim.config.BuildImages(2, config2, obj_num=12)
+    for im1, im2 in zip(images1, images2):
+        np.testing.assert_array_equal(im2.array, im1.array)
+
+    # Parameters that depend on non-batchable values are generated for each stamp.
+    config['gal']['flux']['step'] = '$10 * image_num'
+    config1 = galsim.config.CopyConfig(config)
+    del config1['image']['batch_params']
+    im1 = galsim.config.BuildImage(config1)
+    config2 = galsim.config.CopyConfig(config)
+    im2 = galsim.config.BuildImage(config2)
+    np.testing.assert_array_equal(im2.array, im1.array)
+    assert config2['gal']['flux']['_batch'][2] is None
+
 
 if __name__ == "__main__":
     test_single()
@@ -1689,3 +2020,8 @@ if __name__ == "__main__":
     test_multirng()
     test_template()
     test_variable_cat_size()
+    test_persistent_pool()
+    test_schedule()
+    test_shared_memory()
+    test_threads()
+    test_batch_params()
@@ -383,6 +383,295 @@ def test_skip():
     assert "Building 2 out of 6 total files: file_num = 4 .. 5" in cl.output
 
 
+@timer
+def test_coordinator():
+    """Test handing out the files to build with a coordinator
+    """
+    config = {
+        'image' : {
+            'type' : 'Single',
+            'random_seed' : 1234,
+        },
+        'gal' : {
+            'type' : 'Gaussian',
+            'sigma' : { 'type': 'Random', 'min': 1, 'max': 2 },
+            'flux' : 100,
+        },
+        'output' : {
+            'nfiles' : 6,
+            'file_name' : "$'output/test_coordinator_%d.fits'%file_num",
+        },
+    }
+    import shutil
+    lock_dir = 'output/test_coordinator_locks'
+    shutil.rmtree(lock_dir, ignore_errors=True)
+    for k in range(6):
+        file_name = 'output/test_coordinator_%d.fits'%k
+        if os.path.exists(file_name):
+            os.remove(file_name)
+
+    # Simulate another job that has already claimed files 1 and 4.
+    other = galsim.config.FileLockCoordinator(lock_dir)
+    assert other.claim(1, 'output/test_coordinator_1.fits')
+    assert other.claim(4, 'output/test_coordinator_4.fits')
+    assert not other.claim(4, 'output/test_coordinator_4.fits')
+
+    coordinator = galsim.config.FileLockCoordinator(lock_dir)
+    with CaptureLog(level=2) as cl:
+        galsim.config.Process(config, logger=cl.logger, coordinator=coordinator)
+    assert "Skipping file 1 = output/test_coordinator_1.fits because another job" in cl.output
+    assert "Skipping file 4 = output/test_coordinator_4.fits because another job" in cl.output
+    for k in range(6):
+        file_name = 'output/test_coordinator_%d.fits'%k
+        assert os.path.exists(file_name) == (k not in [1,4])
+
+    # Now all the files are claimed, so a second run doesn't build anything.
+    os.remove('output/test_coordinator_0.fits')
+    galsim.config.Process(config, coordinator=galsim.config.FileLockCoordinator(lock_dir))
+    assert not os.path.exists('output/test_coordinator_0.fits')
+
+    # The files that were built are marked as done, so they are not rebuilt even once the
+    # processes that claimed them are gone.  Here the files are built by the output.nproc
+    # worker processes, which have exited by the time Process returns.
+    done_dir = 'output/test_coordinator_done'
+    shutil.rmtree(done_dir, ignore_errors=True)
+    config1 = galsim.config.CopyConfig(config)
+    config1['output']['nproc'] = 2
+    galsim.config.Process(config1, coordinator=galsim.config.FileLockCoordinator(done_dir))
+    for k in range(6):
+        file_name = 'output/test_coordinator_%d.fits'%k
+        assert os.path.exists(file_name)
+        with open(galsim.config.FileLockCoordinator(done_dir)._lockFileName(file_name)) as fin:
+            assert fin.read() == '%s done\n'%file_name
+    os.remove('output/test_coordinator_3.fits')
+    for timeout in [None, 0]:
+        coordinator = galsim.config.FileLockCoordinator(done_dir, timeout=timeout)
+        with CaptureLog(level=2) as cl:
+            galsim.config.Process(galsim.config.CopyConfig(config), logger=cl.logger,
+                                  coordinator=coordinator)
+        assert "Skipping file 3 = output/test_coordinator_3.fits because another job" in cl.output
+        assert "stale lock file" not in cl.output
+        assert not os.path.exists('output/test_coordinator_3.fits')
+
+    # The in-memory TaskCoordinator works the same way within a single process.
+    coordinator = galsim.config.TaskCoordinator()
+    assert coordinator.claim(2, 'output/test_coordinator_2.fits')
+    with CaptureLog(level=2) as cl:
+        galsim.config.Process(config, logger=cl.logger, coordinator=coordinator)
+    assert "Skipping file 2 = output/test_coordinator_2.fits because another job" in cl.output
+    assert "because another job" not in cl.output.replace(
+            "Skipping file 2 = output/test_coordinator_2.fits because another job", "")
+    for k in range(6):
+        assert os.path.exists('output/test_coordinator_%d.fits'%k)
+    assert len(coordinator.claimed) == 6
+    coordinator.release(2, 'output/test_coordinator_2.fits')
+    assert len(coordinator.claimed) == 5
+
+    # A lock file left by a process on this host that no longer exists is stale, so the
+    # file can be claimed again.
+    import socket
+    import subprocess
+    import sys
+    p = subprocess.Popen([sys.executable, '-c', 'pass'])
+    p.wait()
+    dead_pid = p.pid
+    coordinator = galsim.config.FileLockCoordinator(lock_dir)
+    lock_file = coordinator._lockFileName('output/test_coordinator_1.fits')
+    with open(lock_file, 'w') as fout:
+        fout.write('output/test_coordinator_1.fits %s %d\n'%(socket.gethostname(), dead_pid))
+    with CaptureLog() as cl:
+        assert coordinator.claim(1, 'output/test_coordinator_1.fits', logger=cl.logger)
+    assert "file 1: Removed stale lock file" in cl.output
+    with open(lock_file) as fin:
+        assert fin.read().split()[-1] == str(os.getpid())
+    assert not coordinator.claim(1, 'output/test_coordinator_1.fits')
+
+    # A lock file from another host is only stale once it is older than the timeout.
+    with open(lock_file, 'w') as fout:
+        fout.write('output/test_coordinator_1.fits otherhost 12345\n')
+    assert not coordinator.claim(1, 'output/test_coordinator_1.fits')
+    coordinator = galsim.config.FileLockCoordinator(lock_dir, timeout=100)
+    assert not coordinator.claim(1, 'output/test_coordinator_1.fits')
+    t = os.path.getmtime(lock_file) - 200
+    os.utime(lock_file, (t, t))
+    assert coordinator.claim(1, 'output/test_coordinator_1.fits')
+    assert repr(coordinator) == \
+            "galsim.config.FileLockCoordinator('output/test_coordinator_locks', timeout=100)"
+
+    # If building a file fails, its claim is released, so another job can build it.
+    shutil.rmtree(lock_dir, ignore_errors=True)
+    config['gal']['type'] = 'Invalid'
+    coordinator = galsim.config.FileLockCoordinator(lock_dir)
+    with CaptureLog() as cl:
+        galsim.config.Process(config, logger=cl.logger, coordinator=coordinator)
+    assert os.listdir(lock_dir) == []
+    config['gal']['type'] = 'Gaussian'
+
+    # Can't use both a coordinator and njobs.
+    np.testing.assert_raises(ValueError, galsim.config.Process, config, njobs=3, job=2,
+                             coordinator=coordinator)
+
+
+@timer
+def test_checkpoint():
+    """Test resuming a run using the checkpoint option
+    """
+    config = {
+        'image' : {
+            'type' : 'Single',
+            'random_seed' : 1234,
+        },
+        'gal' : {
+            'type' : 'Gaussian',
+            'sigma' : { 'type': 'Random', 'min': 1, 'max': 2 },
+            'flux' : 100,
+        },
+        'output' : {
+            'type' : 'MultiFits',
+            'nimages' : 3,
+            'nfiles' : 4,
+            'file_name' : "$'output/test_checkpoint_%d.fits'%file_num",
+            'checkpoint' : 'output/test_checkpoint.manifest',
+        },
+    }
+    import shutil
+    if os.path.exists('output/test_checkpoint.manifest'):
+        os.remove('output/test_checkpoint.manifest')
+    shutil.rmtree('output/test_checkpoint.manifest_images', ignore_errors=True)
+
+    galsim.config.Process(galsim.config.CopyConfig(config))
+    im1_list = [ galsim.fits.readMulti('output/test_checkpoint_%d.fits'%k) for k in range(4) ]
+    checkpoint = galsim.config.Checkpoint('output/test_checkpoint.manifest')
+    assert sorted(checkpoint.files.keys()) == [0, 1, 2, 3]
+    assert checkpoint.files[2]['image_num'] == 6
+    assert checkpoint.files[2]['obj_num'] == 6
+    assert checkpoint.files[2]['checksum'] == galsim.config.FileChecksum(
+            'output/test_checkpoint_2.fits')
+    # The saved images are removed once their files are complete.
+    assert len(checkpoint.images) == 12
+    assert os.listdir('output/test_checkpoint.manifest_images') == []
+
+    # Running again skips all the files.
+    with CaptureLog() as cl:
+        galsim.config.Process(galsim.config.CopyConfig(config), logger=cl.logger)
+    for k in range(4):
+        assert ("Skipping file %d = output/test_checkpoint_%d.fits because it was completed"%(k,k)
+                in cl.output)
+
+    # Files that are missing or have changed are rebuilt.
+    os.remove('output/test_checkpoint_1.fits')
+    with open('output/test_checkpoint_3.fits', 'ab') as f:
+        f.write(b'junk')
+    with CaptureLog() as cl:
+        galsim.config.Process(galsim.config.CopyConfig(config), logger=cl.logger)
+    for k in range(4):
+        msg = "Skipping file %d = output/test_checkpoint_%d.fits because it was completed"%(k,k)
+        if k in [1, 3]:
+            assert msg not in cl.output
+        else:
+            assert msg in cl.output
+    for k in range(4):
+        im2_list = galsim.fits.readMulti('output/test_checkpoint_%d.fits'%k)
+        for im1, im2 in zip(im1_list[k], im2_list):
+            np.testing.assert_array_equal(im2.array, im1.array)
+
+    # Simulate a run that died partway through file 2, after finishing its first 2 images.
+    os.remove('output/test_checkpoint_2.fits')
+    config1 = galsim.config.CopyConfig(config)
+    galsim.config.SetupConfigFileNum(config1, 2, 6, 6)
+    galsim.config.SetupCheckpoint(config1)
+    galsim.config.BuildImage(config1, image_num=6, obj_num=6)
+    galsim.config.BuildImage(config1, image_num=7, obj_num=7)
+    with CaptureLog() as cl:
+        galsim.config.Process(galsim.config.CopyConfig(config), logger=cl.logger)
+    assert "image 6: Using image completed in a previous run" in cl.output
+    assert "image 7: Using image completed in a previous run" in cl.output
+    assert "image 8: Using image completed in a previous run" not in cl.output
+    im2_list = galsim.fits.readMulti('output/test_checkpoint_2.fits')
+    for im1, im2 in zip(im1_list[2], im2_list):
+        np.testing.assert_array_equal(im2.array, im1.array)
+
+    # If the seed changes, nothing is reused.
+    config['image']['random_seed'] = 5678
+    with CaptureLog() as cl:
+        galsim.config.Process(galsim.config.CopyConfig(config), logger=cl.logger)
+    assert "because it was completed" not in cl.output
+    assert "file 0: checkpoint record does not match current config" in cl.output
+
+
+@timer
+def test_timing():
+    """Test the per-stage timing reports using the output.timing option
+    """
+    import json
+    config = {
+        'image' : {
+            'type' : 'Tiled',
+            'nx_tiles' : 3,
+            'ny_tiles' : 2,
+            'stamp_size' : 32,
+            'pixel_scale' : 0.3,
+            'random_seed' : 1234,
+            'nproc' : 2,
+            'noise' : { 'type' : 'Gaussian', 'sigma' : 0.1 },
+        },
+        'gal' : {
+            'type' : 'Gaussian',
+            'sigma' : { 'type': 'Random', 'min': 1, 'max': 2 },
+            'flux' : 100,
+        },
+        'output' : {
+            'type' : 'MultiFits',
+            'nimages' : 2,
+            'nfiles' : 2,
+            'file_name' : "$'output/test_timing_%d.fits'%file_num",
+            'timing' : "$'output/test_timing_%d.json'%file_num",
+            'weight' : { 'hdu' : 2 },
+        },
+    }
+    galsim.config.Process(galsim.config.CopyConfig(config))
+    for k in range(2):
+        with open('output/test_timing_%d.json'%k) as fin:
+            report = json.load(fin)
+        assert report['file_num'] == k
+        assert report['file_name'] == 'output/test_timing_%d.fits'%k
+        stages = report['stages']
+        # The stamps are built by the worker processes, so this checks that their timings
+        # were sent back.
+        for stage in ['buildProfile', 'draw', 'reject', 'processExtraOutputs', 'whiten',
+                      'addNoise']:
+            assert stages[stage]['count'] == 12
+            assert stages[stage]['time'] >= 0.
+            np.testing.assert_almost_equal(stages[stage]['mean'],
+                                           stages[stage]['time'] / 12)
+        for stage in ['writeFile', 'writeExtraOutputs', 'file']:
+            assert stages[stage]['count'] == 1
+
+    # Same thing with threads and a csv report.
+    del config['image']['nproc']
+    config['image']['nthreads'] = 2
+    config['output']['timing'] = "$'output/test_timing_%d.csv'%file_num"
+    galsim.config.Process(galsim.config.CopyConfig(config))
+    for k in range(2):
+        with open('output/test_timing_%d.csv'%k) as fin:
+            lines = fin.readlines()
+        assert lines[0] == 'stage,count,time,mean\n'
+        counts = dict( (line.split(',')[0], int(line.split(',')[1])) for line in lines[1:] )
+        assert counts['draw'] == 12
+        assert counts['file'] == 1
+
+    # A fixed report name gets the file_num added, so each file has its own report.
+    config['output']['timing'] = 'output/test_timing.json'
+    for k in range(2):
+        os.remove('output/test_timing_%d.json'%k)
+    galsim.config.Process(galsim.config.CopyConfig(config))
+    for k in range(2):
+        with open('output/test_timing_%d.json'%k) as fin:
+            report = json.load(fin)
+        assert report['file_num'] == k
+        assert report['file_name'] == 'output/test_timing_%d.fits'%k
+
+
 @timer
 def test_extra_wt():
     """Test the extra weight and badpix fields
@@ -1020,6 +1309,9 @@ if __name__ == "__main__":
     test_multifits()
     test_datacube()
     test_skip()
+    test_coordinator()
+    test_checkpoint()
+    test_timing()
     test_extra_wt()
     test_extra_psf()
     test_extra_truth()
@@ -1500,6 +1500,75 @@ def test_eval():
     np.testing.assert_almost_equal(ps_mu, mu)
 
 
+@timer
+def test_eval_cache():
+    """Test the caching of compiled Eval strings and their results
+    """
+    config = {
+        'image_pos' : galsim.PositionD(1.,2.),
+        'rng' : galsim.BaseDeviate(1234),
+        'eval1' : '$np.exp(-0.5 * image_pos.x**2)',
+        'eval2' : { 'type' : 'Eval', 'str' : 'x * sum([y for y in range(3)])', 'fx' : 1.5 },
+        'eval3' : '$rng.raw() % 100',
+    }
+    val1 = galsim.config.ParseValue(config, 'eval1', config, float)[0]
+    np.testing.assert_almost_equal(val1, np.exp(-0.5))
+    # The compiled code is cached by the string, rather than being stored in the config.
+    assert 'np.exp(-0.5 * image_pos.x**2)' in galsim.config.value_eval._eval_code
+    assert '_fn' not in config['eval1']
+    # Variables can be used in nested scopes such as list comprehensions.
+    val2 = galsim.config.ParseValue(config, 'eval2', config, float)[0]
+    np.testing.assert_almost_equal(val2, 4.5)
+
+    # So the config dict can still be pickled after evaluating the strings.
+    try:
+        import cPickle as pickle
+    except ImportError:
+        import pickle
+    config2 = pickle.loads(pickle.dumps(config))
+    config2['obj_num'] = 1
+    val1b = galsim.config.ParseValue(config2, 'eval1', config2, float)[0]
+    np.testing.assert_almost_equal(val1b, val1)
+
+    # Reusing the last result is off by default.
+    config['obj_num'] = 1
+    assert '_last' not in config['eval1']
+    config['eval4'] = { 'type' : 'Eval', 'str' : '[x] * 3', 'fx' : 1.5 }
+    val4 = galsim.config.ParseValue(config, 'eval4', config, None)[0]
+    config['obj_num'] = 2
+    val4b = galsim.config.ParseValue(config, 'eval4', config, None)[0]
+    assert val4b == val4 == [1.5, 1.5, 1.5]
+    assert val4b is not val4
+    # It can be turned on for a single Eval item.
+    config['eval4']['eval_cache'] = True
+    config['obj_num'] = 3
+    val4 = galsim.config.ParseValue(config, 'eval4', config, None)[0]
+    config['obj_num'] = 4
+    assert galsim.config.ParseValue(config, 'eval4', config, None)[0] is val4
+
+    # Or for all of them at the top level.
+    config['eval_cache'] = True
+    # When the variables change, the string is evaluated again.
+    for k in range(1,4):
+        config['obj_num'] = k
+        config['image_pos'] = galsim.PositionD(k,2.)
+        val1 = galsim.config.ParseValue(config, 'eval1', config, float)[0]
+        np.testing.assert_almost_equal(val1, np.exp(-0.5 * k**2))
+    # But if they don't, the last value is reused.
+    last_params, last_val = config['eval1']['_last']
+    assert last_params == { 'image_pos' : galsim.PositionD(3.,2.) }
+    config['obj_num'] = 4
+    assert galsim.config.ParseValue(config, 'eval1', config, float)[0] is last_val
+
+    # Strings that use rng are always evaluated, since rng gives a different value each time.
+    rng = galsim.BaseDeviate(1234)
+    for k in range(5,10):
+        config['obj_num'] = k
+        val3 = galsim.config.ParseValue(config, 'eval3', config, int)[0]
+        assert val3 == rng.raw() % 100
+    assert '_last' not in config['eval3']
+
+
 if __name__ == "__main__":
     test_float_value()
     test_int_value()
@@ -1509,3 +1578,4 @@ if __name__ == "__main__":
     test_shear_value()
     test_pos_value()
     test_eval()
+    test_eval_cache()
@@ -1364,6 +1364,416 @@ def test_np_fft():
     except ImportError:
         pass
 
+@timer
+def test_fft_plans():
+    """Test the FFTW plan cache and wisdom functions in galsim.fft
+    """
+    assert galsim.fft.get_plan_mode() == 'estimate'
+    xar = np.random.RandomState(1234).normal(size=(48,64))
+    kar1 = galsim.fft.fft2(xar)
+    rkar1 = galsim.fft.rfft2(xar)
+    xar1 = galsim.fft.irfft2(rkar1)
+    np.testing.assert_almost_equal(xar1, xar)
+    # Repeating the same transforms reuses the plans, and gives the same answers.
+    nplans = galsim._galsim.GetNFFTPlans()
+    assert nplans > 0
+    kar2 = galsim.fft.fft2(xar)
+    np.testing.assert_array_equal(kar2, kar1)
+    assert galsim._galsim.GetNFFTPlans() == nplans
+
+    # In measure mode, the planning must not clobber the arrays being transformed.
+    galsim.fft.set_plan_mode('measure')
+    try:
+        assert galsim.fft.get_plan_mode() == 'measure'
+        xar_copy = xar.copy()
+        kar3 = galsim.fft.fft2(xar)
+        np.testing.assert_array_equal(xar, xar_copy)
+        np.testing.assert_almost_equal(kar3, kar1)
+        np.testing.assert_almost_equal(galsim.fft.ifft2(kar3).real, xar)
+        np.testing.assert_almost_equal(galsim.fft.irfft2(galsim.fft.rfft2(xar)), xar)
+        assert galsim._galsim.GetNFFTPlans() > nplans
+
+        # The measured wisdom can be saved and loaded again.
+        wisdom_file = os.path.join('output', 'fftw_wisdom.txt')
+        galsim.fft.export_wisdom(wisdom_file)
+        assert os.path.getsize(wisdom_file) > 0
+        galsim.fft.clear_plans()
+        assert galsim._galsim.GetNFFTPlans() == 0
+        galsim.fft.import_wisdom(wisdom_file)
+        kar4 = galsim.fft.fft2(xar)
+        np.testing.assert_almost_equal(kar4, kar1)
+    finally:
+        galsim.fft.set_plan_mode('estimate')
+
+    np.testing.assert_raises(ValueError, galsim.fft.set_plan_mode, 'exhaustive')
+    np.testing.assert_raises(IOError, galsim.fft.import_wisdom, 'output/invalid_file')
+
+@timer
+def test_draw_images():
+    """Test drawing a list of objects at once with galsim.drawImages
+    """
+    objs = [ galsim.Gaussian(sigma=0.5 + 0.1*k, flux=1.+k).shear(g1=0.02*k, g2=-0.01*k)
+             for k in range(4) ]
+    objs.append(galsim.Convolve(galsim.Exponential(half_light_radius=1.1),
+                                galsim.Moffat(beta=3, fwhm=0.8)))
+    offsets = [ (0.1*k, -0.2*k) for k in range(len(objs)) ]
+
+    for method in ['auto', 'fft', 'no_pixel', 'sb']:
+        images = [ galsim.ImageF(32,32, scale=0.3) for obj in objs ]
+        images = galsim.drawImages(objs, images, method=method, offsets=offsets,
+                                   area=2., exptime=3.)
+        for obj, image, offset in zip(objs, images, offsets):
+            im2 = obj.drawImage(nx=32, ny=32, scale=0.3, method=method, offset=offset,
+                                area=2., exptime=3.)
+            np.testing.assert_almost_equal(image.array, im2.array, decimal=6,
+                                           err_msg="drawImages differs for method=%s"%method)
+            np.testing.assert_almost_equal(image.added_flux, im2.added_flux, decimal=6)
+            assert image.wcs == im2.wcs
+            assert image.draw_method == im2.draw_method == method
+
+    # Non-trivial wcs and add_to_image
+    wcs = galsim.JacobianWCS(0.26, 0.05, -0.03, 0.24)
+    images = [ galsim.ImageD(bounds=galsim.BoundsI(10,33,-5,18), wcs=wcs) for obj in objs ]
+    images2 = [ im.copy() for im in images ]
+    galsim.drawImages(objs, images, gain=1.7)
+    galsim.drawImages(objs, images, gain=1.7, add_to_image=True, use_true_center=False)
+    for obj, im1, im2 in zip(objs, images, images2):
+        obj.drawImage(im2, gain=1.7)
+        obj.drawImage(im2, gain=1.7, add_to_image=True, use_true_center=False)
+        np.testing.assert_almost_equal(im1.array, im2.array, decimal=8)
+
+    # With share_fft_size, the objects drawn with an fft use the same size, so the results are
+    # slightly different (a bit less aliasing for the smaller ones).
+    images = [ galsim.ImageD(32,32, scale=0.3) for obj in objs ]
+    galsim.drawImages(objs, images, method='fft', share_fft_size=True)
+    for obj, image in zip(objs, images):
+        im2 = obj.drawImage(nx=32, ny=32, scale=0.3, method='fft')
+        np.testing.assert_allclose(image.array, im2.array, rtol=0, atol=1.e-4 * obj.flux)
+
+    # Check invalid inputs
+    images = [ galsim.ImageD(32,32, scale=0.3) for obj in objs ]
+    np.testing.assert_raises(ValueError, galsim.drawImages, objs, images[1:])
+    np.testing.assert_raises(ValueError, galsim.drawImages, objs, images, offsets=offsets[1:])
+    np.testing.assert_raises(ValueError, galsim.drawImages, objs, images, method='phot')
+    np.testing.assert_raises(ValueError, galsim.drawImages, objs, images, method='invalid')
+    np.testing.assert_raises(ValueError, galsim.drawImages, objs, images, gain=0.)
+    np.testing.assert_raises(ValueError, galsim.drawImages, objs, [galsim.ImageD()]*len(objs))
+    np.testing.assert_raises(ValueError, galsim.drawImages, objs, [im.array for im in images])
+
+
+@timer
+def test_draw_cheapest():
+    """Test drawImage with method='cheapest' and the DrawCostModel class
+    """
+    gal = galsim.Exponential(half_light_radius=0.5, flux=200.).shear(g1=0.1, g2=0.2)
+    psf = galsim.Moffat(beta=3, fwhm=0.7)
+    obj = galsim.Convolve(gal, psf)
+    box = galsim.Box(width=1.3, height=0.9, flux=200.)
+
+    # The default model doesn't allow phot.  And a Convolution can't use real_space.
+    model = galsim.DrawCostModel()
+    im1 = obj.drawImage(nx=32, ny=32, scale=0.2, method='cheapest')
+    assert im1.draw_method == 'fft'
+    im2 = obj.drawImage(nx=32, ny=32, scale=0.2, method='fft')
+    assert im2.draw_method == 'fft'
+    np.testing.assert_array_equal(im1.array, im2.array)
+    method, costs = model.chooseMethod(obj.dilate(5.), 32, 32)
+    assert method == 'fft'
+    assert costs['real_space'] == np.inf
+    assert costs['phot'] == np.inf
+    assert 0 < costs['fft'] < np.inf
+
+    # A tiny stamp of a simple profile is faster in real space.
+    im1 = box.drawImage(nx=6, ny=6, scale=0.3, method='cheapest', cost_model=model)
+    assert im1.draw_method == 'real_space'
+    im2 = box.drawImage(nx=6, ny=6, scale=0.3, method='real_space')
+    np.testing.assert_array_equal(im1.array, im2.array)
+
+    # If the fft would be too large, it's not chosen.
+    big = galsim.Gaussian(sigma=0.1, gsparams=galsim.GSParams(minimum_fft_size=32,
+                                                                maximum_fft_size=64))
+    assert model.fftCost(big.dilate(100.)) == np.inf
+    im1 = big.drawImage(nx=10, ny=10, scale=0.01, method='cheapest')
+    assert im1.draw_method == 'real_space'
+
+    # With a cheap enough phot_coef, a faint object is shot.
+    model = galsim.DrawCostModel(phot_coef=1.e-9, allow_phot=True)
+    rng = galsim.BaseDeviate(1234)
+    im1 = obj.drawImage(nx=32, ny=32, scale=0.2, method='cheapest', cost_model=model,
+                        rng=rng.duplicate(), save_photons=True)
+    assert im1.draw_method == 'phot'
+    assert hasattr(im1, 'photons')
+    im2 = obj.drawImage(nx=32, ny=32, scale=0.2, method='phot', rng=rng.duplicate())
+    np.testing.assert_array_equal(im1.array, im2.array)
+    # But not a very bright one.  Then it warns that the photon shooting parameters are ignored.
+    im1 = np.testing.assert_warns(UserWarning, obj.drawImage, nx=32, ny=32, scale=0.2,
+                                  method='cheapest', cost_model=model, rng=rng, exptime=1.e6,
+                                  save_photons=True)
+    assert im1.draw_method == 'fft'
+    assert not hasattr(im1, 'photons')
+
+    # Like method='auto', it warns if the profile already includes a Pixel.
+    np.testing.assert_warns(UserWarning, galsim.Convolve(obj, galsim.Pixel(0.2)).drawImage,
+                            nx=32, ny=32, scale=0.2, method='cheapest')
+
+    # calibrate sets all the coefficients to something reasonable.
+    model = galsim.DrawCostModel().calibrate(nrep=1)
+    for coef in [model.fft_coef, model.kvalue_coef, model.real_space_coef, model.phot_coef]:
+        assert 0 < coef < 1
+    do_pickle(model)
+
+    np.testing.assert_raises(ValueError, obj.drawImage, method='invalid')
+    np.testing.assert_raises(ValueError, obj.drawImage, method='fft', rng=rng)
+
+
+@timer
+def test_draw_fft_tiled():
+    """Test drawImage with method='fft_tiled'
+    """
+    gal = galsim.Exponential(half_light_radius=2., flux=100.).shear(g1=0.2, g2=-0.1)
+    psf = galsim.Moffat(beta=3, fwhm=0.7)
+    obj = galsim.Convolve(gal, psf)
+
+    # For a normal sized object, this is close to the regular fft method.
+    im1 = obj.drawImage(nx=64, ny=64, scale=0.2, method='fft')
+    im2 = obj.drawImage(nx=64, ny=64, scale=0.2, method='fft_tiled')
+    assert im2.draw_method == 'fft_tiled'
+    print('max diff = ',np.max(np.abs(im2.array-im1.array)), im1.array.max())
+    np.testing.assert_allclose(im2.array, im1.array, atol=1.e-3 * im1.array.max())
+    np.testing.assert_allclose(im2.added_flux, im1.added_flux, rtol=1.e-3)
+
+    # Also with odd sizes, offsets, and a non-trivial wcs.
+    wcs = galsim.JacobianWCS(0.21, 0.02, -0.03, 0.19)
+    im1 = obj.drawImage(nx=55, ny=47, wcs=wcs, offset=(0.3,-0.2), method='fft')
+    im2 = obj.drawImage(nx=55, ny=47, wcs=wcs, offset=(0.3,-0.2), method='fft_tiled')
+    np.testing.assert_allclose(im2.array, im1.array, atol=1.e-3 * im1.array.max())
+
+    # add_to_image works
+    im3 = im2.copy()
+    obj.drawImage(im3, method='fft_tiled', add_to_image=True)
+    np.testing.assert_allclose(im3.array, 2*im2.array, rtol=1.e-10)
+
+    # A very large object needs an FFT that is too large for these gsparams, but fft_tiled
+    # keeps the FFTs small enough.
+    gsp = galsim.GSParams(maximum_fft_size=256)
+    big_gal = galsim.Exponential(half_light_radius=15., flux=1.e4, gsparams=gsp)
+    big_psf = galsim.Moffat(beta=3, fwhm=0.7, gsparams=gsp)
+    big = galsim.Convolve(big_gal, big_psf)
+    np.testing.assert_raises(RuntimeError, big.drawImage, nx=200, ny=200, scale=0.4, method='fft')
+    im4 = big.drawImage(nx=200, ny=200, scale=0.4, method='fft_tiled')
+    ref = galsim.Convolve(galsim.Exponential(half_light_radius=15., flux=1.e4),
+                          galsim.Moffat(beta=3, fwhm=0.7))
+    im5 = ref.drawImage(nx=200, ny=200, scale=0.4, method='fft')
+    np.testing.assert_allclose(im4.array, im5.array, atol=1.e-3 * im5.array.max())
+
+    # But if the kernel itself is too large, it fails, and the error reports the FFT size that
+    # would be needed.
+    huge = galsim.Convolve(galsim.Gaussian(sigma=40., gsparams=gsp),
+                           galsim.Gaussian(sigma=20., gsparams=gsp))
+    try:
+        huge.drawImage(nx=200, ny=200, scale=0.4, method='fft_tiled')
+    except RuntimeError as err:
+        size = int(str(err).split('too large: ')[1].split('.')[0])
+        assert size > gsp.maximum_fft_size
+    else:
+        raise AssertionError("fft_tiled should fail if the kernel needs too large an FFT")
+
+    # The profile must be a Convolution with something that can be drawn in real space.
+    np.testing.assert_raises(ValueError, gal.drawImage, nx=64, ny=64, scale=0.2,
+                             method='fft_tiled')
+    np.testing.assert_raises(ValueError, galsim.Convolve(gal).drawImage, nx=64, ny=64, scale=0.2,
+                             method='fft_tiled')
+
+
+@timer
+def test_draw_float32_fft():
+    """Test that drawing onto float32 images with FFTs does the inverse FFT in single precision.
+    """
+    print('has_single_precision_fft = ',galsim.fft.has_single_precision_fft())
+    assert galsim.fft.has_single_precision_fft() in [True, False]
+
+    obj = galsim.Convolve(galsim.Sersic(n=2.5, half_light_radius=1.3, flux=1.e4),
+                          galsim.Kolmogorov(fwhm=0.7))
+    im1 = obj.drawImage(nx=64, ny=64, scale=0.2, method='fft', dtype=np.float64)
+    im2 = obj.drawImage(nx=64, ny=64, scale=0.2, method='fft', dtype=np.float32)
+    assert im2.dtype == np.float32
+    np.testing.assert_allclose(im2.array, im1.array, rtol=0, atol=1.e-5 * im1.array.max())
+    np.testing.assert_allclose(im2.added_flux, im1.added_flux, rtol=1.e-5)
+
+    # Check the single precision inverse FFT directly.
+    N = 32
+    kim = galsim.ImageCF(bounds=galsim.BoundsI(0,N//2,-N//2,N//2-1))
+    kim.array[:,:] = (np.arange(kim.array.size).reshape(kim.array.shape) * (1.+0.5j)) / N**2
+    kim.array[:,0] = kim.array[:,0].real
+    xim1 = kim._image.irfft()
+    xim2 = kim._image.irfft_float()
+    assert xim2.array.dtype == np.float32
+    np.testing.assert_allclose(xim2.array, xim1.array, rtol=0, atol=1.e-5 * np.max(xim1.array))
+    xim1 = kim._image.irfft(shift_in=False, shift_out=False)
+    xim2 = kim._image.irfft_float(shift_in=False, shift_out=False)
+    np.testing.assert_allclose(xim2.array, xim1.array, rtol=0, atol=1.e-5 * np.max(xim1.array))
+
+
+@timer
+def test_prepared_drawer():
+    """Test PreparedDrawer, which redraws a profile with different offsets and fluxes.
+    """
+    obj = galsim.Convolve(galsim.Gaussian(sigma=0.5, flux=17.),
+                          galsim.Exponential(half_light_radius=0.3)).shear(g1=0.1, g2=0.2)
+    for nx, ny in [ (64,64), (63,64), (64,61) ]:
+        template = galsim.ImageD(nx, ny, scale=0.2)
+        drawer = galsim.PreparedDrawer(obj, template)
+        for offset in [ None, (0.3,-0.2), galsim.PositionD(-0.7, 0.45) ]:
+            for flux in [ None, 3.5 ]:
+                im1 = drawer.draw(offset=offset, flux=flux)
+                im2 = obj.drawImage(template.copy(), method='fft', offset=offset)
+                if flux is not None:
+                    im2 *= flux / obj.flux
+                np.testing.assert_allclose(im1.array, im2.array, rtol=0,
+                                           atol=1.e-10 * im2.array.max())
+                assert im1.bounds == template.bounds
+                assert im1.wcs == template.wcs
+                np.testing.assert_allclose(im1.added_flux, im1.array.sum(), rtol=1.e-10)
+        # The template isn't modified.
+        np.testing.assert_array_equal(template.array, 0.)
+
+    # no_pixel, float images, and add_to_image
+    template = galsim.ImageF(32, 32, scale=0.3)
+    drawer = galsim.PreparedDrawer(obj, template, method='no_pixel')
+    im1 = drawer.draw(offset=(0.2,0.1))
+    assert im1.dtype == np.float32
+    im2 = obj.drawImage(template.copy(), method='no_pixel', offset=(0.2,0.1))
+    np.testing.assert_allclose(im1.array, im2.array, rtol=0, atol=1.e-5 * im2.array.max())
+    drawer.draw(offset=(0.2,0.1), image=im1, add_to_image=True)
+    np.testing.assert_allclose(im1.array, 2*im2.array, rtol=0, atol=2.e-5 * im2.array.max())
+
+    # A profile with zero flux can't be rescaled, so it is drawn as is.
+    zero = obj * 0.
+    drawer = galsim.PreparedDrawer(zero, template)
+    im1 = drawer.draw(offset=(0.2,0.1), flux=0.)
+    np.testing.assert_array_equal(im1.array, 0.)
+    im1 = np.testing.assert_warns(UserWarning, drawer.draw, offset=(0.2,0.1), flux=3.5)
+    np.testing.assert_array_equal(im1.array, 0.)
+    assert im1.added_flux == 0.
+
+    np.testing.assert_raises(ValueError, drawer.draw, image=galsim.ImageF(10,10))
+    np.testing.assert_raises(ValueError, galsim.PreparedDrawer, obj, galsim.ImageF())
+    np.testing.assert_raises(ValueError, galsim.PreparedDrawer, obj, galsim.ImageF(10,10))
+    np.testing.assert_raises(ValueError, galsim.PreparedDrawer, obj, template, method='phot')
+    np.testing.assert_raises(TypeError, galsim.PreparedDrawer, 17, template)
+
+
+@timer
+def test_shoot_threads():
+    """Test photon shooting with n_threads > 1.
+    """
+    obj = galsim.Sersic(n=1.5, half_light_radius=1.2, flux=2.e5)
+    rng = galsim.BaseDeviate(1234)
+
+    # n_threads=1 is the same as the regular single-threaded shooting.
+    im1 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate())
+    im2 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), n_threads=1)
+    np.testing.assert_array_equal(im1.array, im2.array)
+
+    # The same rng and n_threads gives the same image.
+    im3 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), n_threads=4)
+    im4 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), n_threads=4,
+                        maxN=10000)
+    im5 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), n_threads=4)
+    np.testing.assert_array_equal(im3.array, im5.array)
+    assert im3.added_flux == im5.added_flux
+
+    # Different chunking within each thread doesn't change the image.
+    np.testing.assert_array_almost_equal(im3.array, im4.array, decimal=8)
+
+    # save_photons keeps the photons from all the chunks of all the threads.
+    im8 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), n_threads=4,
+                        maxN=10000, save_photons=True)
+    np.testing.assert_array_equal(im8.array, im4.array)
+    im9 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(),
+                        save_photons=True)
+    assert im8.photons.size() == im9.photons.size()
+    np.testing.assert_allclose(im8.photons.flux.sum(), im9.photons.flux.sum())
+    im10 = galsim.ImageD(64, 64, scale=0.2)
+    im10.setCenter(0,0)
+    im8.photons.addTo(im10)
+    np.testing.assert_allclose(im10.array, im8.array, rtol=1.e-6, atol=1.e-6)
+
+    # The total flux is right up to Poisson noise.
+    print('flux = ',im1.array.sum(), im3.array.sum())
+    np.testing.assert_allclose(im3.array.sum(), obj.flux, rtol=5./np.sqrt(obj.flux))
+    np.testing.assert_allclose(im3.added_flux, im3.array.sum(), rtol=1.e-10)
+    # And the moments match the single-threaded version.
+    np.testing.assert_allclose(im3.FindAdaptiveMom().moments_sigma,
+                               im1.FindAdaptiveMom().moments_sigma, rtol=0.02)
+
+    # More threads than photons is ok.
+    im6 = obj.drawImage(nx=128, ny=128, scale=0.2, method='phot', rng=rng, n_photons=3,
+                        n_threads=8)
+    np.testing.assert_allclose(im6.array.sum(), obj.flux, rtol=1.e-10)
+    assert np.count_nonzero(im6.array) <= 3
+
+    # Integer images work too.
+    im7 = obj.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), n_threads=4,
+                        dtype=np.int32)
+    assert im7.array.sum() > 0
+
+    np.testing.assert_raises(ValueError, obj.drawImage, nx=16, ny=16, scale=0.2, method='phot',
+                             n_threads=0)
+
+
+@timer
+def test_shoot_chunks():
+    """Test that photon_chunk_size in GSParams limits the number of photons shot at a time.
+    """
+    gsp = galsim.GSParams(photon_chunk_size=1000)
+    assert gsp.photon_chunk_size == 1000
+    assert galsim.GSParams().photon_chunk_size == 10000000
+    do_pickle(gsp)
+    assert gsp != galsim.GSParams()
+
+    obj1 = galsim.Exponential(half_light_radius=1.1, flux=1.e5)
+    obj2 = galsim.Exponential(half_light_radius=1.1, flux=1.e5, gsparams=gsp)
+    rng = galsim.BaseDeviate(1234)
+
+    # Using the gsparams is equivalent to giving the same maxN.
+    im1 = obj1.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), maxN=1000,
+                         save_photons=True)
+    im2 = obj2.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(),
+                         save_photons=True)
+    np.testing.assert_array_equal(im1.array, im2.array)
+    assert im1.added_flux == im2.added_flux
+    # The saved photons include all the chunks, so they are the same as shooting them all at once.
+    im0 = obj1.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(),
+                         save_photons=True)
+    assert im2.photons.size() == im0.photons.size() > 1000
+    np.testing.assert_allclose(im2.photons.flux.sum(), im0.photons.flux.sum())
+    np.testing.assert_allclose(im2.array.sum(), obj2.flux, rtol=5./np.sqrt(obj2.flux))
+
+    # An explicit maxN overrides the gsparams.
+    im3 = obj2.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(), maxN=30000,
+                         save_photons=True)
+    assert im3.photons.size() == im0.photons.size()
+
+    # The surface_ops are applied to each chunk.
+    sed = galsim.SED('1', 'nm', 'fphotons')
+    bandpass = galsim.Bandpass('1', 'nm', blue_limit=500, red_limit=600)
+    ops = [ galsim.WavelengthSampler(sed, bandpass, rng),
+            galsim.FRatioAngles(1.2, 0.61, rng) ]
+    im4 = obj2.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng, surface_ops=ops,
+                         save_photons=True)
+    assert im4.photons.size() > 1000
+    assert im4.photons.hasAllocatedWavelengths()
+    assert im4.photons.hasAllocatedAngles()
+    assert np.all((im4.photons.wavelength >= 500) & (im4.photons.wavelength <= 600))
+    np.testing.assert_allclose(im4.array.sum(), obj2.flux, rtol=5./np.sqrt(obj2.flux))
+
+    # Integer images use a temporary image for each chunk.
+    im5 = obj2.drawImage(nx=64, ny=64, scale=0.2, method='phot', rng=rng.duplicate(),
+                         dtype=np.int32)
+    np.testing.assert_allclose(im5.array.sum(), obj2.flux, rtol=5./np.sqrt(obj2.flux))
+
+
 @timer
 def test_types():
     """Test drawing onto image types other than float32, float64.
@@ -1495,6 +1905,14 @@ if __name__ == "__main__":
     test_drawImage_area_exptime()
     test_fft()
     test_np_fft()
+    test_fft_plans()
+    test_draw_images()
+    test_draw_cheapest()
+    test_draw_fft_tiled()
+    test_draw_float32_fft()
+    test_prepared_drawer()
     test_shoot()
+    test_shoot_threads()
+    test_shoot_chunks()
     test_types()
     test_direct_scale()
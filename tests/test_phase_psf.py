@@ -349,6 +349,270 @@ def test_phase_psf_batch():
             "Individually generated AtmosphericPSF differs from AtmosphericPSF generated in batch")
 
 
+@timer
+def test_phase_psf_threads():
+    """Test that PSFs computed with several threads match those computed with one."""
+    NPSFs = 6
+    theta = [(i*galsim.arcsec, -i*galsim.arcsec) for i in range(NPSFs)]
+    kwargs = dict(lam=1000.0, exptime=0.1, time_step=0.01, diam=1.0)
+
+    imgs = {}
+    for nthreads in [1, 4]:
+        rng = galsim.BaseDeviate(1234)
+        atm = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 10.0], alpha=0.997,
+                                time_step=0.01, rng=rng)
+        atm.nthreads = nthreads
+        # Include some PSFs with a different t0, so not every time step updates every PSF.
+        psfs = [atm.makePSF(theta=th, t0=0.01*(i%2), **kwargs) for i, th in enumerate(theta)]
+        imgs[nthreads] = [psf.drawImage(nx=32, ny=32, scale=0.05) for psf in psfs]
+        assert atm._pending == []
+
+    for img1, img4 in zip(imgs[1], imgs[4]):
+        np.testing.assert_array_equal(
+            img1.array, img4.array,
+            "PhaseScreenPSFs computed with nthreads=4 differ from those with nthreads=1")
+
+    # Time-independent screens take the non-dynamic branch.
+    imgs = {}
+    for nthreads in [1, 3]:
+        screens = galsim.PhaseScreenList(galsim.OpticalScreen(diam=1.0, defocus=0.3, coma1=0.2),
+                                         nthreads=nthreads)
+        psfs = [screens.makePSF(lam=700.0, diam=1.0, theta=th) for th in theta]
+        imgs[nthreads] = [psf.drawImage(nx=32, ny=32, scale=0.05) for psf in psfs]
+    for img1, img3 in zip(imgs[1], imgs[3]):
+        np.testing.assert_array_equal(img1.array, img3.array)
+
+    atm = galsim.Atmosphere(screen_size=10.0, altitude=10.0, r0_500=0.2)
+    atm.nthreads = 0
+    psf = atm.makePSF(lam=700.0, diam=1.0)
+    np.testing.assert_raises(ValueError, psf.drawImage)
+    np.testing.assert_raises(TypeError, galsim.PhaseScreenList, atm[0], n_threads=2)
+
+
+@timer
+def test_wavefront_multi():
+    """Test that wavefront_multi matches wavefront at each field angle."""
+    rng = galsim.BaseDeviate(4321)
+    aper = galsim.Aperture(diam=1.0)
+    u = aper.u[aper.illuminated]
+    v = aper.v[aper.illuminated]
+    thetas = [(i*galsim.arcmin, (3-i)*galsim.arcmin) for i in range(5)]
+    times = [0.0, 0.01, 0.02, 0.035, 0.05]
+
+    frozen = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0], speed=[5.0, 10.0],
+                               direction=[0*galsim.degrees, 60*galsim.degrees], rng=rng)
+    boiling = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0], speed=[5.0, 10.0],
+                                alpha=0.99, time_step=0.01, rng=rng)
+    optics = galsim.OpticalScreen(diam=1.0, defocus=0.2, astig1=-0.1)
+    mixed = galsim.PhaseScreenList(list(frozen) + [optics])
+    for screens in [frozen, boiling, optics, mixed]:
+        wf = screens.wavefront_multi(u, v, 0.02, thetas)
+        assert wf.shape == (len(thetas), len(u))
+        for th, w in zip(thetas, wf):
+            np.testing.assert_allclose(w, screens.wavefront(u, v, 0.02, theta=th),
+                                       rtol=1.e-12, atol=1.e-12)
+
+        wf = screens.wavefront_multi(u, v, times, thetas)
+        for t, th, w in zip(times, thetas, wf):
+            np.testing.assert_allclose(w, screens.wavefront(u, v, t, theta=th),
+                                       rtol=1.e-12, atol=1.e-12)
+
+    # Screens that only implement wavefront and _wavefront are evaluated one angle at a time.
+    class WavefrontOnlyScreen(object):
+        def __init__(self, screen):
+            self.screen = screen
+        def wavefront(self, u, v, t=None, theta=(0.0*galsim.arcmin, 0.0*galsim.arcmin)):
+            return self.screen.wavefront(u, v, t, theta)
+        def _wavefront(self, u, v, t, theta):
+            return self.screen._wavefront(u, v, t, theta)
+    duck = galsim.PhaseScreenList([WavefrontOnlyScreen(layer) for layer in frozen])
+    np.testing.assert_allclose(duck.wavefront_multi(u, v, times, thetas),
+                               frozen.wavefront_multi(u, v, times, thetas),
+                               rtol=1.e-12, atol=1.e-12)
+    np.testing.assert_allclose(duck._wavefront_multi(u, v, None, thetas),
+                               frozen._wavefront_multi(u, v, None, thetas),
+                               rtol=1.e-12, atol=1.e-12)
+    mixed = galsim.PhaseScreenList([WavefrontOnlyScreen(frozen[0]), frozen[1], optics])
+    np.testing.assert_allclose(mixed._wavefront_multi(u, v, None, thetas),
+                               galsim.PhaseScreenList(list(frozen) + [optics])._wavefront_multi(
+                                       u, v, None, thetas),
+                               rtol=1.e-12, atol=1.e-12)
+
+    np.testing.assert_raises(ValueError, frozen.wavefront_multi, u, v[:-1], 0.0, thetas)
+    np.testing.assert_raises(ValueError, frozen.wavefront_multi, aper.u, aper.v, 0.0, thetas)
+    np.testing.assert_raises(ValueError, frozen.wavefront_multi, u, v, times[:2], thetas)
+    np.testing.assert_raises(ValueError, frozen.wavefront_multi, u, v, 0.0, [])
+
+
+@timer
+def test_makePSFs():
+    """Test that makePSFs matches makePSF at each wavelength."""
+    rng = galsim.BaseDeviate(1357)
+    lams = [900.0, 500.0, 700.0]
+    theta = (0.3*galsim.arcmin, -0.2*galsim.arcmin)
+    kwargs = dict(screen_size=10.0, altitude=[0.0, 5.0], speed=[5.0, 10.0], alpha=0.99,
+                  time_step=0.01)
+    atm = galsim.Atmosphere(rng=rng.duplicate(), **kwargs)
+
+    # Count how many wavefronts are computed.
+    nthetas = []
+    orig_wavefront_multi = atm._wavefront_multi
+    def counting_wavefront_multi(u, v, t, thetas):
+        nthetas.append(len(thetas))
+        return orig_wavefront_multi(u, v, t, thetas)
+    atm._wavefront_multi = counting_wavefront_multi
+
+    psfs = atm.makePSFs(lams, diam=1.0, exptime=0.05, time_step=0.01, theta=theta)
+    assert len(psfs) == len(lams)
+    for psf, lam in zip(psfs, lams):
+        assert psf.lam == lam
+        assert psf.aper is psfs[0].aper
+    # The aperture is made for the shortest wavelength.
+    assert psfs[0].aper == galsim.Aperture(diam=1.0, lam=500.0, screen_list=atm)
+    for psf in psfs:
+        psf.drawImage(nx=32, ny=32, scale=0.05)
+    # Each step only needed one wavefront for all 3 PSFs.
+    assert len(nthetas) > 1
+    assert all(n == 1 for n in nthetas)
+
+    for psf, lam in zip(psfs, lams):
+        atm2 = galsim.Atmosphere(rng=rng.duplicate(), **kwargs)
+        psf2 = atm2.makePSF(lam, exptime=0.05, time_step=0.01, theta=theta, aper=psfs[0].aper)
+        psf2.drawImage(nx=32, ny=32, scale=0.05)
+        np.testing.assert_allclose(psf.img.array, psf2.img.array, rtol=1.e-12, atol=1.e-15)
+
+    np.testing.assert_raises(ValueError, atm.makePSFs, [], diam=1.0)
+    np.testing.assert_raises(ValueError, atm.makePSFs, lams)
+
+
+@timer
+def test_fourier_evolution():
+    """Test AtmosphericScreen with evolution='fourier'."""
+    aper = galsim.Aperture(diam=1.0)
+    u = aper.u[aper.illuminated]
+    v = aper.v[aper.illuminated]
+    kwargs = dict(screen_size=12.8, screen_scale=0.1, alpha=0.9, time_step=0.01, vx=3.0, vy=-2.0)
+    rng = galsim.BaseDeviate(5678)
+    ar1 = galsim.AtmosphericScreen(rng=rng.duplicate(), **kwargs)
+    ar2 = galsim.AtmosphericScreen(rng=rng.duplicate(), evolution='fourier', **kwargs)
+    assert ar1 != ar2
+    do_pickle(ar2)
+    do_pickle(ar2, func=lambda x: x.wavefront(u, v, 0.05).sum())
+
+    # Both start from the same screen.
+    wf1 = ar1.wavefront(u, v, 0.0)
+    wf2 = ar2.wavefront(u, v, 0.0)
+    # This only needed a small part of the screen, so the full screen wasn't made.
+    assert ar2._subtable is not None
+    assert ar2._table is None
+    np.testing.assert_allclose(wf1, wf2, rtol=1.e-10, atol=1.e-10)
+
+    # After some updates, the part of the screen that was transformed back matches the full
+    # screen.
+    t = 0.5
+    wf2 = ar2.wavefront(u, v, t)
+    assert ar2._table is None
+    np.testing.assert_allclose(wf2, ar2._tab2d(u - t*ar2.vx, v - t*ar2.vy),
+                               rtol=1.e-10, atol=1.e-10)
+    grad2 = ar2.wavefront_gradient(u, v, t)
+    np.testing.assert_allclose(grad2, ar2._tab2d.gradient(u - t*ar2.vx, v - t*ar2.vy),
+                               rtol=1.e-10, atol=1.e-8)
+
+    # Points outside the sub-region need the full screen.
+    ar2._seek(0.6)
+    wf2 = ar2.wavefront(u, v, 0.6)
+    assert ar2._table is None
+    wf3 = ar2.wavefront(u + 5.0, v, 0.6)
+    assert ar2._table is not None
+    np.testing.assert_allclose(wf3, ar2._tab2d(u + 5.0 - 0.6*ar2.vx, v - 0.6*ar2.vy))
+
+    # The screens have the right power spectrum after many updates.
+    ar1._seek(t)
+    ar2._seek(t)
+    for ar in [ar1, ar2]:
+        ar._tab2d
+        power = np.abs(np.fft.fft2(ar._screen))**2
+        good = ar._psi > 0
+        ratio = np.mean(power[good] / (ar._psi[good] * ar.npix)**2)
+        print(ar.evolution, 'power ratio = ', ratio)
+        assert 0.9 < ratio < 1.1
+
+    # Atmosphere passes evolution through to each layer.
+    atm = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0], alpha=0.99, time_step=0.01,
+                            evolution='fourier', rng=rng)
+    assert len(atm) == 2
+    assert all(layer.evolution == 'fourier' for layer in atm)
+    psf = atm.makePSF(lam=700.0, diam=1.0, exptime=0.05)
+    img = psf.drawImage(nx=64, ny=64, scale=0.05)
+    np.testing.assert_allclose(img.array.sum(), 1.0, rtol=0.05)
+
+    np.testing.assert_raises(ValueError, galsim.AtmosphericScreen, evolution='spectral', **kwargs)
+
+
+@timer
+def test_screen_cache():
+    """Test AtmosphericScreen with a cache_dir."""
+    import shutil
+    cache_dir = os.path.join('output', 'screen_cache')
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    aper = galsim.Aperture(diam=1.0)
+    u = aper.u[aper.illuminated]
+    v = aper.v[aper.illuminated]
+    kwargs = dict(screen_size=25.6, screen_scale=0.1, vx=3.0, vy=-2.0)
+    rng = galsim.BaseDeviate(2468)
+    ar0 = galsim.AtmosphericScreen(rng=rng.duplicate(), **kwargs)
+
+    # The first screen makes the cache file.
+    ar1 = galsim.AtmosphericScreen(rng=rng.duplicate(), cache_dir=cache_dir, **kwargs)
+    assert len(os.listdir(cache_dir)) == 1
+    assert os.path.exists(ar1._cache_file)
+    # The cache directory isn't part of the screen's identity.
+    assert ar0 == ar1
+    np.testing.assert_array_equal(ar0.wavefront(u, v, 0.3), ar1.wavefront(u, v, 0.3))
+
+    # The second one reads it, without needing to make _psi.
+    ar2 = galsim.AtmosphericScreen(rng=rng.duplicate(), cache_dir=cache_dir, **kwargs)
+    assert not hasattr(ar2, '_psi')
+    assert ar2._cache_file == ar1._cache_file
+    assert not ar2._tab2d.f.flags.writeable
+    np.testing.assert_array_equal(ar0.wavefront(u, v, 0.3), ar2.wavefront(u, v, 0.3))
+    np.testing.assert_array_equal(ar0.wavefront_gradient(u, v, 0.3),
+                                  ar2.wavefront_gradient(u, v, 0.3))
+
+    # The screen isn't included in the pickle.
+    import pickle
+    assert len(pickle.dumps(ar2)) < len(pickle.dumps(ar0)) / 10
+    do_pickle(ar2)
+    do_pickle(ar2, func=lambda x: x.wavefront(u, v, 0.3).sum())
+    ar3 = pickle.loads(pickle.dumps(ar2))
+    np.testing.assert_array_equal(ar0.wavefront(u, v, 0.3), ar3.wavefront(u, v, 0.3))
+
+    # If the file is removed, an unpickled screen remakes it.
+    s = pickle.dumps(ar2)
+    os.remove(ar2._cache_file)
+    ar3 = pickle.loads(s)
+    assert os.path.exists(ar2._cache_file)
+    np.testing.assert_array_equal(ar0.wavefront(u, v, 0.3), ar3.wavefront(u, v, 0.3))
+
+    # A different screen gets a different file.
+    ar4 = galsim.AtmosphericScreen(rng=rng.duplicate(), r0_500=0.1, cache_dir=cache_dir,
+                                   **kwargs)
+    assert ar4._cache_file != ar1._cache_file
+    assert len(os.listdir(cache_dir)) == 2
+
+    # Boiling screens aren't cached.
+    ar5 = galsim.AtmosphericScreen(rng=rng.duplicate(), alpha=0.9, time_step=0.01,
+                                   cache_dir=cache_dir, **kwargs)
+    assert ar5._cache_file is None
+    assert len(os.listdir(cache_dir)) == 2
+
+    # Atmosphere passes cache_dir through to each layer.
+    atm = galsim.Atmosphere(screen_size=10.0, altitude=[0.0, 5.0], cache_dir=cache_dir, rng=rng)
+    assert all(layer.cache_dir == cache_dir for layer in atm)
+    assert len(os.listdir(cache_dir)) == 4
+
+
 @timer
 def test_opt_indiv_aberrations():
     """Test that aberrations specified by name match those specified in `aberrations` list."""
@@ -680,6 +944,11 @@ if __name__ == "__main__":
     test_frozen_flow()
     test_phase_psf_reset()
     test_phase_psf_batch()
+    test_phase_psf_threads()
+    test_wavefront_multi()
+    test_makePSFs()
+    test_fourier_evolution()
+    test_screen_cache()
     test_opt_indiv_aberrations()
     test_scale_unit()
     test_stepk_maxk()
@@ -544,6 +544,63 @@ def test_table2d_gradient():
     np.testing.assert_array_equal(0.0, test_dfdy[:,:,1])
 
 
+@timer
+def test_table2d_readonly():
+    """Check that LookupTable2D uses read-only arrays in place."""
+    x = np.linspace(-1., 1., 20, endpoint=False)
+    y = np.linspace(0., 3., 30, endpoint=False)
+    rng = galsim.UniformDeviate(1234)
+    z = np.empty((len(x), len(y)))
+    rng.generate(z.ravel())
+
+    newx = np.linspace(-5.3, 4.1, 31)
+    newy = np.linspace(-2.2, 7.7, 29)
+    newxx, newyy = np.meshgrid(newx, newy)
+
+    # A writeable array is copied, so later changes to it don't change the table.
+    z1 = z.copy()
+    tab1 = galsim.LookupTable2D(x, y, z1, edge_mode='wrap')
+    ref = tab1(newxx, newyy)
+    z1[3,4] += 1.
+    np.testing.assert_array_equal(tab1(newxx, newyy), ref)
+    # The table includes the wrapped values.
+    assert tab1.table.getVals().shape == (len(x)+1, len(y)+1)
+    np.testing.assert_array_equal(tab1.table.getVals()[:-1,:-1], z)
+    np.testing.assert_array_equal(tab1.table.getVals()[-1,:-1], z[0])
+    np.testing.assert_array_equal(tab1.table.getVals()[:-1,-1], z[:,0])
+
+    # A read-only array is used in place.
+    z2 = z.copy()
+    z2_view = z2.view()
+    z2_view.setflags(write=False)
+    tab2 = galsim.LookupTable2D(x, y, z2_view, edge_mode='wrap')
+    np.testing.assert_array_equal(tab2(newxx, newyy), ref)
+    np.testing.assert_array_equal(tab2.gradient(newxx, newyy), tab1.gradient(newxx, newyy))
+    assert tab1 == tab2
+    do_pickle(tab2)
+    do_pickle(tab2, lambda t: t(newxx, newyy).sum())
+    z2[3,4] += 1.
+    np.testing.assert_allclose(tab2(x[3], y[4]), z2[3,4], rtol=1.e-12, atol=1.e-12)
+    del z2, z2_view
+    # The table keeps the memory alive.
+    np.testing.assert_allclose(tab2(x[3], y[4]), z[3,4] + 1., rtol=1.e-12, atol=1.e-12)
+
+    # Also with the other edge modes and interpolants
+    z3 = z.copy()
+    z3.setflags(write=False)
+    for interpolant in ['linear', 'floor', 'ceil', 'nearest']:
+        tab1 = galsim.LookupTable2D(x, y, z, interpolant=interpolant, edge_mode='constant')
+        tab3 = galsim.LookupTable2D(x, y, z3, interpolant=interpolant, edge_mode='constant')
+        np.testing.assert_array_equal(tab3(newxx, newyy), tab1(newxx, newyy))
+
+    # The main use case is a memory-mapped file.
+    file_name = os.path.join('output', 'table2d_mmap.npy')
+    np.save(file_name, z)
+    z4 = np.load(file_name, mmap_mode='r')
+    tab4 = galsim.LookupTable2D(x, y, z4, edge_mode='wrap')
+    np.testing.assert_array_equal(tab4(newxx, newyy), ref)
+
+
 @timer
 def test_ne():
     """ Check that inequality works as expected."""
@@ -569,4 +626,5 @@ if __name__ == "__main__":
     test_roundoff()
     test_table2d()
     test_table2d_gradient()
+    test_table2d_readonly()
     test_ne()